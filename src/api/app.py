@@ -1,26 +1,96 @@
-import asyncio
 import logging
+from contextlib import asynccontextmanager
 from typing import List, Optional
-from ast import literal_eval
 
-from fastapi import FastAPI, HTTPException, Query, status, Path
+from fastapi import FastAPI, Header, HTTPException, Query, Request, status, Path
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import FileResponse, JSONResponse, Response
 from pydantic import BaseModel, Field, HttpUrl
 
-from src.services.neo4j_service import get_hybrid_substitutes, recipe_details as fetch_recipe_details
-from src.utils.recipesuggestionmodel import suggest_recipes, metadata_df
+from src.services.inference_pool import (
+    SCORE_SUBSTITUTES,
+    SIMILAR_RECIPES,
+    SUGGEST_RECIPES,
+    InferenceUnavailable,
+    inference_pool,
+)
+from src.services.ingredient_resolver import (
+    INGREDIENT_VOCABULARY_PATH,
+    NER_POSTINGS_PATH,
+    canonical_recipe_terms,
+    load_ingredient_resolver,
+    load_ner_resolver,
+)
+from src.services.metrics import (
+    MetricsMiddleware,
+    TimedRoute,
+    register_inference_pool,
+    render_metrics,
+)
+from src.services.neo4j_driver import close_driver
+from src.services.neo4j_service import (
+    get_batch_substitutes,
+    get_hybrid_substitutes,
+    graph_ingredients,
+    recipe_details as fetch_recipe_details,
+    recipes_details as fetch_recipes_details,
+)
+from src.services.pantry_search import search_by_pantry
+from src.services.profiling import (
+    PROFILE_FORMATS,
+    ProfilingMiddleware,
+    is_admin,
+    profile_file,
+    run_in_thread,
+)
+from src.services.sharded_search import recipe_shards
+from src.services.substitution_graph import SUBSTITUTION_GRAPH_DIR, load_substitution_graph
+from src.utils.directions import parse_directions
+from src.utils.recipe_attributes import RecipeFilter, known_tags
+
+
+# ——— Lifespan ———
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Models live in the inference workers (or load here when INFERENCE_WORKERS=0)
+    await inference_pool.start()
+    if INGREDIENT_VOCABULARY_PATH.exists():
+        load_ingredient_resolver()
+    if NER_POSTINGS_PATH.exists():
+        load_ner_resolver()
+    if SUBSTITUTION_GRAPH_DIR.exists():
+        load_substitution_graph()
+    if recipe_shards is not None:
+        await recipe_shards.start()
+    yield
+    if recipe_shards is not None:
+        await recipe_shards.close()
+    await inference_pool.shutdown()
+    close_driver()
+
 
 # ——— FastAPI app setup ———
 app = FastAPI(
     title="Plate Planner Backend",
     version="0.1",
+    lifespan=lifespan,
     openapi_tags=[
         {"name": "health", "description": "Health check"},
         {"name": "recipes", "description": "Recipe suggestion operations"},
         {"name": "substitution", "description": "Ingredient substitution operations"},
+        {"name": "ingredients", "description": "Ingredient autocomplete and typo correction"},
     ],
 )
 
+# ——— Metrics ———
+# Set before any route is declared: every route records endpoint vs. serialization time
+app.router.route_class = TimedRoute
+app.add_middleware(MetricsMiddleware)
+register_inference_pool(inference_pool)
+
+# ——— Profiling (opt-in, see services/profiling.py) ———
+app.add_middleware(ProfilingMiddleware)
+
 # ——— CORS ———
 app.add_middleware(
     CORSMiddleware,
@@ -39,6 +109,15 @@ logging.basicConfig(
 logger = logging.getLogger("plate_planner")
 
 
+# ——— Inference errors ———
+@app.exception_handler(InferenceUnavailable)
+async def inference_unavailable_handler(request: Request, exc: InferenceUnavailable):
+    """Overload / deadline errors from the inference pool: 503 + Retry-After, or 504."""
+    logger.warning(f"{request.url.path}: {exc.detail}")
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
+
+
 # ——— Models ———
 class RecipeRequest(BaseModel):
     """Incoming request payload for recipe suggestions."""
@@ -57,6 +136,34 @@ class RecipeRequest(BaseModel):
         description="Balance between semantic similarity and ingredient overlap (0–1)",
         example=0.6,
     )
+    include_ingredients: List[str] = Field(
+        default_factory=list,
+        description="Only recipes using all of these (matched as whole words, e.g. 'chicken' in 'chicken broth')",
+        example=["garlic"],
+    )
+    exclude_ingredients: List[str] = Field(
+        default_factory=list,
+        description="No recipes using any of these",
+        example=["peanut"],
+    )
+    include_tags: List[str] = Field(
+        default_factory=list,
+        description="Only recipes with all of these diet/cuisine tags (see utils/recipe_tag_config.yaml)",
+        example=["vegetarian", "italian"],
+    )
+    exclude_tags: List[str] = Field(
+        default_factory=list,
+        description="No recipes with any of these tags",
+        example=[],
+    )
+
+    def filters(self) -> RecipeFilter:
+        return RecipeFilter(
+            include_ingredients=tuple(self.include_ingredients),
+            exclude_ingredients=tuple(self.exclude_ingredients),
+            include_tags=tuple(self.include_tags),
+            exclude_tags=tuple(self.exclude_tags),
+        )
 
     class Config:
         schema_extra = {
@@ -81,12 +188,21 @@ class RecipeRequest(BaseModel):
                     "summary": "Breakfast staples",
                     "value": {"ingredients": ["egg", "milk", "banana"]}
                 },
+                "🌱 Vegetarian Italian": {
+                    "summary": "Filtered by tags, without nuts",
+                    "value": {
+                        "ingredients": ["tomato", "basil", "garlic"],
+                        "include_tags": ["vegetarian", "italian"],
+                        "exclude_ingredients": ["nuts"],
+                    }
+                },
             }
         }
 
 
 class RecipeResult(BaseModel):
     """Schema for a single suggested recipe."""
+    recipe_id: int = Field(..., description="Stable recipe id (use with /recipes/by_id/{recipe_id})")
     title: str
     # only those that overlapped with the query
     ingredients: List[str]
@@ -107,17 +223,64 @@ class SubstituteItem(BaseModel):
     name: str = Field(..., description="Substitute ingredient name", example="oleo")
     score: float = Field(..., description="Normalized similarity score (0–1)", example=0.83)
     context: Optional[str] = Field(None, description="Context in which this substitute applies", example="baking")
-    source: str = Field(..., description="Whether this came from 'direct', 'cooccurrence' or 'hybrid'", example="direct")
+    source: str = Field(..., description="Whether this came from 'direct', 'cooccurrence', 'hybrid' or 'contextual'", example="direct")
 
 
 class SubstituteResponse(BaseModel):
     ingredient: str = Field(..., description="Original ingredient you looked up", example="butter")
+    resolved_ingredient: Optional[str] = Field(
+        None, description="Vocabulary name looked up instead, when `ingredient` was misspelled", example=None
+    )
     context: Optional[str] = Field(None, description="Optional usage context", example="baking")
     hybrid: bool = Field(..., description="Whether hybrid lookup was used", example=False)
     substitutes: List[SubstituteItem] = Field(..., description="List of candidate substitutions")
 
 
+class SubstituteBatchItem(BaseModel):
+    ingredient: str = Field(..., description="Ingredient to substitute", example="milk")
+    context: Optional[str] = Field(None, description="Usage context for this ingredient", example="baking")
+
+
+class SubstituteBatchRequest(BaseModel):
+    """Every ingredient of a recipe to adapt, each with an optional context."""
+    items: List[SubstituteBatchItem] = Field(
+        ...,
+        min_length=1,
+        max_length=100,
+        description="Ingredients to substitute",
+        example=[{"ingredient": "milk", "context": "baking"}, {"ingredient": "butter"}, {"ingredient": "cheese"}],
+    )
+    hybrid: bool = Field(False, description="Use hybrid substitution (direct + cooccurrence)")
+    top_k: int = Field(5, ge=1, le=50, description="Substitutes per ingredient", example=5)
+
+
+class SubstituteBatchResponse(BaseModel):
+    results: List[SubstituteResponse] = Field(..., description="One entry per requested item, in request order")
+
+
+class ContextualSubstituteRequest(BaseModel):
+    """A recipe (ingredients + cooking actions) and the ingredient to replace in it."""
+    ingredient: str = Field(..., description="Ingredient to substitute", example="butter")
+    ingredients: List[str] = Field(
+        ...,
+        description="All ingredients of the recipe, including the one being substituted",
+        example=["butter", "sugar", "flour", "vanilla"],
+    )
+    actions: List[str] = Field(
+        default_factory=list,
+        description="Cooking actions of the recipe",
+        example=["mix", "bake"],
+    )
+    top_k: int = Field(5, ge=1, le=50, description="Number of substitutes to return", example=5)
+
+
+class ContextualSubstituteResponse(BaseModel):
+    ingredient: str = Field(..., description="Original ingredient you looked up", example="butter")
+    substitutes: List[SubstituteItem] = Field(..., description="Candidates ranked by recipe-context similarity")
+
+
 class RecipeDetails(BaseModel):
+    recipe_id: Optional[int] = Field(None, example=1042)
     title: str = Field(..., example="Marinated Flank Steak Recipe")
     directions: list[str] = Field(
         ..., description="Step-by-step cooking instructions"
@@ -132,12 +295,134 @@ class RecipeDetails(BaseModel):
     )
 
 
+class RecipeDetailsRequest(BaseModel):
+    titles: List[str] = Field(
+        default_factory=list,
+        max_length=100,
+        description="Recipe titles (case-insensitive exact match)",
+        example=["Marinated Flank Steak Recipe"],
+    )
+    recipe_ids: List[int] = Field(
+        default_factory=list,
+        max_length=100,
+        description="Recipe ids",
+        example=[1042],
+    )
+
+
+class RecipeDetailsBatchResponse(BaseModel):
+    results: List[RecipeDetails] = Field(..., description="Found recipes, in request order")
+    missing_titles: List[str] = Field(default_factory=list)
+    missing_recipe_ids: List[int] = Field(default_factory=list)
+
+
+class SimilarRecipe(BaseModel):
+    recipe_id: Optional[int] = None
+    title: str = Field(..., example="Beef Fajitas")
+    score: float = Field(..., description="Cosine similarity of the recipe context vectors (0–1)", example=0.91)
+    rank: int
+
+
+class SimilarRecipesResponse(BaseModel):
+    query: str = Field(..., description="Title as requested", example="Marinated Flank Steak Recipe")
+    recipe_id: Optional[int] = None
+    title: Optional[str] = Field(None, description="Matched recipe title, or null if not found")
+    results: List[SimilarRecipe] = Field(default_factory=list)
+
+
+class SimilarRecipesRequest(BaseModel):
+    titles: List[str] = Field(
+        ...,
+        description="Recipe titles to find neighbours for (case-insensitive exact match)",
+        example=["Marinated Flank Steak Recipe", "Easy Chocolate Chip Cookies"],
+    )
+    top_k: int = Field(5, ge=1, le=100, description="Neighbours per title", example=5)
+    nprobe: Optional[int] = Field(None, ge=1, description="IVF lists to probe (higher = more exact, slower)")
+
+
+class PantrySearchRequest(BaseModel):
+    """What's in the pantry, and how liberally substitutes may be counted."""
+    pantry: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=50,
+        description="Ingredients on hand (graph ingredient names)",
+        example=["flour", "milk", "eggs", "butter", "sugar"],
+    )
+    top_k: int = Field(10, ge=1, le=100, description="Number of recipes to return", example=10)
+    expand_substitutes: bool = Field(
+        True, description="Let SIMILAR_TO substitutes of a pantry item count, weighted by edge score"
+    )
+    min_edge_score: float = Field(0.0, ge=0.0, le=1.0, description="Ignore weaker SIMILAR_TO edges")
+    min_matched: int = Field(1, ge=1, description="Minimum number of pantry items a recipe must use")
+
+
+class PantryRecipe(BaseModel):
+    recipe_id: int
+    title: str
+    score: float = Field(..., description="Sum over pantry items of their best match weight in the recipe")
+    matched_items: int = Field(..., description="Pantry items used by the recipe (directly or via a substitute)")
+    n_ingredients: int = Field(..., description="Ingredients in the recipe")
+    coverage: float = Field(..., description="Share of the recipe's ingredients covered (0–1)")
+    matched_ingredients: List[str] = Field(..., description="Recipe ingredients hit by the pantry or a substitute")
+    rank: int
+
+
+class PantrySearchResponse(BaseModel):
+    pantry: List[str]
+    unknown_items: List[str] = Field(..., description="Pantry items not found in the ingredient vocabulary")
+    results: List[PantryRecipe]
+
+
+class IngredientSuggestion(BaseModel):
+    name: str = Field(..., description="Ingredient name in the graph", example="cheddar cheese")
+    recipes: int = Field(..., description="Recipes using it", example=48211)
+
+
+class AutocompleteResponse(BaseModel):
+    query: str
+    suggestions: List[IngredientSuggestion]
+
+
+class IngredientCandidate(BaseModel):
+    name: str
+    distance: int = Field(..., description="Edit distance from the query (typos, transpositions)")
+
+
+class ResolveResponse(BaseModel):
+    query: str
+    name: Optional[str] = Field(None, description="Vocabulary name the query resolves to, or null", example="butter")
+    match: str = Field(..., description="'exact', 'corrected' or 'unknown'", example="corrected")
+    candidates: List[IngredientCandidate] = Field(default_factory=list, description="Closest names, best first")
+
+
 # ——— Endpoints ———
 @app.get("/", tags=["health"], summary="Health check")
 async def root() -> dict:
     return {"message": "Plate Planner API is running."}
 
 
+@app.get("/metrics", tags=["health"], summary="Prometheus metrics", include_in_schema=False)
+async def metrics() -> Response:
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
+
+
+@app.get("/debug/profiles/{profile_id}", tags=["health"], summary="Stored request profile", include_in_schema=False)
+async def debug_profile(
+    profile_id: str,
+    format: str = Query("html", description=f"One of {sorted(PROFILE_FORMATS)}"),
+    x_admin_token: Optional[str] = Header(None),
+) -> FileResponse:
+    # 404 rather than 403, so the endpoint does not advertise itself
+    if not is_admin(x_admin_token):
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Not found")
+    path = profile_file(profile_id, format)
+    if path is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path)
+
+
 @app.post(
     "/suggest_recipes",
     response_model=List[RecipeResult],
@@ -145,13 +430,40 @@ async def root() -> dict:
     summary="Suggest recipes (only overlapping ingredients returned)",
 )
 async def suggest_recipes_endpoint(request: RecipeRequest):
-    try:
-        results = await asyncio.to_thread(
-            suggest_recipes,
-            request.ingredients,
-            request.top_n,
-            request.rerank_weight,
+    """
+    Include/exclude filters are applied inside the FAISS search (an id bitmap
+    per tag or ingredient), not to its results, so filtered queries still get
+    a full candidate list.
+    """
+    filters = request.filters()
+    unknown_tags = sorted(set(filters.tags) - known_tags())
+    if unknown_tags:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown tags {unknown_tags}; known tags: {sorted(known_tags())}",
         )
+
+    # Misspelled ingredients would never overlap a recipe's NER list
+    ingredients = canonical_recipe_terms(request.ingredients)
+    try:
+        if recipe_shards is not None:
+            # RECIPE_SHARDS: scatter-gather over recipe_id-range shards (services/sharded_search.py)
+            results = await recipe_shards.suggest_recipes(
+                ingredients,
+                request.top_n,
+                request.rerank_weight,
+                filters=filters,
+            )
+        else:
+            results = await inference_pool.run(
+                SUGGEST_RECIPES,
+                ingredients,
+                request.top_n,
+                request.rerank_weight,
+                filters=filters,
+            )
+    except InferenceUnavailable:
+        raise
     except Exception:
         logger.exception("Failed to suggest recipes")
         raise HTTPException(
@@ -162,6 +474,43 @@ async def suggest_recipes_endpoint(request: RecipeRequest):
     return results
 
 
+@app.post(
+    "/recipes/by_pantry",
+    response_model=PantrySearchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Find recipes you can cook with what's in your pantry",
+    tags=["recipes"],
+)
+async def recipes_by_pantry(request: PantrySearchRequest):
+    """
+    Served from a precomputed ingredient → recipe posting-list index with
+    SIMILAR_TO expansions (pipelines/build_pantry_index.py), not from Neo4j.
+    """
+    try:
+        found = await run_in_thread(
+            search_by_pantry,
+            request.pantry,
+            request.top_k,
+            request.expand_substitutes,
+            request.min_edge_score,
+            request.min_matched,
+        )
+    except FileNotFoundError:
+        logger.exception("Pantry index is missing")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Pantry index is not available",
+        )
+    except Exception:
+        logger.exception("Pantry search failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not search recipes by pantry",
+        )
+
+    return PantrySearchResponse(pantry=request.pantry, **found)
+
+
 @app.get(
     "/substitute",
     response_model=SubstituteResponse,
@@ -182,14 +531,19 @@ async def substitute(
     - context: optional use-case filter  
     - hybrid: if true, merges direct + co-occurrence methods  
     - top_k: how many substitutes to return  
+
+    A misspelled ingredient the graph doesn't know is resolved to the one
+    closest vocabulary name first (reported as `resolved_ingredient`).
     """
     try:
-        raw_subs = await asyncio.to_thread(
+        [(normalized, resolved)] = await run_in_thread(graph_ingredients, [ingredient])
+        raw_subs = await run_in_thread(
             get_hybrid_substitutes,
-            ingredient,
+            resolved,
             context,
             top_k,
             use_hybrid=hybrid,
+            normalized=True,
         )
     except Exception:
         logger.error("Substitution lookup failed", exc_info=True)
@@ -200,12 +554,251 @@ async def substitute(
 
     return SubstituteResponse(
         ingredient=ingredient,
+        resolved_ingredient=resolved if resolved != normalized else None,
         context=context,
         hybrid=hybrid,
         substitutes=raw_subs,
     )
 
 
+def _ingredient_resolver():
+    try:
+        return load_ingredient_resolver()
+    except FileNotFoundError:
+        logger.exception("Ingredient vocabulary is missing")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingredient vocabulary is not available",
+        )
+
+
+@app.get(
+    "/ingredients/autocomplete",
+    response_model=AutocompleteResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["ingredients"],
+    summary="Complete a partially typed ingredient name",
+)
+async def ingredients_autocomplete(
+    q: str = Query(..., min_length=1, description="Typed prefix (any word of the name)", example="ched"),
+    limit: int = Query(10, ge=1, le=50, description="Number of suggestions", example=10),
+):
+    """
+    Names starting with `q` come first, then names with a later word starting
+    with it; each group by how many recipes use the ingredient.
+    """
+    suggestions = _ingredient_resolver().autocomplete(q, limit)
+    return AutocompleteResponse(
+        query=q, suggestions=[IngredientSuggestion(name=name, recipes=recipes) for name, recipes in suggestions]
+    )
+
+
+@app.get(
+    "/ingredients/resolve",
+    response_model=ResolveResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["ingredients"],
+    summary="Resolve a possibly misspelled ingredient to its vocabulary name",
+)
+async def ingredients_resolve(
+    q: str = Query(..., min_length=1, description="Ingredient as typed", example="buter"),
+    limit: int = Query(5, ge=1, le=20, description="Number of candidates", example=5),
+):
+    """
+    Exact (case/spacing-insensitive) matches win; otherwise the closest names
+    within one edit (short words) or two, by trigram overlap + edit distance.
+    """
+    resolver = _ingredient_resolver()
+    name, distance = resolver.resolve(q)
+    match = "unknown" if name is None else "exact" if distance == 0 else "corrected"
+    candidates = [(name, 0)] if distance == 0 else resolver.candidates(q, limit)
+    return ResolveResponse(
+        query=q,
+        name=name,
+        match=match,
+        candidates=[IngredientCandidate(name=n, distance=d) for n, d in candidates],
+    )
+
+
+@app.post(
+    "/substitute/batch",
+    response_model=SubstituteBatchResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["substitution"],
+    summary="Get substitutes for many ingredients at once (e.g. a whole recipe)",
+)
+async def substitute_batch(request: SubstituteBatchRequest):
+    """
+    Same results as one `/substitute` call per item, but all ingredients are
+    normalized in one spaCy pass and looked up with a single UNWIND query.
+    """
+    names = [item.ingredient for item in request.items]
+    try:
+        resolved = await run_in_thread(graph_ingredients, names)
+        raw_subs = await run_in_thread(
+            get_batch_substitutes,
+            [(name, item.context) for (_, name), item in zip(resolved, request.items)],
+            request.top_k,
+            use_hybrid=request.hybrid,
+            normalized=True,
+        )
+    except Exception:
+        logger.error("Batch substitution lookup failed", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not retrieve substitutes",
+        )
+
+    return SubstituteBatchResponse(results=[
+        SubstituteResponse(
+            ingredient=item.ingredient,
+            resolved_ingredient=name if name != normalized else None,
+            context=item.context,
+            hybrid=request.hybrid,
+            substitutes=subs,
+        )
+        for item, (normalized, name), subs in zip(request.items, resolved, raw_subs)
+    ])
+
+
+@app.post(
+    "/substitute/contextual",
+    response_model=ContextualSubstituteResponse,
+    status_code=status.HTTP_200_OK,
+    tags=["substitution"],
+    summary="Get substitutes that best preserve a recipe's ingredient/action context",
+)
+async def substitute_contextual(request: ContextualSubstituteRequest):
+    """
+    Score every known ingredient as a replacement for `ingredient` inside the
+    given recipe, using the Word2Vec context vectors (ingredients + actions).
+    """
+    if request.ingredient not in request.ingredients:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"'{request.ingredient}' is not one of the recipe's ingredients.",
+        )
+
+    try:
+        scored = await inference_pool.run(
+            SCORE_SUBSTITUTES,
+            request.ingredient,
+            request.ingredients,
+            request.actions,
+            request.top_k,
+        )
+    except InferenceUnavailable:
+        raise
+    except Exception:
+        logger.exception("Contextual substitution failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not retrieve contextual substitutes",
+        )
+
+    return ContextualSubstituteResponse(
+        ingredient=request.ingredient,
+        substitutes=[
+            SubstituteItem(name=name, score=score, context=None, source="contextual")
+            for name, score in scored
+        ],
+    )
+
+
+async def _similar_recipes(titles: list[str], top_k: int, nprobe: Optional[int]) -> list[SimilarRecipesResponse]:
+    try:
+        matches = await inference_pool.run(SIMILAR_RECIPES, titles, top_k, nprobe)
+    except InferenceUnavailable:
+        raise
+    except FileNotFoundError:
+        logger.exception("Context similarity index is missing")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Recipe similarity index is not available",
+        )
+    except Exception:
+        logger.exception("Failed to search similar recipes")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not search similar recipes",
+        )
+
+    return [
+        SimilarRecipesResponse(query=query, **match) if match else SimilarRecipesResponse(query=query)
+        for query, match in zip(titles, matches)
+    ]
+
+
+@app.get(
+    "/recipes/{recipe_title}/similar",
+    response_model=SimilarRecipesResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Find recipes with a similar ingredient/action context",
+    tags=["recipes"],
+)
+async def get_similar_recipes(
+    recipe_title: str = Path(
+        ...,
+        description="Exact recipe title (case-insensitive)",
+        example="Marinated Flank Steak Recipe",
+    ),
+    top_k: int = Query(5, ge=1, le=100, description="Number of similar recipes to return"),
+    nprobe: Optional[int] = Query(None, ge=1, description="IVF lists to probe"),
+):
+    [response] = await _similar_recipes([recipe_title], top_k, nprobe)
+    if response.title is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recipe '{recipe_title}' not found."
+        )
+    return response
+
+
+@app.post(
+    "/recipes/similar",
+    response_model=List[SimilarRecipesResponse],
+    status_code=status.HTTP_200_OK,
+    summary="Find similar recipes for a batch of titles",
+    tags=["recipes"],
+)
+async def post_similar_recipes(request: SimilarRecipesRequest):
+    """
+    One FAISS search for the whole batch. Titles that are not found come back
+    with `title: null` and no results.
+    """
+    return await _similar_recipes(request.titles, request.top_k, request.nprobe)
+
+
+@app.get(
+    "/recipes/by_id/{recipe_id}",
+    response_model=RecipeDetails,
+    status_code=status.HTTP_200_OK,
+    summary="Fetch full recipe details by recipe_id",
+    tags=["recipes"],
+)
+async def get_recipe_details_by_id(
+    recipe_id: int = Path(..., description="recipe_id as returned by /suggest_recipes", example=1042),
+):
+    """
+    Keyed lookup on the unique Recipe.recipe_id constraint (no title matching).
+    """
+    try:
+        found, _, _ = await run_in_thread(fetch_recipes_details, None, [recipe_id])
+    except Exception:
+        logger.exception("Recipe details lookup failed for recipe_id=%s", recipe_id)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not retrieve recipe details",
+        )
+
+    if not found:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Recipe {recipe_id} not found."
+        )
+    return _to_recipe_details(found[0])
+
+
 @app.get(
     "/recipes/{recipe_title}",
     response_model=RecipeDetails,
@@ -223,34 +816,60 @@ async def get_recipe_details(
     """
     Returns detailed recipe data from Neo4j.
     """
-    record = await asyncio.to_thread(fetch_recipe_details, recipe_title)
+    record = await run_in_thread(fetch_recipe_details, recipe_title)
     if not record:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Recipe '{recipe_title}' not found."
         )
 
-    # Parse directions
-    raw_dirs = record.get("directions", [])
-    if isinstance(raw_dirs, str):
-        try:
-            raw_dirs = literal_eval(raw_dirs)
-        except Exception:
-            raw_dirs = [raw_dirs]
-
-    # Parse & dedupe ingredients
-    raw_ings = record.get("ingredients", []) or []
-    seen = set()
-    unique_ings: list[str] = []
-    for ing in raw_ings:
-        if ing not in seen:
-            unique_ings.append(ing)
-            seen.add(ing)
+    return _to_recipe_details(record)
+
+
+@app.post(
+    "/recipes/details",
+    response_model=RecipeDetailsBatchResponse,
+    status_code=status.HTTP_200_OK,
+    summary="Fetch details for many recipes at once",
+    tags=["recipes"],
+)
+async def post_recipe_details(request: RecipeDetailsRequest):
+    """
+    Fetch up to 100 titles and/or recipe ids in a single Neo4j query, e.g. to
+    render a whole suggestion list.
+    """
+    if not request.titles and not request.recipe_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Provide at least one title or recipe_id.",
+        )
+
+    try:
+        found, missing_titles, missing_ids = await run_in_thread(
+            fetch_recipes_details, request.titles, request.recipe_ids
+        )
+    except Exception:
+        logger.exception("Bulk recipe details lookup failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not retrieve recipe details",
+        )
+
+    return RecipeDetailsBatchResponse(
+        results=[_to_recipe_details(record) for record in found],
+        missing_titles=missing_titles,
+        missing_recipe_ids=missing_ids,
+    )
+
 
+def _to_recipe_details(record) -> RecipeDetails:
     return RecipeDetails(
+        recipe_id=record.get("recipe_id"),
         title=record.get("title", ""),
-        directions=raw_dirs,
-        link=record.get("link", ""),      # plain str, no HttpUrl validation
-        source=record.get("source", ""),
-        ingredients=unique_ings,
+        # A native list, or one stringified list on graphs loaded before upload_recipe_metadata parsed them
+        directions=parse_directions(record.get("directions")),
+        link=record.get("link") or "",      # plain str, no HttpUrl validation
+        source=record.get("source") or "",
+        # Deduplicated, in original order
+        ingredients=list(dict.fromkeys(record.get("ingredients") or [])),
     )
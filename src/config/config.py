@@ -7,3 +7,53 @@ load_dotenv()
 NEO4J_URI = os.getenv("NEO4J_URI", "neo4j://localhost:7687")
 NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
 NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "12345678")
+# Driver pool (services/neo4j_driver.py): connections per driver, seconds before a connection is
+# recycled, seconds a session waits for a free connection, and records fetched per round trip
+NEO4J_MAX_POOL_SIZE = int(os.getenv("NEO4J_MAX_POOL_SIZE", "100"))
+NEO4J_MAX_CONNECTION_LIFETIME_S = float(os.getenv("NEO4J_MAX_CONNECTION_LIFETIME_S", "3600"))
+NEO4J_CONNECTION_ACQUISITION_TIMEOUT_S = float(os.getenv("NEO4J_CONNECTION_ACQUISITION_TIMEOUT_S", "60"))
+NEO4J_FETCH_SIZE = int(os.getenv("NEO4J_FETCH_SIZE", "1000"))
+
+# Recipe suggestion serving: stored embedding format ("float32" | "fp16" | "int8")
+# and query encoder ("torch" = SentenceTransformer, "onnx" = int8 ONNX Runtime export)
+RECIPE_EMBEDDING_DTYPE = os.getenv("RECIPE_EMBEDDING_DTYPE", "float32")
+QUERY_ENCODER = os.getenv("QUERY_ENCODER", "torch")
+# Query vectors: "full" runs the encoder per query, "table" pools pre-encoded ingredient vectors
+QUERY_ENCODING = os.getenv("QUERY_ENCODING", "full")
+
+# Near-duplicate recipes (pipelines/build_recipe_clusters.py): "1" keeps only the best-scoring
+# recipe of each duplicate cluster in suggest_recipes results, "0" returns them all
+COLLAPSE_DUPLICATE_RECIPES = os.getenv("COLLAPSE_DUPLICATE_RECIPES", "1") == "1"
+
+# Recipes sharing the most ingredients with the query (NER posting lists) added to the FAISS
+# candidates of suggest_recipes and scored with the same rerank_weight blend; 0 = FAISS only
+SUGGEST_LEXICAL_K = int(os.getenv("SUGGEST_LEXICAL_K", "100"))
+
+# Substitution reads (utils/substitution_queries.py): "1" serves direct substitutes from the
+# per-context top-k lists database/materialize_top_substitutes.py stores on Ingredient nodes
+# (edge queries still answer unmaterialized ingredients), "0" always expands the edges
+MATERIALIZED_SUBSTITUTES = os.getenv("MATERIALIZED_SUBSTITUTES", "1") == "1"
+
+# Substitution reads: "neo4j", "local" (only the services/substitution_graph.py snapshot built by
+# pipelines/build_substitution_graph.py) or "fallback" (Neo4j, answered from the snapshot when a
+# query fails or runs past SUBSTITUTION_QUERY_TIMEOUT_MS; after a failure, reads skip Neo4j for
+# SUBSTITUTION_BREAKER_S seconds)
+SUBSTITUTION_READ_PATH = os.getenv("SUBSTITUTION_READ_PATH", "fallback")
+SUBSTITUTION_QUERY_TIMEOUT_MS = int(os.getenv("SUBSTITUTION_QUERY_TIMEOUT_MS", "2000"))
+SUBSTITUTION_BREAKER_S = float(os.getenv("SUBSTITUTION_BREAKER_S", "30"))
+
+# Inference worker pool (services/inference_pool.py); 0 workers = run model calls in the API process
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "0"))
+INFERENCE_THREADS_PER_WORKER = int(os.getenv("INFERENCE_THREADS_PER_WORKER", "1"))
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "64"))
+INFERENCE_DEADLINE_MS = int(os.getenv("INFERENCE_DEADLINE_MS", "10000"))
+
+# Request profiling (services/profiling.py): on demand with X-Profile + X-Admin-Token
+# (disabled while no token is set), and/or 1 in N requests written to disk (0 = off)
+PROFILING_ADMIN_TOKEN = os.getenv("PROFILING_ADMIN_TOKEN")
+PROFILING_SAMPLE_EVERY = int(os.getenv("PROFILING_SAMPLE_EVERY", "0"))
+
+# Sharded recipe serving (services/sharded_search.py): comma-separated shard base URLs;
+# unset = suggest_recipes runs on the full index in this process / the inference pool
+RECIPE_SHARDS = [url for url in os.getenv("RECIPE_SHARDS", "").split(",") if url.strip()]
+RECIPE_SHARD_TIMEOUT_MS = int(os.getenv("RECIPE_SHARD_TIMEOUT_MS", "5000"))
@@ -1,3 +1,4 @@
+import os
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -5,7 +6,9 @@ from pathlib import Path
 @dataclass(frozen=True)
 class DataPaths:
     project_root: Path = Path(__file__).resolve().parents[2]
-    data_root: Path = project_root / "src" / "data"
+    # PLATE_PLANNER_DATA_ROOT points a process at another data tree (e.g. a benchmark fixture);
+    # it is read once, at import
+    data_root: Path = Path(os.getenv("PLATE_PLANNER_DATA_ROOT", project_root / "src" / "data"))
 
     # === Subdirectories ===
     models: Path = data_root / "models"
@@ -14,11 +17,27 @@ class DataPaths:
     results: Path = data_root / "results"
     support: Path = data_root / "support"
 
+    # === Ingredient normalizer vocabulary (descriptors, units, stopwords, blacklist) ===
+    normalizer_config: Path = project_root / "src" / "utils" / "normalizer_config.yaml"
+    # === Recipe tag rules (diets, cuisines) for suggest_recipes filters ===
+    recipe_tag_config: Path = project_root / "src" / "utils" / "recipe_tag_config.yaml"
+
     # === Models ===
     recipe_faiss_index: Path = models / "recipe_suggestion" / "recipe_index.faiss"
+    pantry_index: Path = models / "recipe_suggestion" / "pantry_index"
+    recipe_ner_postings: Path = models / "recipe_suggestion" / "ner_postings"
+    recipe_attributes: Path = models / "recipe_suggestion" / "recipe_attributes"
+    recipe_shards: Path = models / "recipe_suggestion" / "shards"
+    query_encoder_onnx: Path = models / "recipe_suggestion" / "query_encoder_onnx"
+    ingredient_embedding_table: Path = models / "recipe_suggestion" / "ingredient_table"
     action_w2v: Path = models / "ingredient_substitution" / "action_w2v.model"
     ingredient_w2v: Path = models / "ingredient_substitution" / "ingredient_w2v.model"
     faiss_context_index: Path = models / "ingredient_substitution" / "faiss_context.index"
+    substitution_graph: Path = models / "ingredient_substitution" / "substitution_graph"
+
+    # === Models: mmap-loadable KeyedVectors (see pipelines/export_keyed_vectors.py) ===
+    ingredient_kv: Path = models / "ingredient_substitution" / "ingredient_w2v.kv"
+    action_kv: Path = models / "ingredient_substitution" / "action_w2v.kv"
 
     # === Processed (ingredient substitution) ===
     cleaned_ner: Path = processed / "ingredient_substitution" / "cleaned_ner.csv"
@@ -34,9 +53,11 @@ class DataPaths:
     # === Processed (recipe suggestion) ===
     recipe_embeddings: Path = processed / "recipe_suggestion" / "recipe_embeddings.npy"
     recipe_metadata: Path = processed / "recipe_suggestion" / "recipe_metadata.csv"
+    recipe_clusters: Path = processed / "recipe_suggestion" / "recipe_clusters.csv"
 
     # === Other processed
     ingredients: Path = processed / "ingredients.csv"
+    ingredient_vocabulary: Path = processed / "ingredient_vocabulary.csv"
     recipe_ingredients: Path = processed / "recipe_ingredients.csv"
     recipes: Path = processed / "recipes.csv"
 
@@ -51,6 +72,10 @@ class DataPaths:
     dataset_understanding: Path = results / "exploration" / "dataset_understanding.txt"
     graph_summary: Path = results / "exploration" / "graph_exploration_summary.txt"
 
+    # === Results: Benchmarks
+    benchmarks: Path = results / "benchmarks"
+    profiles: Path = results / "profiles"
+
     # === Results: Substitution
     substitution_eval_report: Path = results / "substitution" / "substitution_eval_report.txt"
     substitution_hybrid_results: Path = results / "substitution" / "substitution_hybrid_results.json"
@@ -1,22 +1,43 @@
+# Upload SUBSTITUTES_WITH edges from the cleaned substitution CSV, in parallel.
+#
+# Creating a relationship locks both of its Ingredient nodes, and every
+# ingredient is a source and a target, so writers splitting the edges naively
+# lock the same nodes in different orders and deadlock. Instead, nodes are
+# hashed into 2 * workers buckets, and the edges between buckets a and b (either
+# direction) form one job. A job only starts while no running job holds a or b,
+# so concurrent transactions never share a node. The CSV is streamed in chunks,
+# and transient errors are retried with backoff.
 
+import argparse
+import os
+import random
+import time
+from collections.abc import Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import numpy as np
 import pandas as pd
-from config.config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
+from neo4j.exceptions import ServiceUnavailable, SessionExpired, TransientError
+from tqdm import tqdm
 
 # ------------------ Config ------------------
-from config.paths import DataPaths
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
-from tqdm import tqdm
+from src.config.config import NEO4J_MAX_POOL_SIZE
+from src.config.paths import DataPaths
+from src.services.neo4j_driver import create_driver
 
 paths = DataPaths()
 CSV_PATH = paths.substitution_edges_with_context_cleaned
 
 BATCH_SIZE = 1000
+CHUNK_SIZE = 200_000
 MIN_SCORE = 0.90
+WORKERS = min(os.cpu_count() or 4, 8)
+MAX_RETRIES = 5
+BACKOFF_S = 0.2
+
+# Deadlocks (Neo.TransientError.Transaction.DeadlockDetected) are TransientErrors too
+RETRYABLE = (TransientError, ServiceUnavailable, SessionExpired)
 
-# ------------------ Neo4j Driver ------------------
-load_dotenv()
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
 def batch_insert(tx, rows):
     tx.run("""
@@ -28,24 +49,112 @@ def batch_insert(tx, rows):
         SET r.context = row.context
     """, batch=rows)
 
-# ------------------ Main ------------------
-def main():
-    print("📦 Loading substitution CSV...")
-    df = pd.read_csv(CSV_PATH)
 
-    # Filter low scores and noisy terms
-    print("🧹 Filtering poor or noisy substitutions...")
-    df = df[df["score"] >= MIN_SCORE]
+# ------------------ Input ------------------
+def read_edge_chunks(path=CSV_PATH, chunk_size: int = CHUNK_SIZE, min_score: float = MIN_SCORE) -> Iterator[pd.DataFrame]:
+    """The CSV in chunks of `chunk_size` rows, without poor substitutions (score < min_score)."""
+    for chunk in pd.read_csv(path, usecols=["source", "target", "score", "context"], chunksize=chunk_size):
+        yield chunk[chunk["score"] >= min_score]
+
+
+# ------------------ Scheduling ------------------
+def node_buckets(names: pd.Series, n_buckets: int) -> np.ndarray:
+    """Stable bucket of each node name, the same for a node as source and as target."""
+    codes, uniques = pd.factorize(names.astype(str))
+    return (pd.util.hash_array(np.asarray(uniques, dtype=object)) % n_buckets).astype(np.int64)[codes]
+
+
+def bucket_jobs(chunk: pd.DataFrame, n_buckets: int) -> dict[tuple[int, int], list[dict]]:
+    """UNWIND rows of `chunk` per bucket pair (a, b), a <= b: the edges a -> b and b -> a."""
+    source = node_buckets(chunk["source"], n_buckets)
+    target = node_buckets(chunk["target"], n_buckets)
+    jobs = np.minimum(source, target) * n_buckets + np.maximum(source, target)
+    order = np.argsort(jobs, kind="stable")
+    records = chunk[["source", "target", "score", "context"]].iloc[order].to_dict(orient="records")
+    present, starts = np.unique(jobs[order], return_index=True)
+    ends = np.append(starts[1:], len(order))
+    return {divmod(int(j), n_buckets): records[s:e] for j, s, e in zip(present, starts, ends, strict=True)}
+
+
+# ------------------ Writing ------------------
+def write_with_retry(session, write_fn, rows: list[dict], max_retries: int = MAX_RETRIES,
+                     backoff_s: float = BACKOFF_S) -> int:
+    """session.execute_write(write_fn, rows), retried with jittered exponential backoff.
 
-    print(f"✅ {len(df)} edges remaining after filtering")
+    execute_write already retries briefly inside the driver; this outer loop
+    rides out longer outages (leader re-election, a restarting server).
+    Returns how many retries it took.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            session.execute_write(write_fn, rows)
+            return attempt
+        except RETRYABLE:
+            if attempt == max_retries:
+                raise
+            time.sleep(backoff_s * 2 ** attempt * (1 + random.random()))
+    return max_retries
 
-    rows = df.to_dict(orient="records")
+
+def _write_job(driver, rows: list[dict], batch_size: int, write_fn) -> tuple[int, int]:
+    retries = 0
     with driver.session() as session:
-        for i in tqdm(range(0, len(rows), BATCH_SIZE), desc="🔁 Uploading"):
-            batch = rows[i:i + BATCH_SIZE]
-            session.execute_write(batch_insert, batch)
+        for i in range(0, len(rows), batch_size):
+            retries += write_with_retry(session, write_fn, rows[i:i + batch_size])
+    return len(rows), retries
+
+
+def upload_edges(driver, chunks: Iterable[pd.DataFrame], workers: int = WORKERS, batch_size: int = BATCH_SIZE,
+                 write_fn=batch_insert) -> dict:
+    """Write every chunk's edges with `workers` concurrent sessions that never lock the same node."""
+    n_buckets = 2 * workers
+    stats = {"edges": 0, "retries": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool, tqdm(desc="🔁 Uploading", unit=" edges") as progress:
+        for chunk in chunks:
+            # Largest first, so the long jobs do not end up alone at the tail of the chunk
+            pending = sorted(bucket_jobs(chunk, n_buckets).items(), key=lambda job: -len(job[1]))
+            running: dict = {}
+            busy: set[int] = set()
+            while pending or running:
+                for job in list(pending):
+                    (a, b), rows = job
+                    if len(running) == workers:
+                        break
+                    if a in busy or b in busy:
+                        continue
+                    pending.remove(job)
+                    busy.update((a, b))
+                    running[pool.submit(_write_job, driver, rows, batch_size, write_fn)] = (a, b)
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    busy.difference_update(running.pop(future))
+                    edges, retries = future.result()
+                    stats["edges"] += edges
+                    stats["retries"] += retries
+                    progress.update(edges)
+
+    stats["seconds"] = time.perf_counter() - start
+    stats["edges_per_sec"] = stats["edges"] / stats["seconds"] if stats["seconds"] else 0.0
+    return stats
+
+
+# ------------------ Main ------------------
+def main():
+    parser = argparse.ArgumentParser(description="Upload SUBSTITUTES_WITH edges in parallel")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Concurrent write sessions")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="CSV rows read at a time")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Edges per write transaction")
+    args = parser.parse_args()
+
+    print(f"📦 Streaming {CSV_PATH} (score >= {MIN_SCORE}) with {args.workers} writers...")
+    with create_driver(max_connection_pool_size=max(NEO4J_MAX_POOL_SIZE, args.workers)) as driver:
+        stats = upload_edges(driver, read_edge_chunks(CSV_PATH, args.chunk_size), args.workers, args.batch_size)
 
-    print("✅ All substitution edges uploaded to Neo4j.")
+    print(f"✅ {stats['edges']:,} substitution edges uploaded in {stats['seconds']:.1f}s "
+          f"({stats['edges_per_sec']:,.0f} edges/sec, {stats['retries']} retries)")
 
 if __name__ == "__main__":
     main()
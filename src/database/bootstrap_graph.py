@@ -1,13 +1,30 @@
-from src.database import add_edges_from_csv, build_similar_to_edges, explore_util, load_into_neo4j
+from src.database import (
+    add_edges_from_csv,
+    build_similar_to_edges,
+    explore_util,
+    load_into_neo4j,
+    materialize_top_substitutes,
+    migrate_title_key,
+    schema,
+)
 
 
 def bootstrap():
     print("\n🚀 Step 1: Loading ingredients, recipes, and relationships...")
     load_into_neo4j.main()
 
+    print("\n🔑 Step 1b: Backfilling recipe title keys...")
+    migrate_title_key.main()
+
+    print("\n🗂️ Step 1c: Applying constraints and relationship property indexes...")
+    schema.main()
+
     print("\n🔗 Step 2: Adding SUBSTITUTES_WITH edges...")
     add_edges_from_csv.main()
 
+    print("\n🧮 Step 2b: Materializing per-context top substitutes...")
+    materialize_top_substitutes.main()
+
     print("\n🔁 Step 3: Building SIMILAR_TO relationships...")
     build_similar_to_edges.main()
 
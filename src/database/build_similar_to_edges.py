@@ -2,21 +2,16 @@
 
 import re
 
-from config.config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
-from config.paths import DataPaths
-from gensim.models import Word2Vec
-from neo4j import GraphDatabase
+from gensim.models import KeyedVectors
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from tqdm import tqdm
 
-paths = DataPaths()
-INGREDIENT_W2V_MODEL_PATH = str(paths.ingredient_w2v)
+from src.config.paths import DataPaths
+from src.services.neo4j_driver import create_driver
 
-# Neo4j driver
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+paths = DataPaths()
+INGREDIENT_KV_PATH = str(paths.ingredient_kv)
 
-# Load Word2Vec model
-ingredient_model = Word2Vec.load(INGREDIENT_W2V_MODEL_PATH)
 TOP_N = 5
 
 # ------------------ Utility ------------------
@@ -41,15 +36,17 @@ def create_similar_relationship(tx, source, target, score):
 
 def main():
     print("📦 Loading ingredient vocabulary...")
-    all_ingredients = list(ingredient_model.wv.index_to_key)
+    # mmap, exported by pipelines/export_keyed_vectors.py
+    ingredient_vectors = KeyedVectors.load(INGREDIENT_KV_PATH, mmap="r")
+    all_ingredients = list(ingredient_vectors.index_to_key)
     valid_ingredients = [ing for ing in all_ingredients if is_valid_term(ing)]
 
     print(f"Processing {len(valid_ingredients)} cleaned ingredients for SIMILAR_TO edges...")
 
-    with driver.session() as session:
+    with create_driver() as driver, driver.session() as session:
         for source in tqdm(valid_ingredients):
             try:
-                similar_items = ingredient_model.wv.most_similar(source, topn=TOP_N)
+                similar_items = ingredient_vectors.most_similar(source, topn=TOP_N)
                 for target, similarity in similar_items:
                     if source == target or not is_valid_term(target):
                         continue
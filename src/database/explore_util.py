@@ -2,18 +2,14 @@
 
 import os
 
-from config.config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
-from config.paths import DataPaths
-from neo4j import GraphDatabase
+from src.config.paths import DataPaths
+from src.services.neo4j_driver import create_driver
 
 paths = DataPaths()
 OUTPUT_FILE = paths.graph_summary
 
 os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
 
-# Neo4j driver
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 queries = {
     "Ingredient Count": "MATCH (i:Ingredient) RETURN count(i) AS total",
     "Recipe Count": "MATCH (r:Recipe) RETURN count(r) AS total",
@@ -93,7 +89,7 @@ def run_query(tx, query):
     return [record.data() for record in result]
 
 def main():
-    with driver.session() as session, open(OUTPUT_FILE, "w") as f:
+    with create_driver() as driver, driver.session() as session, open(OUTPUT_FILE, "w") as f:
         for section, query in queries.items():
             f.write(f"=== {section} ===\n")
             print(f"Running query: {section}")
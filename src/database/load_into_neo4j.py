@@ -1,10 +1,12 @@
 
 import pandas as pd
-from config.config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
-from config.paths import DataPaths
-from neo4j import GraphDatabase
 from tqdm import tqdm
 
+from src.config.paths import DataPaths
+from src.database.schema import apply_schema
+from src.services.neo4j_driver import create_driver
+from src.utils.titles import title_key
+
 paths = DataPaths()
 INGREDIENTS_PATH = paths.ingredients
 RECIPES_PATH = paths.recipes
@@ -13,8 +15,8 @@ RELATIONS_PATH = paths.recipe_ingredients
 BATCH_SIZE = 500
 
 def create_indexes(tx):
-    tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (i:Ingredient) REQUIRE i.name IS UNIQUE")
-    tx.run("CREATE CONSTRAINT IF NOT EXISTS FOR (r:Recipe) REQUIRE r.recipe_id IS UNIQUE")
+    # Node constraints and relationship property indexes, see database/schema.py
+    apply_schema(tx)
 
 def create_ingredients(tx, ingredients):
     for ing in ingredients:
@@ -22,7 +24,10 @@ def create_ingredients(tx, ingredients):
 
 def create_recipes(tx, recipes):
     for idx, row in recipes.iterrows():
-        tx.run("MERGE (r:Recipe {recipe_id: $rid, title: $title})", rid=int(row["recipe_id"]), title=row["title"])
+        tx.run("""
+            MERGE (r:Recipe {recipe_id: $rid, title: $title})
+            SET r.title_key = $title_key
+        """, rid=int(row["recipe_id"]), title=row["title"], title_key=title_key(str(row["title"])))
 
 def create_relations(tx, relations):
     for idx, row in relations.iterrows():
@@ -46,7 +51,7 @@ def node_exists(tx, label: str) -> bool:
 
 
 def main():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = create_driver()
     try:
         with driver.session() as session:
             if session.execute_read(node_exists, "Ingredient"):
@@ -0,0 +1,69 @@
+# Post-load job: store each ingredient's best SUBSTITUTES_WITH targets, per context,
+# as list properties on the Ingredient node, so get_direct_subs reads one node
+# instead of expanding, filtering and sorting its edges on every request.
+#
+# Layout (parallel lists, grouped by context, best first within a context):
+#   i.top_substitutes          target names
+#   i.top_substitute_scores    edge scores
+#   i.top_substitute_contexts  edge contexts ("" for none)
+#   i.top_substitutes_k        per-context cap; reads with a larger top_k use the edges
+# The best k per context also hold the best k overall, so context fallbacks are
+# served from the same lists. Rerun after SUBSTITUTES_WITH edges change.
+
+import argparse
+import time
+
+from src.services.neo4j_driver import create_driver
+
+# Covers /substitute's default hybrid read (2 * top_k = 10 edges)
+TOP_K = 10
+BATCH_SIZE = 5000
+
+# Every ingredient gets the properties (empty lists without edges), so a
+# materialized graph never falls back to the edge queries for a known ingredient
+MATERIALIZE_QUERY = """
+    MATCH (i:Ingredient)
+    CALL {
+        WITH i
+        CALL {
+            WITH i
+            MATCH (i)-[r:SUBSTITUTES_WITH]->(b:Ingredient)
+            WITH coalesce(r.context, '') AS context, r.score AS score, b.name AS name
+            ORDER BY context, score DESC, name
+            WITH context, collect({name: name, score: score})[..$top_k] AS best
+            UNWIND best AS s
+            RETURN collect(s.name) AS names, collect(s.score) AS scores, collect(context) AS contexts
+        }
+        SET i.top_substitutes = names,
+            i.top_substitute_scores = scores,
+            i.top_substitute_contexts = contexts,
+            i.top_substitutes_k = $top_k
+    } IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+
+def count_ingredients(tx) -> int:
+    return tx.run("MATCH (i:Ingredient) RETURN count(i) AS n").single()["n"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Store per-context top-k substitutes on Ingredient nodes")
+    parser.add_argument("--top-k", type=int, default=TOP_K, help="Substitutes kept per ingredient and context")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Ingredients per write transaction")
+    args = parser.parse_args()
+
+    driver = create_driver()
+    try:
+        with driver.session() as session:
+            total = session.execute_read(count_ingredients)
+            print(f"🧮 Materializing top-{args.top_k} substitutes per context for {total:,} ingredients...")
+            start = time.perf_counter()
+            # CALL {} IN TRANSACTIONS needs an auto-commit transaction
+            session.run(MATERIALIZE_QUERY, top_k=args.top_k, batch_size=args.batch_size).consume()
+            print(f"✅ Done in {time.perf_counter() - start:.1f}s.")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
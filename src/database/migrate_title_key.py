@@ -0,0 +1,53 @@
+# Backfill Recipe.title_key on graphs loaded before it existed.
+
+from src.services.neo4j_driver import create_driver
+
+BATCH_SIZE = 10000
+
+# Must stay equivalent to utils.titles.title_key()
+BACKFILL_QUERY = """
+    MATCH (r:Recipe)
+    WHERE r.title IS NOT NULL AND r.title_key IS NULL
+    CALL {
+        WITH r
+        SET r.title_key = toLower(trim(r.title))
+    } IN TRANSACTIONS OF $batch_size ROWS
+"""
+
+
+def create_title_key_index(tx):
+    tx.run("CREATE INDEX recipe_title_key IF NOT EXISTS FOR (r:Recipe) ON (r.title_key)")
+
+
+def count_missing(tx) -> int:
+    result = tx.run("""
+        MATCH (r:Recipe)
+        WHERE r.title IS NOT NULL AND r.title_key IS NULL
+        RETURN count(r) AS missing
+    """)
+    return result.single()["missing"]
+
+
+def main():
+    driver = create_driver()
+    try:
+        with driver.session() as session:
+            print("Creating recipe_title_key index...")
+            session.execute_write(create_title_key_index)
+
+            missing = session.execute_read(count_missing)
+            if not missing:
+                print("✅ All recipes already have a title_key.")
+            else:
+                print(f"🔁 Backfilling title_key on {missing:,} recipes...")
+                # CALL {} IN TRANSACTIONS needs an auto-commit transaction
+                session.run(BACKFILL_QUERY, batch_size=BATCH_SIZE).consume()
+
+            session.run("CALL db.awaitIndexes(300)").consume()
+        print("✅ title_key migration complete.")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+# Graph schema: every constraint and index the API's queries rely on, in one place.
+# Idempotent (IF NOT EXISTS), so it runs both on an empty database before the
+# initial load and against an existing graph (python -m src.database.schema).
+
+from src.services.neo4j_driver import create_driver
+
+SCHEMA = {
+    "ingredient_name": "CREATE CONSTRAINT ingredient_name IF NOT EXISTS "
+                       "FOR (i:Ingredient) REQUIRE i.name IS UNIQUE",
+    "recipe_id": "CREATE CONSTRAINT recipe_id IF NOT EXISTS "
+                 "FOR (r:Recipe) REQUIRE r.recipe_id IS UNIQUE",
+    # Serves case-insensitive title lookups (see services/neo4j_service.recipe_details)
+    "recipe_title_key": "CREATE INDEX recipe_title_key IF NOT EXISTS "
+                        "FOR (r:Recipe) ON (r.title_key)",
+    # Relationship property indexes: context-filtered, score-ordered substitute edges
+    # (utils/substitution_queries.get_direct_subs) and score-ranked SIMILAR_TO neighbours
+    "substitutes_with_context_score": "CREATE INDEX substitutes_with_context_score IF NOT EXISTS "
+                                      "FOR ()-[r:SUBSTITUTES_WITH]-() ON (r.context, r.score)",
+    "similar_to_score": "CREATE INDEX similar_to_score IF NOT EXISTS "
+                        "FOR ()-[r:SIMILAR_TO]-() ON (r.score)",
+}
+
+AWAIT_SECONDS = 300
+
+
+def apply_schema(tx):
+    for statement in SCHEMA.values():
+        tx.run(statement)
+
+
+def index_states(tx) -> dict[str, str]:
+    result = tx.run("SHOW INDEXES YIELD name, state WHERE name IN $names RETURN name, state", names=list(SCHEMA))
+    return {record["name"]: record["state"] for record in result}
+
+
+def main():
+    driver = create_driver()
+    try:
+        with driver.session() as session:
+            print(f"Applying {len(SCHEMA)} constraints/indexes...")
+            # Schema commands cannot share a transaction with writes, but can with each other
+            session.execute_write(apply_schema)
+            session.run(f"CALL db.awaitIndexes({AWAIT_SECONDS})").consume()
+
+            # Constraints created unnamed by older loads keep their generated names
+            for name, state in session.execute_read(index_states).items():
+                print(f"  {name}: {state}")
+        print("✅ Graph schema is up to date.")
+    finally:
+        driver.close()
+
+
+if __name__ == "__main__":
+    main()
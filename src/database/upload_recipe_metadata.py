@@ -1,26 +1,26 @@
 import pandas as pd
-from neo4j import GraphDatabase
 from tqdm import tqdm
 from datetime import datetime
-import os
 
-# === CONFIG ===
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "12345678")
+from src.services.neo4j_driver import create_driver
+from src.utils.directions import parse_directions
+from src.utils.recipe_ids import ensure_recipe_ids
+from src.utils.titles import title_key
 
+# === CONFIG ===
 CSV_PATH = "/Users/rangareddy/Development/OSS/plate-planner-api/src/data/raw/recipe_dataset_200k.csv"
 BATCH_SIZE = 500
 
-# === Neo4j Driver ===
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 # === Utility ===
+def create_title_key_index(tx):
+    tx.run("CREATE INDEX recipe_title_key IF NOT EXISTS FOR (r:Recipe) ON (r.title_key)")
+
 def create_recipe_nodes(tx, batch):
     for recipe in batch:
         tx.run("""
             MERGE (r:Recipe {recipe_id: $recipe_id})
             SET r.title = $title,
+                r.title_key = $title_key,
                 r.directions = $directions,
                 r.link = $link,
                 r.source = $source
@@ -36,17 +36,19 @@ def main():
     print(f"🚀 Starting upload at {start.strftime('%H:%M:%S')}")
 
     print("📖 Reading CSV...")
-    df = pd.read_csv(CSV_PATH)
+    df = ensure_recipe_ids(pd.read_csv(CSV_PATH))
 
     print("🧹 Cleaning and preparing records...")
-    df = df[['title', 'directions', 'link', 'source']].copy()
+    df = df[['recipe_id', 'title', 'directions', 'link', 'source']].copy()
     df = df.dropna(subset=['title'])
-    df = df.reset_index().rename(columns={'index': 'recipe_id'})  # create unique ID if not available
+    df['title_key'] = df['title'].astype(str).map(title_key)
+    df['directions'] = df['directions'].map(parse_directions)
 
     records = df.to_dict(orient="records")
 
     print(f"📦 Inserting {len(records):,} recipes into Neo4j...")
-    with driver.session() as session:
+    with create_driver() as driver, driver.session() as session:
+        session.execute_write(create_title_key_index)
         for batch in tqdm(batch_iter(records, BATCH_SIZE), total=(len(records) // BATCH_SIZE + 1), desc="📤 Uploading"):
             session.execute_write(create_recipe_nodes, batch)
 
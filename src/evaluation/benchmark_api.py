@@ -0,0 +1,288 @@
+# Load test of the HTTP API against a synthetic fixture.
+#
+# Builds (or reuses) a synthetic data tree, starts the app under uvicorn in a
+# child process pointed at it (PLATE_PLANNER_DATA_ROOT) with an in-memory Neo4j
+# stand-in, then drives /suggest_recipes, /substitute and /recipes/{title} with
+# closed-loop clients at fixed concurrency levels. Throughput and p50/p95/p99
+# latencies go to a JSON report; --baseline compares against an earlier report
+# and exits non-zero on regressions.
+#
+# Server settings (INFERENCE_WORKERS, QUERY_ENCODER, ...) are inherited from the
+# environment and recorded in the report.
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from urllib.parse import quote
+
+import httpx
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.database import materialize_top_substitutes
+from src.evaluation.fake_neo4j import FakeGraph, FakeNeo4jDriver
+from src.evaluation.synthetic_fixture import CONTEXTS, MANIFEST_FILE, build_fixture, fixture_path
+from src.pipelines.build_ingredient_postings import parse_ner
+
+paths = DataPaths()
+
+SCENARIOS = ("suggest_recipes", "substitute", "recipe_details")
+DEFAULT_CONCURRENCY = [1, 8, 32]
+DEFAULT_FIXTURE_DIR = paths.benchmarks / "api_fixture"
+
+# Share of recipe lookups for titles that do not exist (404s are part of real traffic)
+MISSING_TITLE_RATE = 0.05
+EXPECTED_STATUSES = {200, 404}
+
+SERVER_SETTINGS = ("INFERENCE_WORKERS", "INFERENCE_THREADS_PER_WORKER", "INFERENCE_QUEUE_SIZE",
+                   "RECIPE_EMBEDDING_DTYPE", "QUERY_ENCODER", "QUERY_ENCODING")
+
+
+# ----------------- Request mixes -----------------
+def ingredient_popularity(metadata: pd.DataFrame) -> tuple[list[str], np.ndarray]:
+    """Fixture ingredients and their sampling weights (document frequency), so pantries look like recipes."""
+    counts = Counter(name for raw in metadata["NER"] for name in set(parse_ner(raw)))
+    names = sorted(counts)
+    weights = np.array([counts[n] for n in names], dtype=np.float64)
+    return names, weights / weights.sum()
+
+
+def generate_requests(scenario: str, metadata: pd.DataFrame, n: int, seed: int) -> list[dict]:
+    """`n` httpx request specs for one scenario; the same seed always yields the same requests."""
+    rng = np.random.default_rng([seed, SCENARIOS.index(scenario)])
+    names, weights = ingredient_popularity(metadata)
+
+    if scenario == "suggest_recipes":
+        return [
+            {"method": "POST", "url": "/suggest_recipes",
+             "json": {"ingredients": [names[i] for i in rng.choice(len(names), int(rng.integers(2, 9)),
+                                                                    replace=False, p=weights)],
+                      "top_n": 5}}
+            for _ in range(n)
+        ]
+
+    if scenario == "substitute":
+        specs = []
+        for _ in range(n):
+            params = {"ingredient": names[rng.choice(len(names), p=weights)],
+                      "hybrid": bool(rng.random() < 0.5), "top_k": 5}
+            context = rng.choice([*CONTEXTS, None])
+            if context is not None:
+                params["context"] = str(context)
+            specs.append({"method": "GET", "url": "/substitute", "params": params})
+        return specs
+
+    titles = metadata["title"].astype(str).to_numpy()
+    specs = []
+    for i in range(n):
+        title = f"Unknown Recipe #{i}" if rng.random() < MISSING_TITLE_RATE else titles[rng.integers(len(titles))]
+        specs.append({"method": "GET", "url": f"/recipes/{quote(title, safe='')}"})
+    return specs
+
+
+# ----------------- Load generation -----------------
+def latency_summary(latencies_ms: list[float]) -> dict:
+    values = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        "p50": float(np.percentile(values, 50)),
+        "p95": float(np.percentile(values, 95)),
+        "p99": float(np.percentile(values, 99)),
+        "mean": float(values.mean()),
+        "max": float(values.max()),
+    }
+
+
+async def run_scenario(client: httpx.AsyncClient, specs: list[dict], concurrency: int) -> dict:
+    """Send every spec with `concurrency` closed-loop clients (each waits for its previous response)."""
+    pending = iter(specs)
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+
+    async def client_loop():
+        for spec in pending:   # one shared iterator: every spec is sent exactly once
+            start = time.perf_counter()
+            try:
+                response = await client.request(**spec)
+                statuses[response.status_code] += 1
+            except httpx.HTTPError:
+                statuses["transport_error"] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    errors = sum(count for status, count in statuses.items() if status not in EXPECTED_STATUSES)
+    return {
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "seconds": seconds,
+        "throughput_rps": len(latencies) / seconds,
+        "error_rate": errors / len(latencies),
+        "status_counts": {str(status): count for status, count in sorted(statuses.items(), key=str)},
+        "latency_ms": latency_summary(latencies),
+    }
+
+
+async def run_benchmark(base_url: str, metadata: pd.DataFrame, scenarios, concurrency_levels,
+                        n_requests: int, warmup: int, seed: int) -> list[dict]:
+    limits = httpx.Limits(max_connections=max(concurrency_levels), max_keepalive_connections=max(concurrency_levels))
+    results = []
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        for scenario in scenarios:
+            specs = generate_requests(scenario, metadata, warmup + n_requests, seed)
+            await run_scenario(client, specs[:warmup], 1)
+            for concurrency in concurrency_levels:
+                row = {"scenario": scenario, **await run_scenario(client, specs[warmup:], concurrency)}
+                latency = row["latency_ms"]
+                print(f"  {scenario:16s} c={concurrency:<3d} {row['throughput_rps']:8.1f} req/s | "
+                      f"p50 {latency['p50']:7.2f} | p95 {latency['p95']:7.2f} | p99 {latency['p99']:7.2f} ms | "
+                      f"errors {row['error_rate']:.1%}")
+                results.append(row)
+    return results
+
+
+# ----------------- Server -----------------
+def serve(fixture: Path, host: str, port: int, neo4j_latency_ms: float):
+    """Child process: the real app on the fixture data, with Neo4j replaced by FakeNeo4jDriver."""
+    if DataPaths().data_root.resolve() != fixture.resolve():
+        raise SystemExit("PLATE_PLANNER_DATA_ROOT must point at the fixture before the app is imported")
+
+    import uvicorn
+
+    from src.api.app import app
+    from src.services.neo4j_driver import set_driver
+
+    graph = FakeGraph.from_fixture(fixture)
+    # like a bootstrapped graph (database/bootstrap_graph.py step 2b)
+    graph.materialize_top_substitutes(materialize_top_substitutes.TOP_K)
+    set_driver(FakeNeo4jDriver(graph, neo4j_latency_ms))
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+@contextmanager
+def fixture_server(fixture: Path, port: int, neo4j_latency_ms: float, startup_timeout: float = 300):
+    """Start `serve` in a child process and yield its base URL once the app answers."""
+    host = "127.0.0.1"
+    env = {**os.environ, "PLATE_PLANNER_DATA_ROOT": str(fixture.resolve())}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.evaluation.benchmark_api", "--serve", "--fixture", str(fixture),
+         "--port", str(port), "--neo4j-latency-ms", str(neo4j_latency_ms)],
+        cwd=paths.project_root, env=env,
+    )
+    base_url = f"http://{host}:{port}"
+    try:
+        deadline = time.time() + startup_timeout
+        while True:
+            if process.poll() is not None:
+                raise RuntimeError(f"API server exited during startup (code {process.returncode})")
+            try:
+                if httpx.get(f"{base_url}/", timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.time() > deadline:
+                raise TimeoutError(f"API server did not start within {startup_timeout:.0f}s")
+            time.sleep(0.5)
+        yield base_url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+# ----------------- Regressions -----------------
+def compare_to_baseline(results: list[dict], baseline: list[dict], tolerance: float) -> list[str]:
+    """Rows whose p95 latency or throughput is more than `tolerance` worse than the baseline run."""
+    previous = {(row["scenario"], row["concurrency"]): row for row in baseline}
+    regressions = []
+    for row in results:
+        base = previous.get((row["scenario"], row["concurrency"]))
+        if base is None:
+            continue
+        name = f"{row['scenario']} c={row['concurrency']}"
+        if row["latency_ms"]["p95"] > base["latency_ms"]["p95"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {base['latency_ms']['p95']:.2f} → {row['latency_ms']['p95']:.2f} ms")
+        if row["throughput_rps"] < base["throughput_rps"] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput_rps']:.1f} → {row['throughput_rps']:.1f} req/s")
+        if row["error_rate"] > base["error_rate"]:
+            regressions.append(f"{name}: error rate {base['error_rate']:.1%} → {row['error_rate']:.1%}")
+    return regressions
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the API against a synthetic fixture")
+    parser.add_argument("--fixture", type=Path, default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument("--recipes", type=int, default=5000, help="Recipes in the generated fixture")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rebuild", action="store_true", help="Regenerate the fixture even if it exists")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, nargs="+", default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--requests", type=int, default=300, help="Timed requests per scenario and concurrency")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--neo4j-latency-ms", type=float, default=1.0, help="Simulated round trip per Cypher query")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", type=Path, default=None, help="Report path (default: results/benchmarks)")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown vs. the baseline")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(args.fixture, "127.0.0.1", args.port, args.neo4j_latency_ms)
+        return
+
+    manifest_path = args.fixture / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else None
+    if args.rebuild or manifest is None or (manifest["recipes"], manifest["seed"]) != (args.recipes, args.seed):
+        manifest = build_fixture(args.fixture, args.recipes, args.seed)
+    else:
+        print(f"📦 Reusing fixture at {args.fixture} ({manifest['recipes']:,} recipes)")
+    metadata = pd.read_csv(fixture_path(args.fixture, paths.recipe_metadata))
+
+    print(f"🚀 Starting API on the fixture (simulated Neo4j latency {args.neo4j_latency_ms} ms)...")
+    with fixture_server(args.fixture, args.port, args.neo4j_latency_ms) as base_url:
+        print(f"🔍 {args.requests} requests per scenario at concurrency {args.concurrency}")
+        results = asyncio.run(run_benchmark(base_url, metadata, args.scenarios, args.concurrency,
+                                            args.requests, args.warmup, args.seed))
+
+    report = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "fixture": manifest,
+        "config": {"requests": args.requests, "warmup": args.warmup, "seed": args.seed,
+                   "neo4j_latency_ms": args.neo4j_latency_ms,
+                   "server": {name: os.environ.get(name) for name in SERVER_SETTINGS}},
+        "environment": {"python": platform.python_version(), "platform": platform.platform(),
+                        "cpus": os.cpu_count()},
+        "results": results,
+    }
+
+    output = args.output or paths.benchmarks / f"api_{datetime.now():%Y%m%d_%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"📄 Report saved to {output}")
+
+    if args.baseline is not None:
+        regressions = compare_to_baseline(results, json.loads(args.baseline.read_text())["results"], args.tolerance)
+        for line in regressions:
+            print(f"⚠️ Regression: {line}")
+        if regressions:
+            sys.exit(1)
+        print(f"✅ No regressions against {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
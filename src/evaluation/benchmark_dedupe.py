@@ -0,0 +1,98 @@
+# Index size, suggest_recipes latency and duplicate crowding of the top-n with
+# and without near-duplicate handling (pipelines/build_recipe_clusters.py):
+#
+#   all       every recipe indexed, duplicates returned as separate results
+#   collapse  every recipe indexed, each cluster collapsed to its best result
+#   drop      representatives only in the index (build_recipe_index --drop-duplicates), collapsed
+#
+# Indexes are built in memory from recipe_embeddings.npy, so the report does
+# not depend on which variant is currently served.
+
+import argparse
+import json
+import random
+from datetime import datetime
+
+import faiss
+import numpy as np
+
+import src.utils.recipesuggestionmodel as rsm
+from src.config.paths import DataPaths
+from src.evaluation.benchmark_quantization import percentiles, serving_variant
+from src.evaluation.ranx_suggest_recipes import RERANK_WEIGHT, TOP_N, build_qrels_and_run, generate_test_queries
+from src.pipelines.build_recipe_index import build_recipe_index
+
+paths = DataPaths()
+
+
+def crowding(queries, cluster_of: dict[int, int]) -> tuple[float, float]:
+    """(share of top-n slots taken by a duplicate of a higher result, mean results per query)."""
+    slots = duplicates = 0
+    for ingredients, _ in queries:
+        results = rsm.suggest_recipes(ingredients, top_n=TOP_N, rerank_weight=RERANK_WEIGHT)
+        clusters = [cluster_of.get(r["recipe_id"], r["recipe_id"]) for r in results]
+        slots += len(clusters)
+        duplicates += len(clusters) - len(set(clusters))
+    return duplicates / max(slots, 1), slots / max(len(queries), 1)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nlist", type=int, default=0, help="Build IVF indexes with this many lists")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    if not rsm.RECIPE_CLUSTERS_PATH.exists():
+        raise SystemExit(f"⚠️ No {rsm.RECIPE_CLUSTERS_PATH}; run `task index:clusters` first.")
+    cluster_of = rsm.load_recipe_clusters()
+
+    random.seed(args.seed)
+    queries = generate_test_queries(rsm.metadata_df, n=args.queries, min_ing=2, max_ing=3)
+
+    embeddings = np.load(rsm.EMBEDDINGS_PATH, mmap_mode="r")
+    recipe_ids = rsm.metadata_df["recipe_id"].to_numpy()
+    keep = np.flatnonzero(~np.isin(recipe_ids, np.fromiter(cluster_of, dtype=np.int64, count=len(cluster_of))))
+    print(f"⚙️ Building full ({len(recipe_ids):,}) and deduplicated ({len(keep):,}) indexes...")
+    full = build_recipe_index(embeddings, recipe_ids, nlist=args.nlist)
+    deduped = build_recipe_index(embeddings[keep], recipe_ids[keep], nlist=args.nlist)
+
+    variants = {"all": (full, None), "collapse": (full, cluster_of), "drop": (deduped, cluster_of)}
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "queries": len(queries),
+              "recipes": len(recipe_ids), "duplicates": len(cluster_of), "variants": {}}
+    saved_clusters = rsm.recipe_clusters
+    try:
+        for name, (index, clusters) in variants.items():
+            print(f"🔍 {name}...")
+            rsm.recipe_clusters = clusters
+            with serving_variant(rsm.model, index, rsm.recipe_embeddings):
+                _, _, latencies, empty = build_qrels_and_run(queries)
+                duplicate_share, mean_results = crowding(queries, cluster_of)
+            report["variants"][name] = {"ntotal": int(index.ntotal),
+                                        "index_bytes": int(faiss.serialize_index(index).nbytes),
+                                        "duplicate_share": duplicate_share, "mean_results": mean_results,
+                                        "empty": empty, **percentiles(latencies)}
+    finally:
+        rsm.recipe_clusters = saved_clusters
+
+    lines = [f"Near-duplicate recipe benchmark — {report['created']} ({len(queries)} queries, "
+             f"{report['duplicates']:,} of {report['recipes']:,} recipes are duplicates)", ""]
+    baseline = report["variants"]["all"]
+    for name, row in report["variants"].items():
+        lines.append(f"{name:9s}: {row['ntotal']:>10,} vectors | {row['index_bytes'] / 2**20:8.1f} MiB "
+                     f"({row['index_bytes'] / baseline['index_bytes'] - 1:+.1%}) | "
+                     f"suggest p50 {row['p50_ms']:6.2f} ms | p99 {row['p99_ms']:6.2f} ms | "
+                     f"duplicate top-{TOP_N} slots {row['duplicate_share']:.1%} | "
+                     f"{row['mean_results']:.2f} results/query")
+    print("\n".join(lines))
+
+    stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    paths.benchmarks.mkdir(parents=True, exist_ok=True)
+    (paths.benchmarks / f"dedupe_{stamp}.json").write_text(json.dumps(report, indent=2))
+    report_path = paths.benchmarks / f"dedupe_{stamp}.txt"
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Recall and latency of suggest_recipes with and without the posting-list
+# candidates (lexical_k) unioned into the FAISS hits:
+#
+#   candidate recall  the query's source recipe is among the candidates reranked
+#   recall@5/@10, mrr  ranx metrics of the final top-n (ranx_suggest_recipes)
+#
+# lexical_k=0 is the FAISS-only baseline; queries are 2-3 NER ingredients
+# sampled from a recipe, which is the relevant result.
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+
+from ranx import evaluate
+
+import src.utils.recipesuggestionmodel as rsm
+from src.config.paths import DataPaths
+from src.evaluation.benchmark_quantization import percentiles
+from src.evaluation.ranx_suggest_recipes import MIN_OVERLAP, RAW_K, build_qrels_and_run, generate_test_queries
+
+paths = DataPaths()
+
+METRICS = ["recall@5", "recall@10", "mrr"]
+DEFAULT_LEXICAL_K = "0,25,100,400"
+
+
+def candidate_recall(queries, lexical_k: int) -> tuple[float, float, list[float]]:
+    """(share of queries whose recipe is a rerank candidate, mean candidates per query, latencies in ms)."""
+    recipe_ids = rsm.metadata_df["recipe_id"].to_numpy()
+    hits, sizes, latencies = 0, 0, []
+    for ingredients, expected_id in queries:
+        start = time.perf_counter()
+        semantic, _, _, lexical_scores = rsm.recipe_candidates(ingredients, RAW_K, MIN_OVERLAP, lexical_k)
+        latencies.append((time.perf_counter() - start) * 1000)
+        candidates = {str(recipe_ids[pos]) for pos in {**semantic, **lexical_scores}}
+        hits += expected_id in candidates
+        sizes += len(candidates)
+    return hits / max(len(queries), 1), sizes / max(len(queries), 1), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--lexical-k", default=DEFAULT_LEXICAL_K, help="Comma-separated lexical_k values")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    if rsm.ner_postings is None:
+        raise SystemExit(f"❌ No NER postings at {rsm.NER_POSTINGS_PATH}; run `task index:ner-postings`.")
+
+    random.seed(args.seed)
+    queries = generate_test_queries(rsm.metadata_df, n=args.queries, min_ing=2, max_ing=3)
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "queries": len(queries),
+              "recipes": len(rsm.metadata_df), "raw_k": RAW_K, "variants": {}}
+
+    for lexical_k in (int(k) for k in args.lexical_k.split(",")):
+        print(f"🔍 lexical_k={lexical_k}...")
+        recall, size, candidate_ms = candidate_recall(queries, lexical_k)
+        qrels, run, latencies, empty = build_qrels_and_run(queries, lexical_k=lexical_k)
+        scores = {k: float(v) for k, v in evaluate(qrels=qrels, run=run, metrics=METRICS).items()}
+        report["variants"][str(lexical_k)] = {"candidate_recall": recall, "candidates": size, **scores,
+                                              "empty": empty, "candidates_latency": percentiles(candidate_ms),
+                                              "suggest_latency": percentiles(latencies)}
+
+    lines = [f"Lexical candidates benchmark — {report['created']} ({len(queries)} queries, "
+             f"{report['recipes']:,} recipes, raw_k={RAW_K})", ""]
+    for lexical_k, row in report["variants"].items():
+        lines.append(f"lexical_k={lexical_k:>4s}: candidate recall {row['candidate_recall']:.3f} "
+                     f"({row['candidates']:6.1f} candidates) | "
+                     + " | ".join(f"{k} {row[k]:.4f}" for k in METRICS)
+                     + f" | suggest p50 {row['suggest_latency']['p50_ms']:6.2f} ms"
+                     f" | p99 {row['suggest_latency']['p99_ms']:6.2f} ms")
+    print("\n".join(lines))
+
+    stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    paths.benchmarks.mkdir(parents=True, exist_ok=True)
+    (paths.benchmarks / f"lexical_candidates_{stamp}.json").write_text(json.dumps(report, indent=2))
+    report_path = paths.benchmarks / f"lexical_candidates_{stamp}.txt"
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# Memory, encode latency and ranx quality of quantized recipe-suggestion serving
+# variants, against the current float32 index + PyTorch encoder.
+#
+# Index variants are built in memory from recipe_embeddings.npy; the ONNX
+# encoder is included once pipelines/export_onnx_encoder.py has been run.
+
+import argparse
+import json
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+import faiss
+import numpy as np
+from ranx import evaluate
+
+import src.utils.recipesuggestionmodel as rsm
+from src.config.paths import DataPaths
+from src.evaluation.ranx_suggest_recipes import build_qrels_and_run, generate_test_queries
+from src.pipelines.build_recipe_index import build_recipe_index
+from src.utils.embedding_quantization import EMBEDDING_DTYPES, QuantizedEmbeddings
+from src.utils.onnx_encoder import INT8_MODEL_FILE
+
+paths = DataPaths()
+
+METRICS = ["precision@5", "recall@5", "recall@10", "ndcg@5", "mrr"]
+
+
+# ----------------- Variants -----------------
+@contextmanager
+def serving_variant(encoder, index, embeddings):
+    """Temporarily point suggest_recipes at another encoder / index / embedding table."""
+    saved = rsm.model, rsm.index, rsm.recipe_embeddings, rsm.search_params
+    rsm.model, rsm.index, rsm.recipe_embeddings = encoder, index, embeddings
+    rsm.search_params = faiss.SearchParametersIVF(nprobe=rsm.NPROBE) if faiss.try_extract_index_ivf(index) else None
+    try:
+        yield
+    finally:
+        rsm.model, rsm.index, rsm.recipe_embeddings, rsm.search_params = saved
+
+
+def build_indexes(nlist: int) -> dict:
+    """name -> (faiss index, QuantizedEmbeddings); "float32" is the index currently served."""
+    embeddings = np.load(rsm.EMBEDDINGS_PATH, mmap_mode="r")
+    recipe_ids = rsm.metadata_df["recipe_id"].to_numpy()
+
+    variants = {"float32": (rsm.index, QuantizedEmbeddings.from_vectors(embeddings, "float32"))}
+    for dtype in EMBEDDING_DTYPES[1:]:
+        print(f"⚙️ Building {dtype} scalar-quantized index...")
+        variants[dtype] = (build_recipe_index(embeddings, recipe_ids, dtype),
+                           QuantizedEmbeddings.from_vectors(embeddings, dtype))
+        if nlist:
+            variants[f"ivf{nlist}-{dtype}"] = (build_recipe_index(embeddings, recipe_ids, dtype, nlist),
+                                               variants[dtype][1])
+    return variants
+
+
+def load_encoders() -> dict:
+    encoders = {"torch": rsm.model}
+    if (rsm.QUERY_ENCODER_ONNX_DIR / INT8_MODEL_FILE).exists():
+        encoders["onnx-int8"] = rsm.load_query_encoder("onnx")
+    else:
+        print(f"⚠️ No ONNX encoder in {rsm.QUERY_ENCODER_ONNX_DIR}; run `task models:export-onnx` to include it.")
+    return encoders
+
+
+# ----------------- Measurements -----------------
+def percentiles(timings):
+    return {
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "mean_ms": float(statistics.fmean(timings)),
+    }
+
+
+def time_encoder(encoder, texts, warmup=5):
+    for text in texts[:warmup]:
+        encoder.encode([text])
+    timings = []
+    for text in texts:
+        start = time.perf_counter()
+        encoder.encode([text])
+        timings.append((time.perf_counter() - start) * 1000)
+    return percentiles(timings)
+
+
+def encoder_bytes(name, encoder):
+    if name == "torch":
+        return int(sum(p.numel() * p.element_size() for p in encoder.parameters()))
+    return (rsm.QUERY_ENCODER_ONNX_DIR / INT8_MODEL_FILE).stat().st_size
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--nlist", type=int, default=0, help="Also evaluate IVF variants with this many lists")
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    queries = generate_test_queries(rsm.metadata_df, n=args.queries, min_ing=2, max_ing=3)
+    texts = [" ".join(ingredients) for ingredients, _ in queries]
+
+    encoders = load_encoders()
+    indexes = build_indexes(args.nlist)
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "queries": len(queries),
+              "encoders": {}, "indexes": {}, "runs": []}
+    for name, encoder in encoders.items():
+        report["encoders"][name] = {"bytes": encoder_bytes(name, encoder), **time_encoder(encoder, texts)}
+    for name, (index, embeddings) in indexes.items():
+        report["indexes"][name] = {"index_bytes": int(faiss.serialize_index(index).nbytes),
+                                   "embedding_bytes": embeddings.nbytes}
+
+    baseline = None
+    for enc_name, encoder in encoders.items():
+        for idx_name, (index, embeddings) in indexes.items():
+            print(f"🔍 {enc_name} encoder × {idx_name} index...")
+            with serving_variant(encoder, index, embeddings):
+                qrels, run, latencies, empty = build_qrels_and_run(queries)
+            scores = {k: float(v) for k, v in evaluate(qrels=qrels, run=run, metrics=METRICS).items()}
+            baseline = baseline or scores   # first variant = torch × float32, the current path
+            report["runs"].append({
+                "encoder": enc_name,
+                "index": idx_name,
+                **scores,
+                **{f"Δ{k}": scores[k] - baseline[k] for k in METRICS},
+                "empty": empty,
+                **percentiles(latencies),
+            })
+
+    lines = [f"Recipe suggestion quantization benchmark — {report['created']} ({len(queries)} queries)", ""]
+    for name, row in report["encoders"].items():
+        lines.append(f"encoder {name:10s}: {row['bytes'] / 2**20:7.1f} MiB | "
+                     f"encode p50 {row['p50_ms']:6.2f} ms | p99 {row['p99_ms']:6.2f} ms")
+    for name, row in report["indexes"].items():
+        lines.append(f"index   {name:10s}: {row['index_bytes'] / 2**20:7.1f} MiB | "
+                     f"embeddings {row['embedding_bytes'] / 2**20:7.1f} MiB")
+    lines.append("")
+    for row in report["runs"]:
+        lines.append(f"{row['encoder']:10s} × {row['index']:14s}: ndcg@5 {row['ndcg@5']:.4f} "
+                     f"(Δ {row['Δndcg@5']:+.4f}) | mrr {row['mrr']:.4f} (Δ {row['Δmrr']:+.4f}) | "
+                     f"suggest p50 {row['p50_ms']:6.2f} ms | p99 {row['p99_ms']:6.2f} ms")
+    print("\n".join(lines))
+
+    stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    paths.benchmarks.mkdir(parents=True, exist_ok=True)
+    (paths.benchmarks / f"quantization_{stamp}.json").write_text(json.dumps(report, indent=2))
+    report_path = paths.benchmarks / f"quantization_{stamp}.txt"
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
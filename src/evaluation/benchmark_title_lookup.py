@@ -0,0 +1,124 @@
+# Latency of case-insensitive recipe title lookups: toLower() scan vs. indexed title_key.
+#
+# Runs against the configured Neo4j on a throwaway :TitleLookupBench label, so the
+# real Recipe nodes are never touched. Nodes are grown incrementally to each size.
+
+import argparse
+import random
+import statistics
+import time
+from datetime import datetime
+
+from src.config.paths import DataPaths
+from src.services.neo4j_driver import create_driver
+from src.utils.titles import title_key
+
+paths = DataPaths()
+
+DEFAULT_SIZES = [200_000, 2_000_000]
+CREATE_BATCH = 50_000
+WORDS = ["Marinated", "Flank", "Steak", "Easy", "Chocolate", "Chip", "Cookies",
+         "Creamy", "Chicken", "Pasta", "Grandma's", "Apple", "Pie", "Spicy", "Soup"]
+
+SCAN_QUERY = """
+    MATCH (r:TitleLookupBench)
+    WHERE toLower(r.title) = toLower($title)
+    RETURN r.recipe_id AS recipe_id
+"""
+KEYED_QUERY = """
+    MATCH (r:TitleLookupBench {title_key: $title_key})
+    RETURN r.recipe_id AS recipe_id
+"""
+
+
+def synthetic_title(i: int) -> str:
+    # Mirrors the Cypher expression in create_nodes()
+    return f"{WORDS[i % len(WORDS)]} {WORDS[(i // 7) % len(WORDS)]} #{i}"
+
+
+def create_nodes(tx, start, stop):
+    tx.run("""
+        UNWIND range($start, $stop - 1) AS i
+        WITH i, $words[i % size($words)] + ' ' + $words[(i / 7) % size($words)] + ' #' + toString(i) AS title
+        CREATE (:TitleLookupBench {recipe_id: i, title: title, title_key: toLower(trim(title))})
+    """, start=start, stop=stop, words=WORDS)
+
+
+def run_lookup(tx, query, **params):
+    return [r["recipe_id"] for r in tx.run(query, **params)]
+
+
+def time_queries(session, query, param_sets, warmup=3):
+    for params in param_sets[:warmup]:
+        session.execute_read(run_lookup, query, **params)
+    timings = []
+    for params in param_sets:
+        start = time.perf_counter()
+        session.execute_read(run_lookup, query, **params)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def summarize(timings):
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return f"p50 {statistics.median(ordered):9.2f} ms | p95 {p95:9.2f} ms | mean {statistics.fmean(ordered):9.2f} ms"
+
+
+def cleanup(session):
+    session.run("""
+        MATCH (r:TitleLookupBench)
+        CALL { WITH r DETACH DELETE r } IN TRANSACTIONS OF 10000 ROWS
+    """).consume()
+    session.run("DROP INDEX title_lookup_bench_key IF EXISTS").consume()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--queries", type=int, default=50, help="Lookups timed per size and strategy")
+    args = parser.parse_args()
+
+    driver = create_driver()
+    lines = [f"Recipe title lookup benchmark — {datetime.now():%Y-%m-%d %H:%M:%S}", ""]
+    try:
+        with driver.session() as session:
+            cleanup(session)
+            session.run("CREATE INDEX title_lookup_bench_key IF NOT EXISTS "
+                        "FOR (r:TitleLookupBench) ON (r.title_key)").consume()
+
+            created = 0
+            for size in sorted(args.sizes):
+                print(f"📦 Growing :TitleLookupBench to {size:,} nodes...")
+                while created < size:
+                    stop = min(created + CREATE_BATCH, size)
+                    session.execute_write(create_nodes, created, stop)
+                    created = stop
+                session.run("CALL db.awaitIndexes(600)").consume()
+
+                # Mixed-case inputs, as clients send them
+                ids = random.sample(range(size), args.queries)
+                titles = [synthetic_title(i).upper() for i in ids]
+
+                scan = time_queries(session, SCAN_QUERY, [{"title": t} for t in titles])
+                keyed = time_queries(session, KEYED_QUERY, [{"title_key": title_key(t)} for t in titles])
+
+                lines.append(f"=== {size:,} recipes ({args.queries} lookups) ===")
+                lines.append(f"toLower(r.title) scan : {summarize(scan)}")
+                lines.append(f"title_key index seek  : {summarize(keyed)}")
+                lines.append(f"speedup (p50)         : {statistics.median(scan) / statistics.median(keyed):.1f}x")
+                lines.append("")
+                print("\n".join(lines[-5:]))
+        with driver.session() as session:
+            cleanup(session)
+    finally:
+        driver.close()
+
+    report_path = paths.benchmarks / f"title_lookup_{datetime.now():%Y%m%d_%H%M%S}.txt"
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,10 @@
 
 from datetime import datetime
 
-from evaluation import normalize_ingredient
-from neo4j import GraphDatabase
+from src.evaluation.hybrid_substitution import normalize_ingredient
+from src.services.neo4j_driver import create_driver
 
 # --- Configuration ---
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASSWORD = "12345678"
 OUTPUT_FILE = "ingredients_no_substitutes_normalized.txt"
 
 # --- Neo4j Access ---
@@ -39,7 +36,7 @@ def generate_report(ingredients):
 
 # --- Main ---
 def main():
-    driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
+    driver = create_driver()
     try:
         with driver.session() as session:
             ingredients = session.execute_read(get_ingredients_without_subs)
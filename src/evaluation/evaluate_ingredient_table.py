@@ -0,0 +1,134 @@
+# Offline check of QUERY_ENCODING=table: how close pooled ingredient-table query
+# vectors are to full transformer encodings, what that does to retrieval (FAISS
+# neighbour overlap, ranx metrics) and how much latency it removes.
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime
+
+import faiss
+import numpy as np
+from ranx import evaluate
+
+import src.utils.recipesuggestionmodel as rsm
+from src.config.paths import DataPaths
+from src.evaluation.benchmark_quantization import percentiles
+from src.evaluation.ranx_suggest_recipes import build_qrels_and_run, generate_test_queries
+from src.utils.ingredient_table import IngredientTable
+
+paths = DataPaths()
+
+METRICS = ["precision@5", "recall@5", "recall@10", "ndcg@5", "mrr"]
+
+
+def full_encode(ingredients):
+    query_vec = np.asarray(rsm.model.encode([" ".join(ingredients)]), dtype=np.float32)
+    faiss.normalize_L2(query_vec)
+    return query_vec
+
+
+def table_encode(table, ingredients):
+    query_vec = table.encode(ingredients, fallback=rsm.model)
+    faiss.normalize_L2(query_vec)
+    return query_vec
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    out = fn(*args)
+    return out, (time.perf_counter() - start) * 1000
+
+
+def compare_vectors(table, queries, raw_k):
+    cosines, overlap10, overlap_k, oov = [], [], [], 0
+    full_ms, table_ms, search_ms = [], [], []
+    for ingredients, _ in queries:
+        full_vec, ms = timed(full_encode, ingredients)
+        full_ms.append(ms)
+        table_vec, ms = timed(table_encode, table, ingredients)
+        table_ms.append(ms)
+        oov += sum(table.lookup(i) is None for i in ingredients)
+
+        (_, full_ids), ms = timed(rsm.index.search, full_vec, raw_k)
+        search_ms.append(ms)
+        _, table_ids = rsm.index.search(table_vec, raw_k)
+
+        cosines.append(float(full_vec[0] @ table_vec[0]))
+        overlap10.append(len(set(full_ids[0][:10]) & set(table_ids[0][:10])) / 10)
+        overlap_k.append(len(set(full_ids[0]) & set(table_ids[0])) / raw_k)
+
+    n_terms = sum(len(i) for i, _ in queries)
+    return {
+        "cosine_mean": float(np.mean(cosines)),
+        "cosine_p5": float(np.percentile(cosines, 5)),
+        "faiss_overlap@10": float(np.mean(overlap10)),
+        f"faiss_overlap@{raw_k}": float(np.mean(overlap_k)),
+        "oov_rate": oov / max(n_terms, 1),
+        "encode_full": percentiles(full_ms),
+        "encode_table": percentiles(table_ms),
+        "faiss_search": percentiles(search_ms),
+    }
+
+
+def compare_suggestions(table, queries):
+    rows = {}
+    for name, variant in (("full", None), ("table", table)):
+        rsm.ingredient_table = variant
+        qrels, run, latencies, empty = build_qrels_and_run(queries)
+        scores = {k: float(v) for k, v in evaluate(qrels=qrels, run=run, metrics=METRICS).items()}
+        rows[name] = {**scores, "empty": empty, "suggest": percentiles(latencies)}
+    rows["delta"] = {k: rows["table"][k] - rows["full"][k] for k in METRICS}
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--raw-k", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=13)
+    args = parser.parse_args()
+
+    if not rsm.INGREDIENT_TABLE_DIR.exists():
+        raise SystemExit(f"❌ No ingredient table at {rsm.INGREDIENT_TABLE_DIR}; run `task models:ingredient-table`.")
+    table = IngredientTable.load(rsm.INGREDIENT_TABLE_DIR)
+    saved_table = rsm.ingredient_table
+
+    random.seed(args.seed)
+    queries = generate_test_queries(rsm.metadata_df, n=args.queries, min_ing=2, max_ing=3)
+    try:
+        vectors = compare_vectors(table, queries, args.raw_k)
+        suggestions = compare_suggestions(table, queries)
+    finally:
+        rsm.ingredient_table = saved_table
+
+    report = {"created": datetime.now().isoformat(timespec="seconds"), "queries": len(queries),
+              "table_size": len(table), "vectors": vectors, "suggestions": suggestions}
+
+    lines = [f"Ingredient-table query encoding — {report['created']} ({len(queries)} queries, "
+             f"{len(table):,} ingredients)", ""]
+    lines.append(f"cosine(full, table)  : mean {vectors['cosine_mean']:.4f} | p5 {vectors['cosine_p5']:.4f}")
+    lines.append(f"FAISS overlap        : @10 {vectors['faiss_overlap@10']:.3f} | "
+                 f"@{args.raw_k} {vectors[f'faiss_overlap@{args.raw_k}']:.3f}")
+    lines.append(f"OOV ingredients      : {vectors['oov_rate']:.2%}")
+    for key in ("encode_full", "encode_table", "faiss_search"):
+        lines.append(f"{key:21s}: p50 {vectors[key]['p50_ms']:7.3f} ms | p99 {vectors[key]['p99_ms']:7.3f} ms")
+    lines.append("")
+    for name in ("full", "table"):
+        row = suggestions[name]
+        lines.append(f"suggest ({name:5s})      : ndcg@5 {row['ndcg@5']:.4f} | mrr {row['mrr']:.4f} | "
+                     f"p50 {row['suggest']['p50_ms']:.2f} ms | p99 {row['suggest']['p99_ms']:.2f} ms")
+    lines.append("delta (table - full) : " + " | ".join(f"{k} {v:+.4f}" for k, v in suggestions["delta"].items()))
+    print("\n".join(lines))
+
+    stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    paths.benchmarks.mkdir(parents=True, exist_ok=True)
+    (paths.benchmarks / f"ingredient_table_{stamp}.json").write_text(json.dumps(report, indent=2))
+    report_path = paths.benchmarks / f"ingredient_table_{stamp}.txt"
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
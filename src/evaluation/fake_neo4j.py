@@ -0,0 +1,224 @@
+# In-memory stand-in for the Neo4j driver, serving the read queries of
+# services/neo4j_service.py from a synthetic data tree (see synthetic_fixture.py).
+#
+# Only the driver surface the API uses is implemented: driver.session(),
+# session.execute_read(fn, ...) and tx.run(query, **params). Queries are
+# recognised by their parameters/relationship types, not parsed; anything
+# else raises NotImplementedError so a new query cannot be silently mis-served.
+# RecordingGraph instead accepts (and counts) any query, for the write loaders.
+
+import time
+from ast import literal_eval
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.evaluation.synthetic_fixture import fixture_path
+from src.utils.recipe_ids import ensure_recipe_ids
+from src.utils.titles import title_key
+
+paths = DataPaths()
+
+
+class FakeRecord(dict):
+    def data(self) -> dict:
+        return dict(self)
+
+
+class FakeResult(list):
+    def single(self):
+        return self[0] if self else None
+
+
+def _literal_list(raw) -> list[str]:
+    try:
+        items = literal_eval(raw) if isinstance(raw, str) else []
+    except (ValueError, SyntaxError):
+        return [raw]
+    return [str(i) for i in items] if isinstance(items, (list, tuple)) else [str(items)]
+
+
+# ----------------- Graph -----------------
+class FakeGraph:
+    """Recipes (with HAS_INGREDIENT) and SUBSTITUTES_WITH edges held in plain dicts."""
+
+    def __init__(self, metadata: pd.DataFrame, edges: pd.DataFrame):
+        self.recipes: dict[int, dict] = {}
+        self.by_title_key: dict[str, int] = {}
+        self.recipes_with: dict[str, list[int]] = defaultdict(list)
+        for row in ensure_recipe_ids(metadata).itertuples(index=False):
+            recipe_id = int(row.recipe_id)
+            ingredients = list(dict.fromkeys(_literal_list(row.NER)))
+            self.recipes[recipe_id] = {
+                "recipe_id": recipe_id,
+                "title": row.title,
+                "directions": _literal_list(row.directions),
+                "link": row.link,
+                "source": row.source,
+                "ingredients": ingredients,
+            }
+            self.by_title_key.setdefault(title_key(str(row.title)), recipe_id)
+            for name in ingredients:
+                self.recipes_with[name].append(recipe_id)
+
+        # source -> [(target, score, context)], best first
+        self.substitutes: dict[str, list[tuple[str, float, str]]] = defaultdict(list)
+        for row in edges.sort_values(["score", "target"], ascending=[False, True]).itertuples(index=False):
+            self.substitutes[row.source].append((row.target, float(row.score), row.context))
+        self.ingredients = set(self.recipes_with) | set(edges["source"]) | set(edges["target"])
+        # Ingredient name -> list properties of database/materialize_top_substitutes.py
+        self.top_substitutes: dict[str, dict] = {}
+
+    def materialize_top_substitutes(self, top_k: int) -> None:
+        """Same layout as materialize_top_substitutes.MATERIALIZE_QUERY: by context, best first."""
+        for name in self.ingredients:
+            by_context = defaultdict(list)
+            for target, score, context in self.substitutes.get(name, []):
+                by_context[context or ""].append((target, score))
+            best = [(t, s, c) for c in sorted(by_context) for t, s in by_context[c][:top_k]]
+            self.top_substitutes[name] = {
+                "names": [t for t, _, _ in best],
+                "scores": [s for _, s, _ in best],
+                "contexts": [c for _, _, c in best],
+                "k": top_k,
+            }
+
+    @classmethod
+    def from_fixture(cls, root: Path) -> "FakeGraph":
+        return cls(
+            pd.read_csv(fixture_path(root, paths.recipe_metadata)),
+            pd.read_csv(fixture_path(root, paths.substitution_edges_with_context_cleaned)),
+        )
+
+    # ----------------- Queries -----------------
+    def run(self, query: str, params: dict) -> FakeResult:
+        if "title_key" in params:
+            recipe_id = self.by_title_key.get(params["title_key"])
+            return FakeResult([] if recipe_id is None else [FakeRecord(self.recipes[recipe_id])])
+        if "keys" in params and "ids" in params:
+            return FakeResult(self._recipes_by_keys(params["keys"], params["ids"]))
+        if "items" in params:
+            return FakeResult(self._batch_substitutes(params["items"], params["top_k"], params["hybrid"]))
+        if "top_substitutes" in query and "ingredient" in params:
+            return FakeResult(self._top_substitutes(params["ingredient"]))
+        if "SUBSTITUTES_WITH" in query:
+            return FakeResult(self._direct(params["ingredient"], params.get("context"), params["top_k"]))
+        if "HAS_INGREDIENT" in query and "ingredient" in params:
+            return FakeResult(self._cooccurrence(params["ingredient"], params["top_k"]))
+        raise NotImplementedError(f"FakeGraph does not serve this query:\n{query}")
+
+    def _recipes_by_keys(self, keys: list[str], ids: list[int]) -> list[FakeRecord]:
+        records = []
+        for key in keys:
+            if key in self.by_title_key:
+                records.append(FakeRecord(lookup="title", key=key, **self.recipes[self.by_title_key[key]]))
+        for key in ids:
+            if key in self.recipes:
+                records.append(FakeRecord(lookup="id", key=key, **self.recipes[key]))
+        return records
+
+    def _direct(self, ingredient: str, context: str | None, top_k: int) -> list[FakeRecord]:
+        edges = self.substitutes.get(ingredient, [])
+        if context is not None:
+            edges = [e for e in edges if e[2] == context]
+        return [FakeRecord(substitute=t, score=s, context=c) for t, s, c in edges[:top_k]]
+
+    def _top_substitutes(self, ingredient: str) -> list[FakeRecord]:
+        if ingredient not in self.ingredients:
+            return []
+        empty = {"names": None, "scores": None, "contexts": None, "k": None}
+        return [FakeRecord(self.top_substitutes.get(ingredient, empty))]
+
+    def _batch_substitutes(self, items: list[dict], top_k: int, hybrid: bool) -> list[FakeRecord]:
+        records = []
+        for item in items:
+            edges = [{"name": t, "score": s, "context": c} for t, s, c in self.substitutes.get(item["name"], [])]
+            cooccurrence = self._cooccurrence(item["name"], top_k) if hybrid else []
+            records.append(FakeRecord(
+                ingredient=item["name"],
+                context=item["context"],
+                matched=[e for e in edges if e["context"] == item["context"]][:top_k],
+                fallback=edges[:top_k],
+                cooccurrence=[{"name": r["substitute"], "score": r["score"]} for r in cooccurrence],
+            ))
+        return records
+
+    def _cooccurrence(self, ingredient: str, top_k: int) -> list[FakeRecord]:
+        counts = Counter(
+            name
+            for recipe_id in self.recipes_with.get(ingredient, [])
+            for name in self.recipes[recipe_id]["ingredients"]
+            if name != ingredient
+        )
+        ranked = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:top_k]
+        return [FakeRecord(substitute=name, score=count) for name, count in ranked]
+
+
+class RecordingGraph:
+    """Accepts any query and only counts it, for timing the client side of the loaders.
+
+    `rows` counts UNWIND list items (or 1 per query without a list parameter),
+    so queries / rows shows how well a loader batches its round trips.
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def run(self, query: str, params: dict) -> FakeResult:
+        self.queries += 1
+        self.rows += max((len(v) for v in params.values() if isinstance(v, list)), default=1)
+        return FakeResult()
+
+
+# ----------------- Driver surface -----------------
+class FakeTransaction:
+    def __init__(self, graph: "FakeGraph | RecordingGraph", latency: float):
+        self.graph = graph
+        self.latency = latency
+
+    def run(self, query: str, parameters: dict | None = None, **params) -> FakeResult:
+        if self.latency:
+            time.sleep(self.latency)   # one round trip to the server
+        return self.graph.run(query, {**(parameters or {}), **params})
+
+
+class FakeSession:
+    def __init__(self, graph: "FakeGraph | RecordingGraph", latency: float):
+        self._tx = FakeTransaction(graph, latency)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute_read(self, fn, *args, **kwargs):
+        return fn(self._tx, *args, **kwargs)
+
+    execute_write = execute_read
+
+    def run(self, query: str, parameters: dict | None = None, **params) -> FakeResult:
+        return self._tx.run(query, parameters, **params)
+
+    def close(self) -> None:
+        pass
+
+
+class FakeNeo4jDriver:
+    """Drop-in for neo4j.Driver in benchmarks; `latency_ms` is added per query."""
+
+    def __init__(self, graph: "FakeGraph | RecordingGraph", latency_ms: float = 0.0):
+        self.graph = graph
+        self.latency = latency_ms / 1000
+
+    def session(self, **config) -> FakeSession:
+        return FakeSession(self.graph, self.latency)
+
+    def verify_connectivity(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
@@ -1,19 +1,15 @@
 
-from neo4j import GraphDatabase
 from tqdm import tqdm
 
+from src.services.neo4j_driver import create_driver
+
 # --- Config ---
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASSWORD = "12345678"
 INGREDIENTS_TO_TEST = [
     "cognac", "espresso", "craisins", "jalapenos",
     "angel food cake", "dried apricots", "red chili",
     "cherry pie filling", "strawberry preserves", "green cabbage"
 ]
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 def check_node_exists(tx, name):
     result = tx.run("MATCH (i:Ingredient {name: $name}) RETURN count(i) AS count", name=name)
     return result.single()["count"] > 0
@@ -28,7 +24,7 @@ def get_substitutes(tx, ingredient):
     return list(tx.run(query, ingredient=ingredient))
 
 def main():
-    with driver.session() as session:
+    with create_driver() as driver, driver.session() as session:
         print("=== SUBSTITUTION DIAGNOSTIC REPORT ===\n")
         for name in tqdm(INGREDIENTS_TO_TEST, desc="Checking ingredients"):
             print(f">>> Testing: {name}")
@@ -0,0 +1,97 @@
+# Scaling curves of the offline pipeline stages.
+#
+# Reads the --benchmark-json output of tests/benchmarks (one benchmark group per
+# stage, parametrized by corpus size) and reports, per stage, the median time
+# and cost per recipe at each size plus the log-log slope of time vs. size:
+# ~1.0 is linear, noticeably above it means the stage will not survive the full
+# 2M-recipe RecipeNLG dump.
+
+import argparse
+import json
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from src.config.paths import DataPaths
+
+paths = DataPaths()
+
+SUPERLINEAR_SLOPE = 1.15   # allowance for noise before a stage is flagged
+
+
+def scaling_exponent(sizes: list[int], seconds: list[float]) -> float | None:
+    """Slope of log(seconds) against log(size); None with fewer than two sizes."""
+    if len(set(sizes)) < 2:
+        return None
+    slope, _ = np.polyfit(np.log(sizes), np.log(seconds), 1)
+    return float(slope)
+
+
+def stage_curves(benchmark_json: dict) -> dict[str, dict]:
+    """{stage: {"points": [{n_recipes, median_s, ...}], "exponent": float | None}}."""
+    points = defaultdict(list)
+    for bench in benchmark_json["benchmarks"]:
+        n_recipes = (bench.get("params") or {}).get("n_recipes")
+        if n_recipes is None:
+            continue
+        stats = bench["stats"]
+        points[bench["group"] or bench["name"]].append({
+            "n_recipes": n_recipes,
+            "median_s": stats["median"],
+            "mean_s": stats["mean"],
+            "stddev_s": stats["stddev"],
+            "us_per_recipe": stats["median"] / n_recipes * 1e6,
+            **bench.get("extra_info", {}),
+        })
+
+    curves = {}
+    for stage, rows in sorted(points.items()):
+        rows.sort(key=lambda r: r["n_recipes"])
+        curves[stage] = {
+            "points": rows,
+            "exponent": scaling_exponent([r["n_recipes"] for r in rows], [r["median_s"] for r in rows]),
+        }
+    return curves
+
+
+def format_report(curves: dict[str, dict]) -> list[str]:
+    lines = [f"{'stage':<28}{'recipes':>12}{'median s':>12}{'µs/recipe':>12}  notes"]
+    for stage, curve in curves.items():
+        for row in curve["points"]:
+            notes = ", ".join(f"{k}={v}" for k, v in row.items()
+                              if k not in {"n_recipes", "median_s", "mean_s", "stddev_s", "us_per_recipe"})
+            lines.append(f"{stage:<28}{row['n_recipes']:>12,}{row['median_s']:>12.3f}"
+                         f"{row['us_per_recipe']:>12.1f}  {notes}")
+        exponent = curve["exponent"]
+        if exponent is not None:
+            flag = "  ⚠️ super-linear" if exponent > SUPERLINEAR_SLOPE else ""
+            lines.append(f"{'':<28}scaling exponent {exponent:.2f}{flag}")
+        lines.append("")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage scaling curves from pytest-benchmark JSON")
+    parser.add_argument("benchmark_json", type=Path, help="Output of pytest tests/benchmarks --benchmark-json")
+    args = parser.parse_args()
+
+    curves = stage_curves(json.loads(args.benchmark_json.read_text()))
+    if not curves:
+        print(f"⚠️ No corpus-size benchmarks in {args.benchmark_json}")
+        return
+
+    lines = format_report(curves)
+    print("\n".join(lines))
+
+    stamp = f"{datetime.now():%Y%m%d_%H%M%S}"
+    paths.benchmarks.mkdir(parents=True, exist_ok=True)
+    (paths.benchmarks / f"pipelines_{stamp}.json").write_text(json.dumps(curves, indent=2))
+    report_path = paths.benchmarks / f"pipelines_{stamp}.txt"
+    report_path.write_text("\n".join(lines))
+    print(f"📄 Report saved to {report_path}")
+
+
+if __name__ == "__main__":
+    main()
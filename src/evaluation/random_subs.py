@@ -1,12 +1,9 @@
 import re
-from difflib import get_close_matches
 
-from neo4j import GraphDatabase
+from src.services.ingredient_resolver import IngredientResolver
+from src.services.neo4j_driver import create_driver
 
 # --- Config ---
-NEO4J_URI = "bolt://localhost:7687"
-NEO4J_USER = "neo4j"
-NEO4J_PASSWORD = "12345678"
 NUM_INGREDIENTS = 10
 SCORE_THRESHOLD = 0.85  # Optional filter
 OUTPUT_FILE = "/data/results/substitution/random_substitution_test_results.txt"
@@ -14,8 +11,6 @@ OUTPUT_FILE = "/data/results/substitution/random_substitution_test_results.txt"
 # Optional: fallback to fuzzy match on failed lookup
 ENABLE_FUZZY_MATCH = True
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 
 # ------------------ Utilities ------------------
 
@@ -54,8 +49,9 @@ def get_substitutes(tx, ingredient):
 # ------------------ Main ------------------
 
 def main():
-    with driver.session() as session, open(OUTPUT_FILE, "w") as f:
-        all_ingredients = session.execute_read(get_all_ingredients)
+    with create_driver() as driver, driver.session() as session, open(OUTPUT_FILE, "w") as f:
+        # Exact lookups and typo candidates from an index, not scans over the name list
+        resolver = IngredientResolver.from_names(session.execute_read(get_all_ingredients))
         ingredients = session.execute_read(get_random_ingredients, NUM_INGREDIENTS)
 
         f.write("=== Random Ingredient Substitution Test ===\n\n")
@@ -64,10 +60,10 @@ def main():
             norm_ing = normalize(ingredient)
 
             # Fallback with fuzzy matching if needed
-            if norm_ing not in all_ingredients and ENABLE_FUZZY_MATCH:
-                match = get_close_matches(norm_ing, all_ingredients, n=1)
+            if ENABLE_FUZZY_MATCH:
+                match, _ = resolver.resolve(norm_ing)
                 if match:
-                    norm_ing = match[0]
+                    norm_ing = match
 
             f.write(f">>> {ingredient} → {norm_ing}\n")
             results = session.execute_read(get_substitutes, norm_ing)
@@ -1,8 +1,10 @@
 import random
+import time
 from ast import literal_eval
+import numpy as np
 import pandas as pd
 from ranx import Qrels, Run, evaluate
-from utils.recipesuggestionmodel import metadata_df, suggest_recipes
+from src.utils.recipesuggestionmodel import LEXICAL_K, metadata_df, suggest_recipes
 
 # --- Parameters that match API
 TOP_N = 10
@@ -10,6 +12,9 @@ RERANK_WEIGHT = 0.6
 RAW_K = 50
 MIN_OVERLAP = 2
 
+# --- Retrievers compared on the same queries: FAISS only vs FAISS ∪ posting lists
+RETRIEVERS = {"faiss": 0, "hybrid": LEXICAL_K}
+
 # --- Generate test queries dynamically
 def generate_test_queries(df, n=10, min_ing=2, max_ing=3):
     queries = []
@@ -19,37 +24,52 @@ def generate_test_queries(df, n=10, min_ing=2, max_ing=3):
             ingredients = literal_eval(row["NER"])
             if len(ingredients) >= min_ing:
                 sample = random.sample(ingredients, k=min(max_ing, len(ingredients)))
-                queries.append((sample, row["title"]))
+                queries.append((sample, str(row["recipe_id"])))
         except Exception:
             continue
     return queries
 
 # --- Evaluate using the same suggestion logic as your API
-def build_qrels_and_run(queries):
-    qrels, run = {}, {}
-    for i, (ingredients, expected_title) in enumerate(queries):
+def build_qrels_and_run(queries, lexical_k=LEXICAL_K):
+    qrels, run, latencies, empty = {}, {}, [], 0
+    for i, (ingredients, expected_id) in enumerate(queries):
         qid = f"q{i}"
-        qrels[qid] = {expected_title: 1}
+        # Judged by recipe_id: RecipeNLG has many recipes sharing one title
+        qrels[qid] = {expected_id: 1}
 
+        start = time.perf_counter()
         results = suggest_recipes(
             ingredients=ingredients,
             top_n=TOP_N,
             rerank_weight=RERANK_WEIGHT,
             raw_k=RAW_K,
-            min_overlap=MIN_OVERLAP
+            min_overlap=MIN_OVERLAP,
+            lexical_k=lexical_k,
         )
-        run[qid] = {r["title"]: r["combined_score"] for r in results}
-    return Qrels(qrels), Run(run)
+        latencies.append((time.perf_counter() - start) * 1000)
+        empty += not results
+        # ranx rejects empty runs; keep a placeholder so the query still counts as a miss
+        run[qid] = {str(r["recipe_id"]): r["combined_score"] for r in results} or {"none": 0.0}
+    return Qrels(qrels), Run(run), latencies, empty
 
 # --- Evaluation runner per ingredient count
 def evaluate_with_fixed_query_size(n_queries=10, num_ingredients=2):
     print(f"\n🔍 Testing with {num_ingredients} ingredient(s)...")
     test_queries = generate_test_queries(metadata_df, n=n_queries, min_ing=num_ingredients, max_ing=num_ingredients)
-    qrels, run = build_qrels_and_run(test_queries)
 
-    metrics = ["precision@5", "recall@5", "ndcg@5", "mrr"]
-    results = evaluate(qrels=qrels, run=run, metrics=metrics)
-    df = pd.DataFrame([results])
+    metrics = ["precision@5", "recall@5", "recall@10", "ndcg@5", "mrr"]
+    rows = []
+    for name, lexical_k in RETRIEVERS.items():
+        qrels, run, latencies, empty = build_qrels_and_run(test_queries, lexical_k=lexical_k)
+        results = evaluate(qrels=qrels, run=run, metrics=metrics)
+        rows.append({
+            "retriever": name,
+            **results,
+            "empty": empty,
+            "mean_ms": float(np.mean(latencies)),
+            "p95_ms": float(np.percentile(latencies, 95)),
+        })
+    df = pd.DataFrame(rows)
     print(df.to_string(index=False))
 
 # --- Main entry point
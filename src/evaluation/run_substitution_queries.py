@@ -3,22 +3,11 @@
 import os
 from datetime import datetime
 
-from dotenv import load_dotenv
-from neo4j import GraphDatabase
-
-# Load environment variables
-load_dotenv()
-
-NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
-NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
-NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "12345678")
+from src.services.neo4j_driver import create_driver
 
 OUTPUT_FILE = f"data/results/substitution_graph_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt"
 os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
 
-# Neo4j driver
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
-
 # --- Queries ---
 queries = {
     "Total Ingredients in Graph": """
@@ -69,7 +58,7 @@ def run_query(tx, query):
 def main():
     analysis_points = []
 
-    with driver.session() as session, open(OUTPUT_FILE, "w") as f:
+    with create_driver() as driver, driver.session() as session, open(OUTPUT_FILE, "w") as f:
         f.write(f"Plate Planner Neo4j Graph Exploration Summary\nGenerated on {datetime.now()}\n\n")
 
         for title, query in queries.items():
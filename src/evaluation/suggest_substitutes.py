@@ -1,24 +1,32 @@
 import argparse
 import re
+from functools import lru_cache
 
 import numpy as np
-from gensim.models import Word2Vec
+from gensim.models import KeyedVectors
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
-from sklearn.metrics.pairwise import cosine_similarity
+
+from src.config.paths import DataPaths
 
 # ----------------- Paths -----------------
-INGREDIENT_W2V_MODEL_PATH = "/data/models/ingredient_substitution/ingredient_w2v.model"
-ACTION_W2V_MODEL_PATH = "/data/models/ingredient_substitution/action_w2v.model"
+paths = DataPaths()
+INGREDIENT_KV_PATH = str(paths.ingredient_kv)
+ACTION_KV_PATH = str(paths.action_kv)
 
 # ----------------- Parameters -----------------
 ING_WEIGHT = 0.8
 ACT_WEIGHT = 0.2
 TOP_K = 5
 
-# ----------------- Load Models -----------------
-print("📦 Loading Word2Vec models...")
-ingredient_model = Word2Vec.load(INGREDIENT_W2V_MODEL_PATH)
-action_model = Word2Vec.load(ACTION_W2V_MODEL_PATH)
+# ----------------- Load Vectors -----------------
+@lru_cache(maxsize=1)
+def load_vectors() -> tuple[KeyedVectors, KeyedVectors]:
+    """(ingredient, action) vectors, loaded on first use rather than at import.
+
+    Memory-mapped: every process shares one page-cached copy of the .npy arrays.
+    """
+    print("📦 Loading ingredient/action KeyedVectors (mmap)...")
+    return KeyedVectors.load(INGREDIENT_KV_PATH, mmap="r"), KeyedVectors.load(ACTION_KV_PATH, mmap="r")
 
 # ----------------- Noise Filtering -----------------
 def is_valid_ingredient(word):
@@ -32,36 +40,111 @@ def is_valid_ingredient(word):
 
 # ----------------- Context Vector Builder -----------------
 def build_vector(ingredients, actions, substitute=None):
+    ingredient_vectors, action_vectors = load_vectors()
     if substitute:
         ingredients = [ing if ing != substitute[0] else substitute[1] for ing in ingredients]
 
-    ing_vecs = [ingredient_model.wv[word] for word in ingredients if word in ingredient_model.wv]
-    act_vecs = [action_model.wv[word] for word in actions if word in action_model.wv]
+    ing_vecs = [ingredient_vectors[word] for word in ingredients if word in ingredient_vectors]
+    act_vecs = [action_vectors[word] for word in actions if word in action_vectors]
 
-    ing_vec = np.mean(ing_vecs, axis=0) if ing_vecs else np.zeros(ingredient_model.vector_size)
-    act_vec = np.mean(act_vecs, axis=0) if act_vecs else np.zeros(action_model.vector_size)
+    ing_vec = np.mean(ing_vecs, axis=0) if ing_vecs else np.zeros(ingredient_vectors.vector_size)
+    act_vec = np.mean(act_vecs, axis=0) if act_vecs else np.zeros(action_vectors.vector_size)
 
     return np.concatenate([ing_vec * ING_WEIGHT, act_vec * ACT_WEIGHT])
 
+# ----------------- Vectorized Scorer -----------------
+@lru_cache(maxsize=1)
+def _candidate_mask() -> np.ndarray:
+    """Boolean mask over the ingredient vocabulary of words allowed as substitutes."""
+    ingredient_vectors = load_vectors()[0]
+    return np.fromiter(
+        (is_valid_ingredient(w) for w in ingredient_vectors.index_to_key),
+        dtype=bool,
+        count=len(ingredient_vectors.index_to_key),
+    )
+
+
+@lru_cache(maxsize=1)
+def _squared_norms() -> np.ndarray:
+    ingredient_vectors = load_vectors()[0]
+    ingredient_vectors.fill_norms()
+    return np.square(ingredient_vectors.norms, dtype=np.float32)
+
+
+def score_substitutes(original_ingredient, ingredients, actions, topk=TOP_K):
+    """Rank every vocabulary word as a context-preserving replacement for `original_ingredient`.
+
+    Equivalent to comparing build_vector(ingredients, actions) with
+    build_vector(..., substitute=(original, candidate)) for each candidate,
+    but all candidates are scored at once: the substituted ingredient sum is
+    `base + c·V[j]` (base = sum − c·v(orig)), so both the dot product with the
+    original vector and the substituted norm follow from one product `V @ [sum, base]`.
+    """
+    if original_ingredient not in ingredients:
+        return []
+
+    ingredient_vectors, action_vectors = load_vectors()
+    dim_ing = ingredient_vectors.vector_size
+    in_vocab = [w for w in ingredients if w in ingredient_vectors]
+    occurrences = ingredients.count(original_ingredient)
+
+    ing_sum = (
+        np.sum([ingredient_vectors[w] for w in in_vocab], axis=0, dtype=np.float32)
+        if in_vocab else np.zeros(dim_ing, dtype=np.float32)
+    )
+    act_vecs = [action_vectors[w] for w in actions if w in action_vectors]
+    act_part = np.mean(act_vecs, axis=0) * ACT_WEIGHT if act_vecs else np.zeros(action_vectors.vector_size)
+    act_sq = float(act_part @ act_part)
+
+    if original_ingredient in ingredient_vectors:
+        base = ing_sum - occurrences * ingredient_vectors[original_ingredient]
+        n_new = len(in_vocab)
+    else:
+        # The original word contributed nothing; its replacements add new terms to the mean.
+        base = ing_sum
+        n_new = len(in_vocab) + occurrences
+
+    orig_scale = ING_WEIGHT / len(in_vocab) if in_vocab else 0.0
+    new_scale = ING_WEIGHT / n_new
+
+    # One pass over the (memory-mapped) vocabulary matrix: column 0 = V·sum, column 1 = V·base
+    products = ingredient_vectors.vectors @ np.stack([ing_sum, base], axis=1).astype(np.float32)
+
+    dots = orig_scale * new_scale * (float(ing_sum @ base) + occurrences * products[:, 0]) + act_sq
+    new_sq = new_scale ** 2 * (
+        float(base @ base) + 2 * occurrences * products[:, 1] + occurrences ** 2 * _squared_norms()
+    ) + act_sq
+    orig_norm = np.sqrt(orig_scale ** 2 * float(ing_sum @ ing_sum) + act_sq)
+
+    denom = orig_norm * np.sqrt(np.maximum(new_sq, 0.0))
+    scores = np.divide(dots, denom, out=np.zeros_like(dots), where=denom > 0)
+
+    scores = np.where(_candidate_mask(), scores, -np.inf)
+    orig_idx = ingredient_vectors.key_to_index.get(original_ingredient)
+    if orig_idx is not None:
+        scores[orig_idx] = -np.inf
+
+    n_valid = int(np.isfinite(scores).sum())
+    k = min(topk, n_valid)
+    if k == 0:
+        return []
+    # Everything scoring at least the k-th best, stably sorted: ties keep vocabulary
+    # order, as the sorted() over candidates did
+    kth = -np.partition(-scores, k - 1)[k - 1]
+    top = np.flatnonzero(scores >= kth)
+    top = top[np.argsort(-scores[top], kind="stable")][:k]
+
+    words = ingredient_vectors.index_to_key
+    return [(words[i], float(scores[i])) for i in top]
+
+
 # ----------------- Substitution Suggestion -----------------
 def suggest_substitute(original_ingredient, ingredients, actions, topk=TOP_K):
     if original_ingredient not in ingredients:
         print(f"⚠️ '{original_ingredient}' not found in recipe.")
         return []
 
-    original_vec = build_vector(ingredients, actions)
-    candidates = [
-        w for w in ingredient_model.wv.index_to_key
-        if w != original_ingredient and is_valid_ingredient(w)
-    ]
-
-    scores = []
-    for candidate in candidates:
-        new_vec = build_vector(ingredients, actions, substitute=(original_ingredient, candidate))
-        score = cosine_similarity([original_vec], [new_vec])[0][0]
-        scores.append((candidate, score))
-
-    top_subs = sorted(scores, key=lambda x: x[1], reverse=True)[:topk]
+    top_subs = score_substitutes(original_ingredient, ingredients, actions, topk)
 
     print(f"\n🔍 Top {topk} substitutes for '{original_ingredient}' in this context:\n")
     for i, (sub, score) in enumerate(top_subs):
@@ -0,0 +1,193 @@
+# Synthetic data tree for benchmarking the API without the RecipeNLG artifacts.
+#
+# Lays out generated recipes, their embeddings, the recipe FAISS index, NER
+# posting lists, the ingredient vocabulary, substitution edges and small
+# KeyedVectors exactly where DataPaths expects them under `root`, so a process
+# started with PLATE_PLANNER_DATA_ROOT=<root> serves it like the real data.
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pandas as pd
+from gensim.models import KeyedVectors
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import build_ingredient_postings, parse_ner
+from src.pipelines.build_recipe_index import build_recipe_index
+from src.pipelines.export_keyed_vectors import SEPARATE_ARRAYS
+
+paths = DataPaths()
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+MANIFEST_FILE = "fixture.json"
+
+# Ingredient vocabulary, roughly most to least common; popularity is Zipf over this order
+INGREDIENTS = [
+    "salt", "sugar", "butter", "flour", "egg", "milk", "onion", "garlic", "pepper", "water",
+    "oil", "vanilla", "cheese", "cream", "baking_powder", "lemon", "tomato", "chicken", "rice", "beef",
+    "carrot", "celery", "parsley", "cinnamon", "honey", "yogurt", "potato", "mushroom", "basil", "oregano",
+    "thyme", "ginger", "nutmeg", "paprika", "cumin", "vinegar", "mustard", "mayonnaise", "bacon", "ham",
+    "pork", "shrimp", "salmon", "tuna", "bread", "pasta", "noodle", "corn", "pea", "bean",
+    "spinach", "broccoli", "zucchini", "cucumber", "lettuce", "cabbage", "apple", "banana", "orange", "strawberry",
+    "blueberry", "raisin", "walnut", "pecan", "almond", "peanut", "coconut", "chocolate", "cocoa", "molasses",
+    "margarine", "shortening", "buttermilk", "cornstarch", "gelatin", "syrup", "ketchup", "soy_sauce", "broth", "wine",
+    "lime", "cilantro", "jalapeno", "avocado", "oat", "quinoa", "lentil", "tofu", "turkey", "sausage",
+]
+
+# Groups of mutually substitutable ingredients (SUBSTITUTES_WITH edges)
+SUBSTITUTE_GROUPS = [
+    ["butter", "margarine", "shortening", "oil", "coconut"],
+    ["milk", "buttermilk", "cream", "yogurt", "water"],
+    ["sugar", "honey", "molasses", "syrup"],
+    ["flour", "cornstarch", "oat", "bread"],
+    ["lemon", "lime", "vinegar", "orange"],
+    ["chicken", "turkey", "pork", "beef", "tofu"],
+    ["bacon", "ham", "sausage"],
+    ["walnut", "pecan", "almond", "peanut"],
+    ["parsley", "cilantro", "basil", "oregano", "thyme"],
+    ["rice", "quinoa", "pasta", "noodle", "potato"],
+    ["salmon", "tuna", "shrimp"],
+    ["spinach", "lettuce", "cabbage", "broccoli"],
+    ["cinnamon", "nutmeg", "ginger"],
+    ["chocolate", "cocoa", "raisin"],
+    ["bean", "lentil", "pea", "corn"],
+]
+CONTEXTS = ["baking", "cooking", "frying", "salad", "general"]
+ACTIONS = ["bake", "boil", "chop", "fry", "mix", "stir", "whisk", "simmer", "roast", "grill", "slice", "season"]
+
+TITLE_ADJECTIVES = ["Easy", "Creamy", "Spicy", "Grandma's", "Quick", "Classic", "Baked", "Crispy", "Hearty", "Fresh"]
+TITLE_DISHES = ["Casserole", "Soup", "Salad", "Cake", "Pie", "Stir Fry", "Bread", "Cookies", "Stew", "Pasta"]
+
+KV_DIM = 32
+
+
+def fixture_path(root: Path, path: Path) -> Path:
+    """Where a DataPaths location lives in a data tree rooted at `root`."""
+    return Path(root) / path.relative_to(paths.data_root)
+
+
+def popularity(n: int, exponent: float = 1.1) -> np.ndarray:
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+# ----------------- Generation -----------------
+def generate_recipes(n_recipes: int, rng: np.random.Generator) -> pd.DataFrame:
+    """RecipeNLG-shaped metadata: title, ingredients, directions, link, source, NER, recipe_id."""
+    weights = popularity(len(INGREDIENTS))
+    rows = []
+    for recipe_id in range(n_recipes):
+        size = int(rng.integers(4, 13))
+        ner = [INGREDIENTS[i] for i in rng.choice(len(INGREDIENTS), size=size, replace=False, p=weights)]
+        main = ner[0].replace("_", " ").title()
+        title = (f"{TITLE_ADJECTIVES[recipe_id % len(TITLE_ADJECTIVES)]} {main} "
+                 f"{TITLE_DISHES[(recipe_id // 7) % len(TITLE_DISHES)]} #{recipe_id}")
+        steps = [f"{ACTIONS[int(a)].capitalize()} the {ner[int(a) % size]}." for a in rng.integers(0, len(ACTIONS), 3)]
+        rows.append({
+            "recipe_id": recipe_id,
+            "title": title,
+            "ingredients": str([f"1 cup {i}" for i in ner]),
+            "directions": str(steps),
+            "link": f"www.example.com/recipes/{recipe_id}",
+            "source": "Synthetic",
+            "NER": str(ner),
+        })
+    return pd.DataFrame(rows)
+
+
+def generate_substitution_edges(rng: np.random.Generator) -> pd.DataFrame:
+    """Columns of substitution_edges_with_context_cleaned.csv: source, target, score, context."""
+    rows = []
+    for group in SUBSTITUTE_GROUPS:
+        for source in group:
+            for target in group:
+                if source == target:
+                    continue
+                for context in rng.choice(CONTEXTS, size=int(rng.integers(1, 3)), replace=False):
+                    rows.append({"source": source, "target": target,
+                                 "score": round(float(rng.uniform(0.9, 1.0)), 4), "context": str(context)})
+    return pd.DataFrame(rows)
+
+
+def random_keyed_vectors(words: list[str], rng: np.random.Generator) -> KeyedVectors:
+    kv = KeyedVectors(KV_DIM)
+    kv.add_vectors(words, rng.standard_normal((len(words), KV_DIM)).astype(np.float32))
+    kv.fill_norms()
+    return kv
+
+
+# ----------------- Build -----------------
+def build_fixture(root: Path, n_recipes: int = 5000, seed: int = 0, encoder=None, batch_size: int = 256) -> dict:
+    """Write a complete serving data tree under `root`; returns its manifest.
+
+    Recipe embeddings come from `encoder` (by default the serving
+    SentenceTransformer), so query and recipe vectors share one space.
+    """
+    root = Path(root)
+    rng = np.random.default_rng(seed)
+    start = time.time()
+
+    print(f"⚙️ Generating {n_recipes:,} synthetic recipes...")
+    metadata = generate_recipes(n_recipes, rng)
+    metadata_path = fixture_path(root, paths.recipe_metadata)
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata.to_csv(metadata_path, index=False)
+
+    if encoder is None:
+        from sentence_transformers import SentenceTransformer
+
+        encoder = SentenceTransformer(MODEL_NAME)
+    print("⚙️ Encoding recipes...")
+    texts = [" ".join(parse_ner(ner)) for ner in metadata["NER"]]
+    embeddings = np.asarray(encoder.encode(texts, batch_size=batch_size), dtype=np.float32)
+    np.save(fixture_path(root, paths.recipe_embeddings), embeddings)
+
+    index = build_recipe_index(embeddings, metadata["recipe_id"].to_numpy())
+    index_path = fixture_path(root, paths.recipe_faiss_index)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(index_path))
+
+    postings = build_ingredient_postings(metadata)
+    postings.save(fixture_path(root, paths.recipe_ner_postings))
+    vocabulary = pd.DataFrame({"name": INGREDIENTS,
+                               "recipes": [postings.document_frequency(i) for i in INGREDIENTS]})
+    vocabulary.to_csv(fixture_path(root, paths.ingredient_vocabulary), index=False)
+
+    edges = generate_substitution_edges(rng)
+    edges_path = fixture_path(root, paths.substitution_edges_with_context_cleaned)
+    edges_path.parent.mkdir(parents=True, exist_ok=True)
+    edges.to_csv(edges_path, index=False)
+
+    for words, kv_path in ((INGREDIENTS, paths.ingredient_kv), (ACTIONS, paths.action_kv)):
+        out = fixture_path(root, kv_path)
+        out.parent.mkdir(parents=True, exist_ok=True)
+        random_keyed_vectors(words, rng).save(str(out), separately=SEPARATE_ARRAYS)
+
+    manifest = {
+        "recipes": n_recipes,
+        "seed": seed,
+        "ingredients": len(INGREDIENTS),
+        "substitution_edges": len(edges),
+        "embedding_dim": int(embeddings.shape[1]),
+        "build_seconds": round(time.time() - start, 1),
+    }
+    (root / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    print(f"✅ Fixture written to {root} in {manifest['build_seconds']}s")
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic serving data tree for benchmarks")
+    parser.add_argument("root", type=Path)
+    parser.add_argument("--recipes", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    build_fixture(args.root, args.recipes, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,18 @@ from multiprocessing import cpu_count
 
 import numpy as np
 import pandas as pd
-from gensim.models import Word2Vec
+from gensim.models import KeyedVectors
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 from sklearn.metrics.pairwise import cosine_similarity
 from tqdm import tqdm
 
+from src.config.paths import DataPaths
+
 # ------------------ Config ------------------
+paths = DataPaths()
 CLEANED_ACTIONS_PATH = "/data/processed/ingredient_substitution/cleaned_ner_actions.csv"
-INGREDIENT_W2V_PATH = "/data/models/ingredient_substitution/ingredient_w2v.model"
-ACTION_W2V_PATH = "/data/models/ingredient_substitution/action_w2v.model"
+INGREDIENT_KV_PATH = str(paths.ingredient_kv)
+ACTION_KV_PATH = str(paths.action_kv)
 EXPORT_PATH = f"/mnt/data/substitution_edges_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
 
 TOP_K = 5
@@ -23,7 +26,15 @@ SIM_THRESHOLD = 0.85
 ING_WEIGHT = 0.9
 ACT_WEIGHT = 0.1
 
+# Per-worker ingredient vectors, mapped once by _init_worker instead of being
+# pickled into every submitted chunk.
+_ingredient_vectors: KeyedVectors | None = None
+
 # ------------------ Helpers ------------------
+def _init_worker(kv_path):
+    global _ingredient_vectors
+    _ingredient_vectors = KeyedVectors.load(kv_path, mmap="r")
+
 def is_valid_token(token):
     return (
         token.isalpha() and len(token) > 2 and
@@ -35,7 +46,7 @@ def build_vector(tokens, vecs, dim):
     vec_list = [vecs.get(w, np.zeros(dim)) for w in tokens]
     return np.mean(vec_list, axis=0) if vec_list else np.zeros(dim)
 
-def process_row(row, ingredient_vecs, action_vecs, ingredient_model, dim_ing, dim_act):
+def process_row(row, ingredient_vecs, action_vecs, ingredient_kv, dim_ing, dim_act):
     ingredients = [w for w in row["ner_list_cleaned"] if is_valid_token(w)]
     actions = [w for w in row["actions"] if is_valid_token(w)]
     if len(ingredients) < 2:
@@ -47,10 +58,10 @@ def process_row(row, ingredient_vecs, action_vecs, ingredient_model, dim_ing, di
 
     results = []
     for ing in ingredients:
-        if ing not in ingredient_model.wv:
+        if ing not in ingredient_kv:
             continue
         try:
-            similar = ingredient_model.wv.most_similar(ing, topn=TOP_K)
+            similar = ingredient_kv.most_similar(ing, topn=TOP_K)
         except KeyError:
             continue
         for candidate, _ in similar:
@@ -64,10 +75,10 @@ def process_row(row, ingredient_vecs, action_vecs, ingredient_model, dim_ing, di
                 results.append((ing, candidate, round(sim, 4)))
     return results
 
-def process_chunk(chunk, ingredient_vecs, action_vecs, ingredient_model, dim_ing, dim_act):
+def process_chunk(chunk, ingredient_vecs, action_vecs, dim_ing, dim_act):
     return [
         res for row in chunk.itertuples(index=False)
-        for res in process_row(row._asdict(), ingredient_vecs, action_vecs, ingredient_model, dim_ing, dim_act)
+        for res in process_row(row._asdict(), ingredient_vecs, action_vecs, _ingredient_vectors, dim_ing, dim_act)
     ]
 
 # ------------------ Main ------------------
@@ -86,17 +97,17 @@ def main():
 
     # Step 2: Load models and vectorize
     start = time.time()
-    print("🧠 Loading models + precomputing vectors...")
-    ingredient_model = Word2Vec.load(INGREDIENT_W2V_PATH)
-    action_model = Word2Vec.load(ACTION_W2V_PATH)
-    dim_ing = ingredient_model.vector_size
-    dim_act = action_model.vector_size
+    print("🧠 Loading KeyedVectors (mmap) + precomputing vectors...")
+    ingredient_kv = KeyedVectors.load(INGREDIENT_KV_PATH, mmap="r")
+    action_kv = KeyedVectors.load(ACTION_KV_PATH, mmap="r")
+    dim_ing = ingredient_kv.vector_size
+    dim_act = action_kv.vector_size
 
     unique_ingredients = {t for lst in df["ner_list_cleaned"] for t in lst if is_valid_token(t)}
     unique_actions = {t for lst in df["actions"] for t in lst if is_valid_token(t)}
 
-    ingredient_vecs = {t: ingredient_model.wv[t] for t in tqdm(unique_ingredients, desc="Ingredient Vecs") if t in ingredient_model.wv}
-    action_vecs = {t: action_model.wv[t] for t in tqdm(unique_actions, desc="Action Vecs") if t in action_model.wv}
+    ingredient_vecs = {t: ingredient_kv[t] for t in tqdm(unique_ingredients, desc="Ingredient Vecs") if t in ingredient_kv}
+    action_vecs = {t: action_kv[t] for t in tqdm(unique_actions, desc="Action Vecs") if t in action_kv}
     print(f"⏱️ Vector cache built in {round(time.time() - start, 2)} seconds")
 
     # Step 3: Parallel substitution computation
@@ -106,10 +117,11 @@ def main():
     chunks = np.array_split(df, NUM_CHUNKS)
     flattened = []
 
-    with ProcessPoolExecutor(max_workers=cpu_count()) as executor:
+    with ProcessPoolExecutor(max_workers=cpu_count(), initializer=_init_worker,
+                             initargs=(INGREDIENT_KV_PATH,)) as executor:
         futures = [
             executor.submit(process_chunk, chunk, ingredient_vecs, action_vecs,
-                            ingredient_model, dim_ing, dim_act)
+                            dim_ing, dim_act)
             for chunk in chunks
         ]
         for f in tqdm(as_completed(futures), total=len(futures), desc="🔄 Processing chunks"):
@@ -4,16 +4,19 @@ import os
 
 import numpy as np
 import pandas as pd
-from data.processed.substitution_config import SubstitutionConfig
 from gensim.models import Word2Vec
 from tqdm import tqdm
 
+from src.config.paths import DataPaths
+from src.config.substitution_config import SubstitutionConfig
+
 # ----------------- Paths -----------------
-CLEANED_ACTIONS_PATH = "/data/processed/ingredient_substitution/cleaned_ner_actions.csv"
-INGREDIENT_W2V_MODEL_PATH = "/data/models/ingredient_substitution/ingredient_w2v.model"
-ACTION_W2V_MODEL_PATH = "/data/models/ingredient_substitution/action_w2v.model"
-CONTEXT_VECTOR_PATH = "/data/processed/ingredient_substitution/context_vectors.npy"
-CONTEXT_META_PATH = "/data/processed/ingredient_substitution/context_metadata.csv"
+paths = DataPaths()
+CLEANED_ACTIONS_PATH = paths.cleaned_ner_actions
+INGREDIENT_W2V_MODEL_PATH = str(paths.ingredient_w2v)
+ACTION_W2V_MODEL_PATH = str(paths.action_w2v)
+CONTEXT_VECTOR_PATH = paths.context_vectors
+CONTEXT_META_PATH = paths.context_metadata
 
 # ----------------- Parameters -----------------
 ING_WEIGHT = SubstitutionConfig.INGREDIENT_WEIGHT
@@ -34,6 +37,33 @@ def create_directory(path):
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
 
+def build_context_vector(ingredients, actions, ingredient_wv, action_wv):
+    """Create weighted context vector with error handling"""
+    try:
+        ing_vecs = [ingredient_wv[w] for w in ingredients if w in ingredient_wv]
+        act_vecs = [action_wv[w] for w in actions if w in action_wv]
+
+        if not ing_vecs and not act_vecs:
+            return np.zeros(ingredient_wv.vector_size + action_wv.vector_size)
+
+        ing_vec = np.mean(ing_vecs, axis=0) * ING_WEIGHT if ing_vecs else np.zeros(ingredient_wv.vector_size)
+        act_vec = np.mean(act_vecs, axis=0) * ACT_WEIGHT if act_vecs else np.zeros(action_wv.vector_size)
+
+        return np.concatenate([ing_vec, act_vec])
+
+    except Exception as e:
+        print(f"Error building vector: {e}")
+        return np.zeros(ingredient_wv.vector_size + action_wv.vector_size)
+
+
+def build_context_matrix(ner_lists, action_lists, ingredient_wv, action_wv) -> np.ndarray:
+    """One context vector per recipe, stacked into an (n_recipes, dim_ing + dim_act) matrix."""
+    return np.vstack([
+        build_context_vector(ingredients, actions, ingredient_wv, action_wv)
+        for ingredients, actions in zip(tqdm(ner_lists, desc="Context vectors"), action_lists, strict=True)
+    ])
+
+
 # ----------------- Main Pipeline -----------------
 def main():
     # --- Step 1: Load and Prepare Data ---
@@ -71,30 +101,8 @@ def main():
     action_model.save(ACTION_W2V_MODEL_PATH)
 
     # --- Step 3: Build Context Vectors ---
-    def build_context_vector(ingredients, actions):
-        """Create weighted context vector with error handling"""
-        try:
-            ing_vecs = [ingredient_model.wv[w] for w in ingredients if w in ingredient_model.wv]
-            act_vecs = [action_model.wv[w] for w in actions if w in action_model.wv]
-
-            if not ing_vecs and not act_vecs:
-                return np.zeros(ingredient_model.vector_size + action_model.vector_size)
-
-            ing_vec = np.mean(ing_vecs, axis=0) * ING_WEIGHT if ing_vecs else np.zeros(ingredient_model.vector_size)
-            act_vec = np.mean(act_vecs, axis=0) * ACT_WEIGHT if act_vecs else np.zeros(action_model.vector_size)
-
-            return np.concatenate([ing_vec, act_vec])
-
-        except Exception as e:
-            print(f"Error building vector: {e}")
-            return np.zeros(ingredient_model.vector_size + action_model.vector_size)
-
     print("⚙️ Building context vectors...")
-    context_vectors = df.progress_apply(
-        lambda row: build_context_vector(row["ner_list_cleaned"], row["actions"]),
-        axis=1
-    )
-    context_matrix = np.vstack(context_vectors)
+    context_matrix = build_context_matrix(df["ner_list_cleaned"], df["actions"], ingredient_model.wv, action_model.wv)
 
     # --- Step 4: Save Output ---
     print("💾 Saving outputs...")
@@ -102,7 +110,9 @@ def main():
     np.save(CONTEXT_VECTOR_PATH, context_matrix)
 
     create_directory(CONTEXT_META_PATH)
-    df[["title"]].to_csv(CONTEXT_META_PATH, index=False)
+    # recipe_id (when the upstream CSVs carry it) ties each context vector back to the graph
+    meta_cols = ["recipe_id", "title"] if "recipe_id" in df.columns else ["title"]
+    df[meta_cols].to_csv(CONTEXT_META_PATH, index=False)
 
     print("✅ Done! Context vectors + metadata ready for FAISS/similarity search.")
 
@@ -0,0 +1,57 @@
+# Build the ingredient -> recipe_id posting lists used by suggest_recipes as its
+# lexical candidate generator (see utils/recipesuggestionmodel.py).
+
+import argparse
+import json
+import time
+from ast import literal_eval
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.posting_index import PostingIndex
+from src.utils.recipe_ids import RECIPE_ID, RECIPENLG_ID_COLUMN, ensure_recipe_ids
+
+paths = DataPaths()
+
+
+def parse_ner(raw) -> list[str]:
+    try:
+        items = literal_eval(raw) if isinstance(raw, str) else []
+    except (ValueError, SyntaxError):
+        return []
+    return [i for i in items if isinstance(i, str)]
+
+
+def build_ingredient_postings(metadata_df: pd.DataFrame) -> PostingIndex:
+    """Posting lists over the same NER tokens suggest_recipes counts as ingredient overlap."""
+    pairs = pd.DataFrame({
+        RECIPE_ID: metadata_df[RECIPE_ID].to_numpy(),
+        "ingredient": metadata_df["NER"].map(parse_ner),
+    }).explode("ingredient").dropna(subset=["ingredient"])
+    return PostingIndex.from_pairs(pairs["ingredient"].tolist(), pairs[RECIPE_ID].to_numpy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build NER ingredient posting lists for recipe suggestion")
+    parser.add_argument("--metadata", default=str(paths.recipe_metadata))
+    parser.add_argument("--output", default=str(paths.recipe_ner_postings))
+    args = parser.parse_args()
+
+    start = time.time()
+    print(f"📦 Loading {args.metadata}...")
+    metadata_df = ensure_recipe_ids(pd.read_csv(args.metadata, usecols=lambda c: c in {RECIPE_ID, RECIPENLG_ID_COLUMN, "NER"}))
+
+    print(f"⚙️ Building posting lists for {len(metadata_df):,} recipes...")
+    postings = build_ingredient_postings(metadata_df)
+    postings.save(args.output)
+
+    manifest = {"ingredients": len(postings), "recipes": len(metadata_df), "pairs": int(len(postings.postings))}
+    (Path(args.output) / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    print(f"✅ Posting lists written to {args.output} in {time.time() - start:.1f}s "
+          f"({len(postings):,} ingredients, {manifest['pairs']:,} pairs)")
+
+
+if __name__ == "__main__":
+    main()
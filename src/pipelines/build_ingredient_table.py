@@ -0,0 +1,58 @@
+# Pre-encode every recipe ingredient with the query encoder, for QUERY_ENCODING=table
+# (see utils/ingredient_table.py).
+
+import argparse
+import json
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import parse_ner
+from src.utils.ingredient_table import IngredientTable
+
+paths = DataPaths()
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+BATCH_SIZE = 512
+
+
+def ingredient_vocabulary(metadata_df: pd.DataFrame, min_count: int = 1) -> list[str]:
+    """NER ingredients seen in at least `min_count` recipes, most frequent first."""
+    counts = Counter(ing for items in metadata_df["NER"].map(parse_ner) for ing in set(items))
+    return [ing for ing, n in counts.most_common() if n >= min_count]
+
+
+def build_ingredient_table(terms: list[str], encoder, batch_size: int = BATCH_SIZE) -> IngredientTable:
+    vectors = np.asarray(encoder.encode(terms, batch_size=batch_size, show_progress_bar=True), dtype=np.float32)
+    vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+    return IngredientTable(terms=terms, vectors=vectors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-encode the ingredient vocabulary for table query encoding")
+    parser.add_argument("--metadata", default=str(paths.recipe_metadata))
+    parser.add_argument("--output", default=str(paths.ingredient_embedding_table))
+    parser.add_argument("--min-count", type=int, default=1, help="Skip ingredients seen in fewer recipes")
+    args = parser.parse_args()
+
+    start = time.time()
+    print(f"📦 Loading {args.metadata}...")
+    terms = ingredient_vocabulary(pd.read_csv(args.metadata, usecols=["NER"]), args.min_count)
+
+    print(f"🧠 Encoding {len(terms):,} ingredients...")
+    table = build_ingredient_table(terms, SentenceTransformer(MODEL_NAME))
+    output = Path(args.output)
+    table.save(output)
+    (output / "manifest.json").write_text(json.dumps({
+        "model": MODEL_NAME, "ingredients": len(table), "dim": int(table.vectors.shape[1]),
+    }, indent=2))
+    print(f"✅ Ingredient table written to {output} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# Snapshot the graph's Ingredient names, with how many recipes use each, into the
+# vocabulary the API's fuzzy resolver loads (see services/ingredient_resolver.py):
+# /ingredients/autocomplete, /ingredients/resolve and input canonicalization.
+
+import time
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.services.ingredient_resolver import IngredientResolver
+from src.services.neo4j_driver import create_driver
+
+paths = DataPaths()
+OUTPUT_PATH = paths.ingredient_vocabulary
+
+FETCH_SIZE = 10000
+
+
+def fetch_ingredients(tx):
+    # COUNT {} on a single-hop pattern is answered from the node's degree, not by expanding it
+    result = tx.run("""
+        MATCH (i:Ingredient)
+        WHERE i.name IS NOT NULL
+        RETURN i.name AS name, COUNT { (i)<-[:HAS_INGREDIENT]-() } AS recipes
+    """)
+    return [record.data() for record in result]
+
+
+def main():
+    start = time.time()
+    driver = create_driver()
+    try:
+        with driver.session(fetch_size=FETCH_SIZE) as session:
+            print("📦 Exporting Ingredient names...")
+            vocabulary = pd.DataFrame(session.execute_read(fetch_ingredients), columns=["name", "recipes"])
+    finally:
+        driver.close()
+
+    vocabulary = vocabulary.sort_values(["recipes", "name"], ascending=[False, True])
+    OUTPUT_PATH.parent.mkdir(parents=True, exist_ok=True)
+    vocabulary.to_csv(OUTPUT_PATH, index=False)
+
+    resolver_start = time.time()
+    resolver = IngredientResolver.from_names(vocabulary["name"].tolist(), vocabulary["recipes"].to_numpy())
+    print(f"✅ {len(resolver):,} ingredients written to {OUTPUT_PATH} in {time.time() - start:.1f}s "
+          f"(resolver builds in {time.time() - resolver_start:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
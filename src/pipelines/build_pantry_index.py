@@ -0,0 +1,109 @@
+# Snapshot HAS_INGREDIENT + SIMILAR_TO from Neo4j into the in-memory pantry search index
+# served by /recipes/by_pantry (see services/pantry_search.py).
+
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.services.neo4j_driver import create_driver
+from src.utils.posting_index import PostingIndex
+
+paths = DataPaths()
+OUTPUT_DIR = paths.pantry_index
+
+FETCH_SIZE = 10000
+
+
+# ----------------- Export Queries -----------------
+def fetch_recipe_ingredients(tx):
+    result = tx.run("""
+        MATCH (r:Recipe)-[:HAS_INGREDIENT]->(i:Ingredient)
+        WHERE r.recipe_id IS NOT NULL
+        RETURN r.recipe_id AS recipe_id, i.name AS ingredient
+    """)
+    recipe_ids, ingredients = [], []
+    for record in result:
+        recipe_ids.append(record["recipe_id"])
+        ingredients.append(record["ingredient"])
+    return recipe_ids, ingredients
+
+
+def fetch_recipes(tx):
+    result = tx.run("""
+        MATCH (r:Recipe)
+        WHERE r.recipe_id IS NOT NULL
+        RETURN r.recipe_id AS recipe_id, r.title AS title
+    """)
+    return [record.data() for record in result]
+
+
+def fetch_similar_edges(tx):
+    result = tx.run("""
+        MATCH (a:Ingredient)-[s:SIMILAR_TO]->(b:Ingredient)
+        WHERE s.score IS NOT NULL
+        RETURN a.name AS source, b.name AS target, s.score AS score
+    """)
+    return [record.data() for record in result]
+
+
+# ----------------- Build -----------------
+def build_expansions(postings: PostingIndex, edges: pd.DataFrame):
+    """CSR (by source term id) of SIMILAR_TO targets and scores, best first."""
+    edges = edges[edges["source"].isin(postings.term_ids) & edges["target"].isin(postings.term_ids)]
+    src = edges["source"].map(postings.term_ids).to_numpy(np.int64)
+    dst = edges["target"].map(postings.term_ids).to_numpy(np.int64)
+    score = edges["score"].to_numpy(np.float32)
+
+    order = np.lexsort((-score, src))
+    src, dst, score = src[order], dst[order], score[order]
+
+    indptr = np.zeros(len(postings) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=len(postings)), out=indptr[1:])
+    return indptr, dst, score
+
+
+def main():
+    start = time.time()
+    driver = create_driver()
+    try:
+        with driver.session(fetch_size=FETCH_SIZE) as session:
+            print("📦 Exporting HAS_INGREDIENT...")
+            recipe_ids, ingredients = session.execute_read(fetch_recipe_ingredients)
+            print("📦 Exporting recipes...")
+            recipes = pd.DataFrame(session.execute_read(fetch_recipes), columns=["recipe_id", "title"])
+            print("📦 Exporting SIMILAR_TO...")
+            edges = pd.DataFrame(session.execute_read(fetch_similar_edges), columns=["source", "target", "score"])
+    finally:
+        driver.close()
+
+    print(f"⚙️ Building posting lists from {len(recipe_ids):,} recipe-ingredient pairs...")
+    postings = PostingIndex.from_pairs(ingredients, recipe_ids)
+    sim_indptr, sim_dst, sim_score = build_expansions(postings, edges)
+
+    counts = pd.Series(recipe_ids, dtype="int64").value_counts()
+    recipes["recipe_id"] = recipes["recipe_id"].astype("int64")
+    recipes["n_ingredients"] = recipes["recipe_id"].map(counts).fillna(0).astype("int64")
+    recipes = recipes.sort_values("recipe_id")
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    postings.save(OUTPUT_DIR)
+    np.save(OUTPUT_DIR / "similar.indptr.npy", sim_indptr)
+    np.save(OUTPUT_DIR / "similar.dst.npy", sim_dst)
+    np.save(OUTPUT_DIR / "similar.score.npy", sim_score)
+    recipes.to_csv(OUTPUT_DIR / "recipes.csv", index=False)
+    (OUTPUT_DIR / "manifest.json").write_text(json.dumps({
+        "ingredients": len(postings),
+        "recipes": len(recipes),
+        "pairs": int(len(postings.postings)),
+        "similar_edges": int(len(sim_dst)),
+    }, indent=2))
+
+    print(f"✅ Pantry index written to {OUTPUT_DIR} in {time.time() - start:.1f}s "
+          f"({len(postings):,} ingredients, {len(recipes):,} recipes, {len(sim_dst):,} SIMILAR_TO edges)")
+
+
+if __name__ == "__main__":
+    main()
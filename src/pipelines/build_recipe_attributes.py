@@ -0,0 +1,44 @@
+# Tag every recipe with the diets/cuisines of utils/recipe_tag_config.yaml and
+# store one recipe_id bitmap per tag, used by suggest_recipes as a FAISS
+# IDSelectorBitmap for include_tags / exclude_tags (see utils/recipe_attributes.py).
+
+import argparse
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import parse_ner
+from src.utils.recipe_attributes import RecipeAttributes, TagRules
+from src.utils.recipe_ids import RECIPE_ID, RECIPENLG_ID_COLUMN, ensure_recipe_ids
+
+paths = DataPaths()
+
+
+def build_recipe_attributes(metadata_df: pd.DataFrame, rules: TagRules) -> RecipeAttributes:
+    return RecipeAttributes.from_recipes(metadata_df[RECIPE_ID].to_numpy(), metadata_df["NER"].map(parse_ner), rules)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build per-tag recipe bitmaps for filtered recipe suggestion")
+    parser.add_argument("--metadata", default=str(paths.recipe_metadata))
+    parser.add_argument("--config", default=str(paths.recipe_tag_config))
+    parser.add_argument("--output", default=str(paths.recipe_attributes))
+    args = parser.parse_args()
+
+    start = time.time()
+    print(f"📦 Loading {args.metadata}...")
+    metadata_df = ensure_recipe_ids(pd.read_csv(args.metadata, usecols=lambda c: c in {RECIPE_ID, RECIPENLG_ID_COLUMN, "NER"}))
+
+    print(f"🏷️ Tagging {len(metadata_df):,} recipes...")
+    attributes = build_recipe_attributes(metadata_df, TagRules.load(Path(args.config)))
+    attributes.save(args.output)
+
+    for tag, count in attributes.counts().items():
+        print(f"  {tag:<14}{count:>10,} ({count / max(len(metadata_df), 1):.1%})")
+    print(f"✅ Recipe attributes written to {args.output} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
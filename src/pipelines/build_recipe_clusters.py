@@ -0,0 +1,75 @@
+# Group near-duplicate recipes (RecipeNLG repeats many dishes across sources,
+# e.g. a dozen "Marinated Flank Steak" variants) with MinHash LSH over each
+# recipe's title words + NER ingredients (see utils/minhash.py).
+#
+# Writes recipe_clusters.csv: recipe_id -> cluster_id, where cluster_id is the
+# recipe_id of the cluster's representative (its first recipe in metadata
+# order; singletons are their own cluster). suggest_recipes collapses each
+# cluster to its best-scoring member, and build_recipe_index --drop-duplicates
+# indexes representatives only.
+
+import argparse
+import time
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import parse_ner
+from src.utils.minhash import duplicate_clusters, lsh_params, minhash_signatures, recipe_features
+from src.utils.recipe_ids import RECIPE_ID, RECIPENLG_ID_COLUMN, ensure_recipe_ids
+
+paths = DataPaths()
+
+CLUSTER_ID = "cluster_id"
+
+
+def build_recipe_clusters(
+    metadata_df: pd.DataFrame, threshold: float = 0.8, num_perm: int = 128, seed: int = 1
+) -> pd.DataFrame:
+    """recipe_id, cluster_id, cluster_size for every recipe of metadata_df."""
+    features = [recipe_features(title, parse_ner(ner))
+                for title, ner in zip(metadata_df["title"], metadata_df["NER"], strict=True)]
+    signatures = minhash_signatures(features, num_perm=num_perm, seed=seed)
+    labels = duplicate_clusters(signatures, threshold)
+
+    recipe_ids = metadata_df[RECIPE_ID].to_numpy()
+    clusters = pd.DataFrame({RECIPE_ID: recipe_ids, CLUSTER_ID: recipe_ids[labels]})
+    clusters["cluster_size"] = clusters.groupby(CLUSTER_ID)[RECIPE_ID].transform("size")
+    return clusters
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Assign near-duplicate cluster ids to recipes (MinHash LSH)")
+    parser.add_argument("--metadata", default=str(paths.recipe_metadata))
+    parser.add_argument("--output", default=str(paths.recipe_clusters))
+    parser.add_argument("--threshold", type=float, default=0.8, help="Estimated Jaccard to count as a duplicate")
+    parser.add_argument("--num-perm", type=int, default=128, help="MinHash permutations per recipe")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    start = time.time()
+    print(f"📦 Loading {args.metadata}...")
+    metadata_df = ensure_recipe_ids(pd.read_csv(
+        args.metadata, usecols=lambda c: c in {RECIPE_ID, RECIPENLG_ID_COLUMN, "title", "NER"}
+    ))
+
+    bands, rows = lsh_params(args.threshold, args.num_perm)
+    print(f"⚙️ MinHash LSH over {len(metadata_df):,} recipes ({args.num_perm} permutations, "
+          f"{bands} bands × {rows} rows, threshold {args.threshold})...")
+    clusters = build_recipe_clusters(metadata_df, args.threshold, args.num_perm, args.seed)
+    clusters.to_csv(args.output, index=False)
+
+    duplicates = int((clusters[RECIPE_ID] != clusters[CLUSTER_ID]).sum())
+    multi = clusters[clusters["cluster_size"] > 1]
+    print(f"🔁 {duplicates:,} duplicates ({duplicates / max(len(clusters), 1):.1%}) in "
+          f"{multi[CLUSTER_ID].nunique():,} clusters; {len(clusters) - duplicates:,} distinct recipes remain")
+
+    titles = metadata_df.set_index(RECIPE_ID)["title"]
+    largest = multi.drop_duplicates(CLUSTER_ID).nlargest(10, "cluster_size")
+    for cluster_id, size in zip(largest[CLUSTER_ID], largest["cluster_size"], strict=True):
+        print(f"  {size:>6,} × {titles[cluster_id]}")
+    print(f"✅ Recipe clusters written to {args.output} in {time.time() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
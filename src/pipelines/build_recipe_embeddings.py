@@ -0,0 +1,225 @@
+# Encode every recipe in recipe_metadata.csv into recipe_embeddings.npy and build
+# the recipe FAISS index from it (see utils/recipesuggestionmodel.py).
+#
+# Recipes are streamed from the metadata in chunks; each chunk is sorted by text
+# length (so batches hold similar lengths and little padding) and encoded by one
+# of N worker processes. Vectors go straight into a preallocated float32 .npy
+# memmap; after every chunk it is flushed and the finished chunks are recorded
+# in a progress file, so an interrupted build resumes where it stopped. The
+# finished file replaces recipe_embeddings.npy only once every row is written.
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+import numpy as np
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import parse_ner
+from src.pipelines.build_recipe_index import index_embeddings
+
+paths = DataPaths()
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+CHUNK_SIZE = 50_000   # recipes per task and per checkpoint
+BATCH_SIZE = 256
+
+_encoder = None   # per worker process
+
+
+def recipe_text(ner) -> str:
+    """What a recipe is embedded as: its NER ingredients, joined like suggest_recipes' queries."""
+    return " ".join(parse_ner(ner))
+
+
+def iter_chunks(metadata_path: Path, chunk_size: int = CHUNK_SIZE) -> Iterator[tuple[int, list[str]]]:
+    """(first row, recipe texts) per chunk of the metadata, without loading the whole file."""
+    start = 0
+    for frame in pd.read_csv(metadata_path, usecols=["NER"], chunksize=chunk_size):
+        yield start, frame["NER"].map(recipe_text).tolist()
+        start += len(frame)
+
+
+def scan_metadata(metadata_path: Path, chunk_size: int = CHUNK_SIZE) -> tuple[int, str]:
+    """(recipes, fingerprint of their NER column in row order): what the embeddings are computed from."""
+    n_recipes, digest = 0, hashlib.sha256()
+    for frame in pd.read_csv(metadata_path, usecols=["NER"], chunksize=chunk_size):
+        n_recipes += len(frame)
+        digest.update(pd.util.hash_pandas_object(frame["NER"], index=False).to_numpy().tobytes())
+    return n_recipes, digest.hexdigest()
+
+
+def encode_sorted(encoder, texts: list[str], batch_size: int = BATCH_SIZE) -> np.ndarray:
+    """Encode longest texts first, in length-homogeneous batches; rows come back in input order."""
+    order = np.argsort([-len(t) for t in texts], kind="stable")
+    vectors = np.asarray(encoder.encode([texts[i] for i in order], batch_size=batch_size), dtype=np.float32)
+    out = np.empty_like(vectors)
+    out[order] = vectors
+    return out
+
+
+# ----------------- Workers -----------------
+def _init_worker(encoder_factory: Callable, threads: int):
+    global _encoder
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    _encoder = encoder_factory()
+
+
+def _encode_chunk(start: int, texts: list[str], batch_size: int) -> tuple[int, np.ndarray]:
+    return start, encode_sorted(_encoder, texts, batch_size)
+
+
+# ----------------- Checkpoints -----------------
+def partial_path(output: Path) -> Path:
+    return output.with_name(output.name + ".partial")
+
+
+def progress_path(output: Path) -> Path:
+    return output.with_name(output.name + ".progress.json")
+
+
+def load_progress(output: Path, settings: dict) -> set[int]:
+    """Chunk starts already in the partial memmap, or an empty set when it cannot be resumed."""
+    progress_file = progress_path(output)
+    if not (progress_file.exists() and partial_path(output).exists()):
+        return set()
+    progress = json.loads(progress_file.read_text())
+    if progress["settings"] != settings:
+        print(f"⚠️ {progress_file} was written with {progress['settings']}; starting over")
+        return set()
+    return set(progress["done"])
+
+
+def save_progress(output: Path, settings: dict, done: set[int]) -> None:
+    tmp = progress_path(output).with_suffix(".tmp")
+    tmp.write_text(json.dumps({"settings": settings, "done": sorted(done)}))
+    os.replace(tmp, progress_path(output))
+
+
+# ----------------- Build -----------------
+def build_recipe_embeddings(
+    metadata_path: Path,
+    output: Path,
+    encoder_factory: Callable = partial(SentenceTransformer, MODEL_NAME, device="cpu"),
+    model_name: str = MODEL_NAME,
+    workers: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    batch_size: int = BATCH_SIZE,
+) -> dict:
+    """Write float32 (recipes, dim) embeddings of `metadata_path` to `output`; returns build stats.
+
+    `encoder_factory` is called once per worker (in-process when workers=1) and
+    must be picklable; `model_name` only identifies it in the progress file.
+    """
+    metadata_path, output = Path(metadata_path), Path(output)
+    start_time = time.time()
+    n_recipes, fingerprint = scan_metadata(metadata_path, chunk_size)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    if workers == 1:
+        _init_worker(encoder_factory, threads)
+        executor = None
+        dim = len(_encoder.encode(["salt"])[0])
+    else:
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(encoder_factory, threads),
+        )
+        dim = executor.submit(_encode_chunk, 0, ["salt"], 1).result()[1].shape[1]
+
+    # A changed metadata file with the same row count must not resume into stale rows
+    settings = {"model": model_name, "recipes": n_recipes, "metadata": fingerprint, "dim": int(dim),
+                "chunk_size": chunk_size}
+    done = load_progress(output, settings)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    vectors = np.lib.format.open_memmap(
+        partial_path(output), mode="r+" if done else "w+", dtype=np.float32, shape=(n_recipes, dim)
+    )
+    if done:
+        print(f"🔁 Resuming: {len(done)} of {-(-n_recipes // chunk_size)} chunks already encoded")
+    else:
+        save_progress(output, settings, done)
+
+    encoded = 0
+
+    def store(start: int, chunk: np.ndarray) -> None:
+        nonlocal encoded
+        vectors[start:start + len(chunk)] = chunk
+        vectors.flush()
+        done.add(start)
+        save_progress(output, settings, done)
+        encoded += len(chunk)
+        elapsed = time.time() - start_time
+        rows_done = min(n_recipes, len(done) * chunk_size)
+        print(f"⚙️ {rows_done:,}/{n_recipes:,} recipes ({encoded / elapsed:,.0f} recipes/sec)")
+
+    pending_chunks = ((start, texts) for start, texts in iter_chunks(metadata_path, chunk_size) if start not in done)
+    try:
+        if executor is None:
+            for start, texts in pending_chunks:
+                store(*_encode_chunk(start, texts, batch_size))
+        else:
+            # At most two chunks per worker in flight, so the metadata is never fully in memory
+            in_flight = set()
+            for start, texts in pending_chunks:
+                in_flight.add(executor.submit(_encode_chunk, start, texts, batch_size))
+                if len(in_flight) >= 2 * workers:
+                    finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        store(*future.result())
+            for future in wait(in_flight).done:
+                store(*future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    del vectors
+    os.replace(partial_path(output), output)
+    progress_path(output).unlink()
+
+    elapsed = time.time() - start_time
+    stats = {**settings, "encoded": encoded, "seconds": round(elapsed, 1),
+             "recipes_per_sec": round(encoded / elapsed, 1) if elapsed else None}
+    print(f"✅ Wrote {n_recipes:,} x {dim} embeddings to {output} "
+          f"({encoded:,} encoded in {elapsed:.1f}s, {stats['recipes_per_sec']:,} recipes/sec)")
+    return stats
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Encode recipe_metadata.csv and build the recipe FAISS index")
+    parser.add_argument("--metadata", type=Path, default=paths.recipe_metadata)
+    parser.add_argument("--output", type=Path, default=paths.recipe_embeddings)
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1),
+                        help="Encoder processes; the CPU threads are split between them")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="Recipes per checkpoint")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--skip-index", action="store_true", help="Only write the embeddings")
+    args = parser.parse_args()
+
+    build_recipe_embeddings(args.metadata, args.output, workers=args.workers,
+                            chunk_size=args.chunk_size, batch_size=args.batch_size)
+    if not args.skip_index:
+        index_embeddings(args.metadata, args.output, paths.recipe_faiss_index)
+
+
+if __name__ == "__main__":
+    main()
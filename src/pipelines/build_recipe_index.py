@@ -0,0 +1,146 @@
+import argparse
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.embedding_quantization import (
+    EMBEDDING_DTYPES,
+    SQ_TYPES,
+    QuantizedEmbeddings,
+    quantized_path,
+)
+from src.utils.recipe_ids import ensure_recipe_ids
+
+# ----------------- Paths -----------------
+paths = DataPaths()
+
+RECIPE_METADATA_PATH = paths.recipe_metadata
+EMBEDDINGS_PATH = paths.recipe_embeddings
+FAISS_INDEX_PATH = paths.recipe_faiss_index
+RECIPE_CLUSTERS_PATH = paths.recipe_clusters
+
+
+# ----------------- Index -----------------
+def build_recipe_index(
+    embeddings: np.ndarray,
+    recipe_ids: np.ndarray,
+    quantization: str = "float32",
+    nlist: int = 0,
+) -> faiss.Index:
+    """Cosine (inner product on L2-normalized vectors) index whose FAISS ids are recipe_ids.
+
+    quantization="fp16"/"int8" stores the vectors with a scalar quantizer (2x/4x
+    smaller than float32); nlist > 0 additionally partitions them into an IVF
+    index, searched with `nprobe` lists per query. Every variant is wrapped in
+    IndexIDMap, which is what index_has_recipe_ids() recognizes.
+    """
+    if quantization not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unknown quantization {quantization!r}; expected one of {EMBEDDING_DTYPES}")
+    vectors = np.array(embeddings, dtype="float32", copy=True)
+    faiss.normalize_L2(vectors)
+    dim = vectors.shape[1]
+    ids = np.asarray(recipe_ids, dtype="int64")
+
+    if nlist > 0:
+        quantizer = faiss.IndexFlatIP(dim)
+        if quantization == "float32":
+            base = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            base = faiss.IndexIVFScalarQuantizer(
+                quantizer, dim, nlist, SQ_TYPES[quantization], faiss.METRIC_INNER_PRODUCT
+            )
+        base.train(vectors)
+    elif quantization == "float32":
+        base = faiss.IndexFlatIP(dim)
+    else:
+        base = faiss.IndexScalarQuantizer(dim, SQ_TYPES[quantization], faiss.METRIC_INNER_PRODUCT)
+        base.train(vectors)
+
+    index = faiss.IndexIDMap(base)
+    index.add_with_ids(vectors, ids)
+    return index
+
+
+def index_has_recipe_ids(index: faiss.Index) -> bool:
+    """Whether `index` labels its results with recipe_ids (built by build_recipe_index).
+
+    Recipe indexes from before recipe_ids were plain indexes labelled with
+    metadata row positions.
+    """
+    return isinstance(index, (faiss.IndexIDMap, faiss.IndexIDMap2))
+
+
+def label_rows(index: faiss.Index, labels: np.ndarray, recipe_ids: pd.Index) -> np.ndarray:
+    """Metadata row positions of FAISS result `labels`; -1 for padding and unknown recipe_ids."""
+    if index_has_recipe_ids(index):
+        return recipe_ids.get_indexer(labels)
+    return labels
+
+
+def index_embeddings(
+    metadata_path: Path = RECIPE_METADATA_PATH,
+    embeddings_path: Path = EMBEDDINGS_PATH,
+    index_path: Path = FAISS_INDEX_PATH,
+    quantization: str = "float32",
+    nlist: int = 0,
+    drop_duplicates: bool = False,
+) -> faiss.Index:
+    """Build and write the index for the embeddings.npy rows of recipe_metadata.csv.
+
+    With drop_duplicates, only cluster representatives of recipe_clusters.csv
+    (pipelines/build_recipe_clusters.py) are indexed; metadata and embeddings
+    keep every recipe, so duplicates stay reachable by id and lexical search.
+    """
+    print("📦 Loading recipe metadata and embeddings...")
+    metadata = ensure_recipe_ids(pd.read_csv(metadata_path))
+    embeddings = np.load(embeddings_path, mmap_mode="r")
+
+    assert len(metadata) == embeddings.shape[0], \
+        f"Metadata rows ({len(metadata)}) ≠ embeddings ({embeddings.shape[0]})"
+    assert metadata["recipe_id"].is_unique, "recipe_id must be unique in recipe_metadata.csv"
+
+    recipe_ids = metadata["recipe_id"].to_numpy()
+    vectors = embeddings
+    if drop_duplicates:
+        clusters = pd.read_csv(RECIPE_CLUSTERS_PATH, usecols=["recipe_id", "cluster_id"])
+        duplicates = clusters.loc[clusters["recipe_id"] != clusters["cluster_id"], "recipe_id"]
+        keep = ~np.isin(recipe_ids, duplicates.to_numpy())
+        print(f"🔁 Dropping {int((~keep).sum()):,} near-duplicate recipes from the index")
+        recipe_ids, vectors = recipe_ids[keep], embeddings[np.flatnonzero(keep)]
+
+    print(f"⚙️ Building recipe_id-keyed FAISS index ({quantization}, nlist={nlist})...")
+    index = build_recipe_index(vectors, recipe_ids, quantization, nlist)
+
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(index_path))
+
+    if quantization != "float32":
+        # Served by suggest_recipes when RECIPE_EMBEDDING_DTYPE matches
+        out = quantized_path(embeddings_path, quantization)
+        QuantizedEmbeddings.from_vectors(embeddings, quantization).save(out)
+        print(f"✅ Wrote {quantization} embeddings to {out}")
+
+    # Persist the ids next to the titles so the serving side never has to guess them
+    metadata.to_csv(metadata_path, index=False)
+    print(f"✅ Wrote {index.ntotal} vectors to {index_path}")
+    return index
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Build the recipe_id-keyed recipe FAISS index")
+    parser.add_argument("--quantization", choices=EMBEDDING_DTYPES, default="float32",
+                        help="Vector storage in the index; fp16/int8 also write quantized embeddings")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF lists (0 = exhaustive search)")
+    parser.add_argument("--drop-duplicates", action="store_true",
+                        help="Index only one recipe per near-duplicate cluster (needs recipe_clusters.csv)")
+    args = parser.parse_args()
+
+    index_embeddings(quantization=args.quantization, nlist=args.nlist, drop_duplicates=args.drop_duplicates)
+
+
+if __name__ == "__main__":
+    main()
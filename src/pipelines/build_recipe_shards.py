@@ -0,0 +1,123 @@
+# Split the recipe suggestion data into K recipe_id ranges, each a self-contained
+# data tree (metadata slice, embeddings, FAISS index, NER postings, tag bitmaps,
+# and the recipes' near-duplicate cluster ids when recipe_clusters.csv exists)
+# served by its own services/recipe_shard.py process.
+#
+# Ranges are cut at equal recipe counts; the last shard's range is open-ended,
+# so recipes added later with new (higher) ids belong to it.
+
+import argparse
+import json
+import time
+from datetime import datetime
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.pipelines.build_ingredient_postings import build_ingredient_postings
+from src.pipelines.build_recipe_attributes import build_recipe_attributes
+from src.pipelines.build_recipe_index import build_recipe_index
+from src.utils.embedding_quantization import EMBEDDING_DTYPES
+from src.utils.recipe_attributes import TagRules
+from src.utils.recipe_ids import RECIPE_ID, ensure_recipe_ids
+
+paths = DataPaths()
+
+MANIFEST_FILE = "shards.json"
+
+# Read-only serving assets every shard shares with the full tree (linked, not copied)
+SHARED_ASSETS = (paths.query_encoder_onnx, paths.ingredient_embedding_table)
+
+
+def shard_path(shard_dir: Path, path: Path) -> Path:
+    """Where a DataPaths location lives inside one shard's data tree."""
+    return Path(shard_dir) / path.relative_to(paths.data_root)
+
+
+def shard_rows(recipe_ids: np.ndarray, n_shards: int) -> list[np.ndarray]:
+    """Metadata row positions of each shard: contiguous recipe_id ranges of (near) equal size."""
+    by_id = np.argsort(recipe_ids, kind="stable")
+    return [np.sort(rows) for rows in np.array_split(by_id, n_shards)]
+
+
+def write_shard(shard_dir: Path, metadata: pd.DataFrame, embeddings: np.ndarray, rules: TagRules,
+                quantization: str = "float32", nlist: int = 0, clusters: pd.DataFrame | None = None) -> None:
+    metadata_path = shard_path(shard_dir, paths.recipe_metadata)
+    metadata_path.parent.mkdir(parents=True, exist_ok=True)
+    metadata.to_csv(metadata_path, index=False)
+    np.save(shard_path(shard_dir, paths.recipe_embeddings), embeddings)
+
+    index_path = shard_path(shard_dir, paths.recipe_faiss_index)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(build_recipe_index(embeddings, metadata[RECIPE_ID].to_numpy(), quantization, nlist),
+                      str(index_path))
+    build_ingredient_postings(metadata).save(shard_path(shard_dir, paths.recipe_ner_postings))
+    build_recipe_attributes(metadata, rules).save(shard_path(shard_dir, paths.recipe_attributes))
+    if clusters is not None:
+        # global cluster ids, so the coordinator also collapses duplicates living on different shards
+        clusters[clusters[RECIPE_ID].isin(metadata[RECIPE_ID])].to_csv(
+            shard_path(shard_dir, paths.recipe_clusters), index=False
+        )
+
+    for asset in SHARED_ASSETS:
+        link = shard_path(shard_dir, asset)
+        if asset.exists() and not link.exists():
+            link.parent.mkdir(parents=True, exist_ok=True)
+            link.symlink_to(asset.resolve(), target_is_directory=asset.is_dir())
+
+
+def build_recipe_shards(metadata: pd.DataFrame, embeddings: np.ndarray, output: Path, n_shards: int,
+                        quantization: str = "float32", nlist: int = 0) -> dict:
+    """Write `n_shards` shard trees under `output` plus their manifest; returns the manifest."""
+    metadata = ensure_recipe_ids(metadata)
+    assert len(metadata) == embeddings.shape[0], \
+        f"Metadata rows ({len(metadata)}) ≠ embeddings ({embeddings.shape[0]})"
+    assert metadata[RECIPE_ID].is_unique, "recipe_id must be unique in recipe_metadata.csv"
+    output = Path(output)
+    rules = TagRules.load()
+    clusters = pd.read_csv(paths.recipe_clusters) if paths.recipe_clusters.exists() else None
+
+    shards = []
+    for i, rows in enumerate(shard_rows(metadata[RECIPE_ID].to_numpy(), n_shards)):
+        shard_dir = output / f"shard_{i}"
+        part = metadata.iloc[rows].reset_index(drop=True)
+        print(f"⚙️ Shard {i}: {len(part):,} recipes, ids {part[RECIPE_ID].min()}–{part[RECIPE_ID].max()}")
+        write_shard(shard_dir, part, np.asarray(embeddings[rows], dtype=np.float32), rules, quantization, nlist,
+                    clusters)
+        shards.append({
+            "path": shard_dir.name,
+            "recipes": len(part),
+            "min_recipe_id": int(part[RECIPE_ID].min()),
+            # the last range is open-ended: new recipes are appended to it
+            "max_recipe_id": int(part[RECIPE_ID].max()) if i < n_shards - 1 else None,
+        })
+
+    manifest = {"created": datetime.now().isoformat(timespec="seconds"), "recipes": len(metadata),
+                "quantization": quantization, "nlist": nlist, "shards": shards}
+    (output / MANIFEST_FILE).write_text(json.dumps(manifest, indent=2))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Partition the recipe index into recipe_id-range shards")
+    parser.add_argument("--shards", type=int, required=True, help="Number of shards (K)")
+    parser.add_argument("--output", type=Path, default=paths.recipe_shards)
+    parser.add_argument("--quantization", choices=EMBEDDING_DTYPES, default="float32")
+    parser.add_argument("--nlist", type=int, default=0, help="IVF lists per shard (0 = exhaustive search)")
+    args = parser.parse_args()
+
+    start = time.time()
+    print("📦 Loading recipe metadata and embeddings...")
+    metadata = pd.read_csv(paths.recipe_metadata)
+    embeddings = np.load(paths.recipe_embeddings, mmap_mode="r")
+
+    manifest = build_recipe_shards(metadata, embeddings, args.output, args.shards, args.quantization, args.nlist)
+    print(f"✅ {len(manifest['shards'])} shards written to {args.output} in {time.time() - start:.1f}s; "
+          f"serve them with `python -m src.services.recipe_shard --all`")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# Snapshot SUBSTITUTES_WITH, SIMILAR_TO and HAS_INGREDIENT from Neo4j into the
+# memory-mapped CSR graph that serves /substitute without Neo4j
+# (see services/substitution_graph.py and SUBSTITUTION_READ_PATH).
+
+import json
+import time
+
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.pipelines.build_pantry_index import fetch_recipe_ingredients, fetch_similar_edges
+from src.services.neo4j_driver import create_driver
+from src.services.substitution_graph import SubstitutionGraph
+
+paths = DataPaths()
+OUTPUT_DIR = paths.substitution_graph
+
+FETCH_SIZE = 10000
+
+
+def fetch_substitution_edges(tx):
+    result = tx.run("""
+        MATCH (a:Ingredient)-[r:SUBSTITUTES_WITH]->(b:Ingredient)
+        RETURN a.name AS source, b.name AS target, r.score AS score, r.context AS context
+    """)
+    return [record.data() for record in result]
+
+
+def export_substitution_graph(driver) -> SubstitutionGraph:
+    with driver.session(fetch_size=FETCH_SIZE) as session:
+        print("📦 Exporting SUBSTITUTES_WITH...")
+        substitutes = pd.DataFrame(session.execute_read(fetch_substitution_edges),
+                                   columns=["source", "target", "score", "context"])
+        print("📦 Exporting SIMILAR_TO...")
+        similar = pd.DataFrame(session.execute_read(fetch_similar_edges), columns=["source", "target", "score"])
+        print("📦 Exporting HAS_INGREDIENT...")
+        recipe_ids, ingredients = session.execute_read(fetch_recipe_ingredients)
+    recipe_ingredients = pd.DataFrame({"recipe_id": recipe_ids, "ingredient": ingredients})
+    return SubstitutionGraph.from_frames(substitutes, similar, recipe_ingredients)
+
+
+def main():
+    start = time.time()
+    driver = create_driver()
+    try:
+        graph = export_substitution_graph(driver)
+    finally:
+        driver.close()
+
+    graph.save(OUTPUT_DIR)
+    manifest = {
+        "ingredients": len(graph.names),
+        "contexts": len(graph.contexts),
+        "substitutes_with_edges": int(len(graph.sub_dst)),
+        "similar_to_edges": int(len(graph.sim_dst)),
+        "recipes": int(len(graph.rec_indptr) - 1),
+        "has_ingredient_edges": int(len(graph.rec_ingredients)),
+    }
+    (OUTPUT_DIR / "manifest.json").write_text(json.dumps(manifest, indent=2))
+    size_mb = sum(f.stat().st_size for f in OUTPUT_DIR.iterdir()) / 1e6
+    print(f"✅ Substitution graph written to {OUTPUT_DIR} in {time.time() - start:.1f}s ({size_mb:.1f} MB): "
+          + ", ".join(f"{v:,} {k}" for k, v in manifest.items()))
+
+
+if __name__ == "__main__":
+    main()
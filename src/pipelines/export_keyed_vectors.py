@@ -0,0 +1,49 @@
+import argparse
+from pathlib import Path
+
+from gensim.models import KeyedVectors, Word2Vec
+
+from src.config.paths import DataPaths
+
+paths = DataPaths()
+
+# Arrays stored as standalone .npy files next to the .kv file, so that
+# KeyedVectors.load(..., mmap="r") can map them instead of unpickling them.
+SEPARATE_ARRAYS = ["vectors", "norms"]
+
+# ----------------- Export -----------------
+def export_keyed_vectors(model_path: Path | str, kv_path: Path | str) -> KeyedVectors:
+    """Strip a trained Word2Vec model down to its KeyedVectors and save them mmap-ready.
+
+    The full model also carries syn1neg and the training state, neither of
+    which is needed for lookups or most_similar().
+    """
+    model = Word2Vec.load(str(model_path))
+    kv = model.wv
+    kv.fill_norms()
+
+    Path(kv_path).parent.mkdir(parents=True, exist_ok=True)
+    kv.save(str(kv_path), separately=SEPARATE_ARRAYS)
+    return kv
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Export Word2Vec models as mmap-loadable KeyedVectors")
+    parser.add_argument("--ingredient-model", default=str(paths.ingredient_w2v))
+    parser.add_argument("--action-model", default=str(paths.action_w2v))
+    parser.add_argument("--ingredient-kv", default=str(paths.ingredient_kv))
+    parser.add_argument("--action-kv", default=str(paths.action_kv))
+    args = parser.parse_args()
+
+    for name, model_path, kv_path in (
+        ("ingredient", args.ingredient_model, args.ingredient_kv),
+        ("action", args.action_model, args.action_kv),
+    ):
+        print(f"📦 Exporting {name} vectors: {model_path} → {kv_path}")
+        kv = export_keyed_vectors(model_path, kv_path)
+        print(f"✅ {len(kv.index_to_key)} words × {kv.vector_size} dims")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+import argparse
+from pathlib import Path
+
+import torch
+from onnxruntime.quantization import QuantType, quantize_dynamic
+from sentence_transformers import SentenceTransformer
+
+from src.config.paths import DataPaths
+from src.utils.onnx_encoder import FP32_MODEL_FILE, INT8_MODEL_FILE
+
+paths = DataPaths()
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+OPSET = 17
+
+
+# ----------------- Export -----------------
+class _TokenEmbeddings(torch.nn.Module):
+    """Positional-input wrapper returning last_hidden_state, independent of the HF forward() signature."""
+
+    def __init__(self, transformer, input_names):
+        super().__init__()
+        self.transformer = transformer
+        self.input_names = input_names
+
+    def forward(self, *inputs):
+        return self.transformer(**dict(zip(self.input_names, inputs, strict=True))).last_hidden_state
+
+
+def export_onnx_encoder(output_dir: Path, model_name: str = MODEL_NAME, quantize: bool = True) -> Path:
+    """Export the SentenceTransformer's transformer to ONNX, plus an int8 dynamically quantized copy.
+
+    Only the transformer is exported; pooling and normalization are cheap and
+    done in numpy by OnnxQueryEncoder. The tokenizer is saved alongside.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    st_model = SentenceTransformer(model_name, device="cpu")
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    dummy = tokenizer(["butter sugar flour"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = output_dir / FP32_MODEL_FILE
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(transformer, input_names),
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=OPSET,
+            dynamo=False,
+        )
+    tokenizer.save_pretrained(str(output_dir))
+
+    if not quantize:
+        return fp32_path
+    int8_path = output_dir / INT8_MODEL_FILE
+    quantize_dynamic(str(fp32_path), str(int8_path), weight_type=QuantType.QInt8)
+    return int8_path
+
+
+# ----------------- Main -----------------
+def main():
+    parser = argparse.ArgumentParser(description="Export the recipe query encoder to (int8) ONNX")
+    parser.add_argument("--output", default=str(paths.query_encoder_onnx))
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--no-quantize", action="store_true", help="Only write the float32 ONNX model")
+    args = parser.parse_args()
+
+    print(f"📦 Exporting {args.model} to ONNX...")
+    model_path = export_onnx_encoder(Path(args.output), args.model, quantize=not args.no_quantize)
+    print(f"✅ Wrote {model_path} ({model_path.stat().st_size / 2**20:.1f} MiB)")
+
+
+if __name__ == "__main__":
+    main()
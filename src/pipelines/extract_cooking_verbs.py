@@ -1,6 +1,7 @@
 import ast
 import os
 import ssl
+from functools import lru_cache
 
 import nltk
 import pandas as pd
@@ -8,12 +9,12 @@ import spacy
 from nltk.corpus import verbnet as vn
 from tqdm import tqdm
 
-# ----------------- Paths -----------------
-CLEANED_DATA_PATH = "/data/processed/ingredient_substitution/cleaned_ner.csv"
-ACTIONS_DATA_PATH = "/data/processed/ingredient_substitution/cleaned_ner_actions.csv"
+from src.config.paths import DataPaths
 
-# ----------------- Setup -----------------
-tqdm.pandas()
+# ----------------- Paths -----------------
+paths = DataPaths()
+CLEANED_DATA_PATH = paths.cleaned_ner
+ACTIONS_DATA_PATH = paths.cleaned_ner_actions
 
 # Bypass SSL verification for NLTK downloads
 try:
@@ -24,7 +25,9 @@ else:
     ssl._create_default_https_context = _create_unverified_https_context
 
 # ----------------- NLP Initialization -----------------
-nlp = spacy.load("en_core_web_sm", disable=["parser", "ner", "textcat"])
+@lru_cache(maxsize=1)
+def load_nlp():
+    return spacy.load("en_core_web_sm", disable=["parser", "ner", "textcat"])
 
 
 # ----------------- VerbNet Configuration -----------------
@@ -53,6 +56,7 @@ def get_valid_culinary_classes():
     return list(valid_classes)
 
 
+@lru_cache(maxsize=1)
 def initialize_culinary_verbs():
     """Initialize comprehensive culinary verb set with validation"""
     culinary_classes = get_valid_culinary_classes()
@@ -73,10 +77,7 @@ def initialize_culinary_verbs():
     }
 
     culinary_verbs.update(additional_verbs)
-    return culinary_verbs
-
-
-CULINARY_VERBS = initialize_culinary_verbs()
+    return frozenset(culinary_verbs)
 
 
 # ----------------- Processing Functions -----------------
@@ -88,8 +89,10 @@ def safe_literal_eval(x):
         return []
 
 
-def extract_culinary_actions(directions_series):
+def extract_culinary_actions(directions_series, n_process=4):
     """Batch process directions to extract culinary verbs"""
+    nlp = load_nlp()
+    culinary_verbs = initialize_culinary_verbs()
     texts = []
 
     print("\nPreprocessing directions...")
@@ -109,14 +112,14 @@ def extract_culinary_actions(directions_series):
     print("\nExtracting culinary actions...")
     actions_list = []
 
-    for doc in tqdm(nlp.pipe(texts, batch_size=128, n_process=4),
+    for doc in tqdm(nlp.pipe(texts, batch_size=128, n_process=n_process),
                     total=len(texts),
                     desc="Processing"):
         verbs = set()
         for token in doc:
             if token.pos_ == "VERB":
                 lemma = token.lemma_.lower()
-                if lemma in CULINARY_VERBS:
+                if lemma in culinary_verbs:
                     verbs.add(lemma)
         actions_list.append(list(verbs))
 
@@ -125,8 +128,10 @@ def extract_culinary_actions(directions_series):
 
 # ----------------- Main Execution -----------------
 if __name__ == "__main__":
-    print(f"\nLoaded {len(CULINARY_VERBS)} culinary verbs")
-    print("Sample verbs:", sorted(CULINARY_VERBS)[:15], "...\n")
+    tqdm.pandas()
+    culinary_verbs = initialize_culinary_verbs()
+    print(f"\nLoaded {len(culinary_verbs)} culinary verbs")
+    print("Sample verbs:", sorted(culinary_verbs)[:15], "...\n")
 
     df = pd.read_csv(CLEANED_DATA_PATH)
 
@@ -137,7 +142,8 @@ if __name__ == "__main__":
     df["actions"] = extract_culinary_actions(df["directions"])
 
     os.makedirs(os.path.dirname(ACTIONS_DATA_PATH), exist_ok=True)
-    df[["title", "ner_list_cleaned", "directions", "actions"]].to_csv(ACTIONS_DATA_PATH, index=False)
+    id_cols = ["recipe_id"] if "recipe_id" in df.columns else []
+    df[[*id_cols, "title", "ner_list_cleaned", "directions", "actions"]].to_csv(ACTIONS_DATA_PATH, index=False)
 
     print(f"\n✅ Success! Saved culinary actions to {ACTIONS_DATA_PATH}")
     print("Sample output:", df["actions"].head(3).tolist())
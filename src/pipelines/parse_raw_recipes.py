@@ -1,26 +1,21 @@
+import argparse
 import ast
 import os
 import re
 
 import pandas as pd
 import wordninja
-import yaml
 
-# --- Paths ---
-RAW_DATA_PATH = "app/src/data/raw/recipe_dataset_200k.csv"
-CLEANED_DATA_PATH = "/app/src/data/processed/ingredient_substitution/cleaned_ner.csv"
-NORMALIZER_YAML_PATH = "src/ml_training/normalizer_config.yaml"  # <-- Adjust if needed
-
-# --- Load YAML config ---
-with open(NORMALIZER_YAML_PATH) as f:
-    config = yaml.safe_load(f)
+from src.config.paths import DataPaths
+from src.utils.ingredient_normalizer import BLACKLIST, DESCRIPTORS, STOPWORDS, UNITS
+from src.utils.recipe_ids import ensure_recipe_ids
 
-DESCRIPTORS = set(config.get("descriptors", []))
-UNITS = set(config.get("units", []))
-STOPWORDS = set(config.get("stopwords", []))
-BLACKLIST = set(config.get("blacklist", []))
+# --- Paths ---
+paths = DataPaths()
+RAW_DATA_PATH = paths.recipe_dataset_200k
+CLEANED_DATA_PATH = paths.cleaned_ner
 
-# --- Normalizer ---
+# --- Normalizer (vocabulary from utils/normalizer_config.yaml) ---
 def normalize_ingredient(text, fallback=True):
     text = text.lower()
     text = re.sub(r"[^a-z\\s]", "", text)
@@ -39,19 +34,44 @@ def normalize_ingredient(text, fallback=True):
 
     return " ".join(filtered)
 
-# --- Load Dataset ---
-print("📥 Loading dataset...")
-df = pd.read_csv(RAW_DATA_PATH)
 
-print("🔍 Parsing NER column...")
-df["ner_list"] = df["NER"].apply(ast.literal_eval)
+# --- Stages ---
+def parse_ner_column(ner: pd.Series) -> pd.Series:
+    """Stringified RecipeNLG NER lists -> Python lists."""
+    return ner.apply(ast.literal_eval)
+
+
+def normalize_ner_lists(ner_lists: pd.Series) -> pd.Series:
+    return ner_lists.apply(lambda lst: [normalize_ingredient(x) for x in lst])
+
+
+def clean_recipes(df: pd.DataFrame) -> pd.DataFrame:
+    """recipe_id, title, ner_list_cleaned, directions for every raw recipe."""
+    df = ensure_recipe_ids(df)
+    df["ner_list"] = parse_ner_column(df["NER"])
+    df["ner_list_cleaned"] = normalize_ner_lists(df["ner_list"])
+    return df[["recipe_id", "title", "ner_list_cleaned", "directions"]]
+
+
+# --- Main ---
+def main():
+    parser = argparse.ArgumentParser(description="Parse and normalize the NER column of a RecipeNLG sample")
+    parser.add_argument("--input", default=str(RAW_DATA_PATH))
+    parser.add_argument("--output", default=str(CLEANED_DATA_PATH))
+    args = parser.parse_args()
+
+    print("📥 Loading dataset...")
+    df = pd.read_csv(args.input)
+
+    print("🧼 Parsing NER column and normalizing ingredients using YAML-driven config...")
+    cleaned = clean_recipes(df)
+
+    print(f"💾 Saving cleaned data to {args.output}...")
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    cleaned.to_csv(args.output, index=False)
 
-print("🧼 Normalizing ingredients using YAML-driven config...")
-df["ner_list_cleaned"] = df["ner_list"].apply(lambda lst: [normalize_ingredient(x) for x in lst])
+    print("✅ Done! Normalized dataset saved.")
 
-# --- Save Cleaned Output ---
-print(f"💾 Saving cleaned data to {CLEANED_DATA_PATH}...")
-os.makedirs(os.path.dirname(CLEANED_DATA_PATH), exist_ok=True)
-df[["title", "ner_list_cleaned", "directions"]].to_csv(CLEANED_DATA_PATH, index=False)
 
-print("✅ Done! Normalized dataset saved.")
+if __name__ == "__main__":
+    main()
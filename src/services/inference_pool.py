@@ -0,0 +1,248 @@
+import asyncio
+import contextvars
+import importlib
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import lru_cache
+
+from src.config.config import (
+    INFERENCE_DEADLINE_MS,
+    INFERENCE_QUEUE_SIZE,
+    INFERENCE_THREADS_PER_WORKER,
+    INFERENCE_WORKERS,
+    RECIPE_SHARDS,
+)
+from src.services.profiling import absorb_call_profile, current_profile, profile_call
+
+logger = logging.getLogger("plate_planner.inference")
+
+# CPU-bound model calls, named "module:function" so that the API process never
+# has to import (and load the models of) the modules it only dispatches to.
+SUGGEST_RECIPES = "src.utils.recipesuggestionmodel:suggest_recipes"
+SCORE_SUBSTITUTES = "src.evaluation.suggest_substitutes:score_substitutes"
+SIMILAR_RECIPES = "src.utils.recipesimilaritymodel:similar_recipes"
+SHARD_CANDIDATES = "src.utils.recipesuggestionmodel:shard_candidates"
+
+PRELOAD_TARGETS = (SUGGEST_RECIPES, SCORE_SUBSTITUTES)
+
+# Zero-argument loaders called once at startup, for modules that load their data lazily
+WARMUP_TARGETS = ("src.evaluation.suggest_substitutes:load_vectors",)
+
+
+# ----------------- Errors -----------------
+class InferenceUnavailable(Exception):
+    """The request was not (or not fully) served by the pool; mapped to an HTTP error by the API."""
+
+    status_code = 503
+
+    def __init__(self, detail: str, retry_after: int | None = None):
+        super().__init__(detail)
+        self.detail = detail
+        self.retry_after = retry_after
+
+    def __reduce__(self):
+        # Raised inside workers too, so it must survive pickling with its arguments
+        return type(self), (self.detail, self.retry_after)
+
+
+class InferenceOverloaded(InferenceUnavailable):
+    """Queue full: shed the request instead of letting latency grow without bound."""
+
+
+class InferenceDeadlineExceeded(InferenceUnavailable):
+    status_code = 504
+
+
+# ----------------- Worker side -----------------
+@lru_cache(maxsize=None)
+def resolve(target: str):
+    module_name, _, attr = target.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _init_worker(threads: int, preload: tuple[str, ...], warmup: tuple[str, ...] = ()):
+    """Pin the math libraries to `threads` and load the models once per worker process."""
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except ImportError:
+        pass
+    for target in preload:
+        resolve(target)
+    for target in warmup:
+        _warm_up(target)
+
+
+def _warm_up(target: str):
+    return resolve(target)()
+
+
+def _worker_ready() -> int:
+    # Runs only after the initializer has finished in this process; the short
+    # sleep lets workers still initializing pick up the other readiness calls
+    time.sleep(0.05)
+    return os.getpid()
+
+
+def _invoke(target: str, deadline: float | None, args: tuple, kwargs: dict, profile: bool = False):
+    # Requests that waited out their deadline in the queue are dropped unrun
+    if deadline is not None and time.time() > deadline:
+        raise InferenceDeadlineExceeded("Request expired in the inference queue")
+    if profile:
+        return profile_call(resolve(target), args, kwargs)
+    return resolve(target)(*args, **kwargs), None
+
+
+# ----------------- Pool -----------------
+class InferencePool:
+    """Bounded queue in front of N inference processes (or the API process itself when N = 0).
+
+    At most `workers + queue_size` calls are admitted at once; beyond that
+    submissions fail fast with InferenceOverloaded and a Retry-After estimate.
+    Every call carries a deadline: it is dropped if still queued when the
+    deadline passes, and the caller stops waiting for it at that point. A
+    call that already started cannot be interrupted, so it keeps its
+    admission slot until it actually finishes.
+    """
+
+    def __init__(
+        self,
+        workers: int = INFERENCE_WORKERS,
+        threads_per_worker: int = INFERENCE_THREADS_PER_WORKER,
+        queue_size: int = INFERENCE_QUEUE_SIZE,
+        deadline_ms: int = INFERENCE_DEADLINE_MS,
+        preload: tuple[str, ...] = PRELOAD_TARGETS,
+        warmup: tuple[str, ...] = WARMUP_TARGETS,
+    ):
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.queue_size = queue_size
+        self.deadline_ms = deadline_ms
+        self.preload = preload
+        self.warmup = warmup
+        self.inflight = 0
+        self.rejected = 0
+        self.expired = 0
+        self._avg_seconds = 0.05   # EWMA of call duration, for Retry-After
+        self._executor: ProcessPoolExecutor | None = None
+        self._threads: ThreadPoolExecutor | None = None
+
+    @property
+    def capacity(self) -> int:
+        return max(self.workers, 1) + self.queue_size
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.inflight - max(self.workers, 1))
+
+    # ----------------- Lifecycle -----------------
+    async def start(self) -> None:
+        if self.workers > 0:
+            self._executor = self._new_executor()
+            await self._await_workers_ready()
+        else:
+            for target in self.preload:
+                await asyncio.to_thread(resolve, target)
+            for target in self.warmup:
+                await asyncio.to_thread(_warm_up, target)
+        logger.info(f"Inference pool ready: {self.workers or 'in-process'} workers, queue {self.queue_size}")
+
+    async def _await_workers_ready(self) -> None:
+        """Block until every worker process has run its initializer (loaded its models).
+
+        A process only takes calls once its initializer is done, so a readiness
+        call answered by each of the `workers` pids proves all of them are ready.
+        """
+        ready: set[int] = set()
+        while len(ready) < self.workers:
+            calls = [self._executor.submit(_worker_ready) for _ in range(self.workers)]
+            ready.update(await asyncio.gather(*map(asyncio.wrap_future, calls)))
+
+    async def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self._threads is not None:
+            self._threads.shutdown(wait=False, cancel_futures=True)
+            self._threads = None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker, self.preload, self.warmup),
+        )
+
+    # ----------------- Calls -----------------
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.inflight * self._avg_seconds / max(self.workers, 1)))
+
+    def _submit(self, executor: Executor, target: str, deadline: float, args: tuple,
+                kwargs: dict) -> Future:
+        """Submit one call and count it in flight until it finishes, whoever waits for it."""
+        call = (_invoke, target, deadline, args, kwargs, current_profile.get() is not None)
+        if isinstance(executor, ThreadPoolExecutor):
+            # In the API process the call sees the request's context (stage timers, profile)
+            future = executor.submit(contextvars.copy_context().run, *call)
+        else:
+            future = executor.submit(*call)
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.inflight += 1
+
+        def release() -> None:
+            self.inflight -= 1
+            self._avg_seconds = 0.9 * self._avg_seconds + 0.1 * (time.perf_counter() - start)
+
+        # Completion callbacks run on executor threads; counters are only touched on the loop
+        def on_done(_future: Future) -> None:
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(release)
+
+        future.add_done_callback(on_done)
+        return future
+
+    async def run(self, target: str, *args, deadline_ms: int | None = None, **kwargs):
+        """Run `target(*args, **kwargs)` on the pool, subject to admission control and a deadline."""
+        if self.inflight >= self.capacity:
+            self.rejected += 1
+            raise InferenceOverloaded("Inference queue is full", retry_after=self.retry_after())
+
+        timeout = (deadline_ms or self.deadline_ms) / 1000
+        deadline = time.time() + timeout
+        executor = self._executor
+        if executor is None and self._threads is None:
+            self._threads = ThreadPoolExecutor(thread_name_prefix="inference")
+        try:
+            future = self._submit(executor or self._threads, target, deadline, args, kwargs)
+            # shield: the deadline stops the wait, not the (uninterruptible) call itself
+            call = asyncio.shield(asyncio.wrap_future(future))
+            result, call_profile = await asyncio.wait_for(call, timeout)
+            absorb_call_profile(call_profile)
+            return result
+        except (TimeoutError, InferenceDeadlineExceeded):
+            future.cancel()   # only succeeds while still queued; a running call keeps its slot
+            self.expired += 1
+            raise InferenceDeadlineExceeded(f"Inference did not finish within {timeout:.1f}s") from None
+        except BrokenProcessPool:
+            # The first caller to notice replaces the pool
+            if executor is not None and self._executor is executor:
+                logger.exception("Inference worker died; restarting the pool")
+                executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+            raise InferenceUnavailable("Inference worker restarted", retry_after=self.retry_after()) from None
+
+
+# With RECIPE_SHARDS the recipe index and metadata live only in the shard servers (services/recipe_shard.py)
+inference_pool = InferencePool(preload=(SCORE_SUBSTITUTES,) if RECIPE_SHARDS else PRELOAD_TARGETS)
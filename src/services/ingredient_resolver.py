@@ -0,0 +1,222 @@
+import re
+from bisect import bisect_left
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.posting_index import EMPTY_POSTING, PostingIndex
+
+paths = DataPaths()
+INGREDIENT_VOCABULARY_PATH = paths.ingredient_vocabulary
+NER_POSTINGS_PATH = paths.recipe_ner_postings
+
+# Trigram candidates (by Dice overlap with the query) checked with the exact edit distance
+MAX_CANDIDATES = 10
+MIN_DICE = 0.3
+
+# Prefixes this short match a large share of the keys; their completions are ranked once, at build
+SHORT_PREFIX = 2
+MAX_SUGGESTIONS = 50
+
+
+def ingredient_key(name: str) -> str:
+    """Case-, underscore- and whitespace-insensitive form names are matched on."""
+    return re.sub(r"\s+", " ", str(name).lower().replace("_", " ")).strip()
+
+
+def trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(key: str) -> int:
+    """Typos tolerated for a query: one for short words, two otherwise."""
+    return 1 if len(key) <= 5 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Damerau-Levenshtein (optimal string alignment) distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if previous2 is not None and i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+# -------------------------
+# Index (snapshot written by pipelines/build_ingredient_vocabulary.py)
+# -------------------------
+@dataclass(frozen=True)
+class IngredientResolver:
+    """In-memory lookup over the graph's Ingredient names.
+
+    Autocomplete walks a sorted list of keys (each name plus every suffix
+    starting at one of its words, so "ched" finds "sharp cheddar cheese"):
+    the completions of a prefix are one contiguous range, found by binary
+    search. Typo correction gathers names sharing trigrams with the query
+    from a trigram posting index, then ranks the best few by edit distance.
+    """
+
+    names: list[str]
+    recipes: np.ndarray                  # int64, recipes using each name (popularity)
+    exact: dict[str, int] = field(repr=False)
+    keys: list[str] = field(repr=False)  # sorted
+    key_names: np.ndarray = field(repr=False)
+    key_starts: np.ndarray = field(repr=False)   # key is the whole name, not a later word of it
+    name_trigrams: PostingIndex = field(repr=False)
+    trigram_counts: np.ndarray = field(repr=False)
+    short_completions: dict[str, np.ndarray] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        prefixes = {key[:n] for key in self.keys for n in range(1, SHORT_PREFIX + 1)}
+        object.__setattr__(self, "short_completions", {p: self._complete(p, MAX_SUGGESTIONS) for p in prefixes})
+
+    @classmethod
+    def from_names(cls, names: Sequence[str], recipes: Sequence[int] | None = None) -> "IngredientResolver":
+        names = list(names)
+        recipes = np.zeros(len(names), dtype=np.int64) if recipes is None else np.asarray(recipes, dtype=np.int64)
+        normalized = [ingredient_key(n) for n in names]
+
+        exact: dict[str, int] = {}
+        for name_id in np.argsort(-recipes, kind="stable"):   # the most used name wins a shared key
+            exact.setdefault(normalized[name_id], int(name_id))
+
+        keys, key_names, key_starts = [], [], []
+        for name_id, key in enumerate(normalized):
+            for match in re.finditer(r"\S+", key):
+                keys.append(key[match.start():])
+                key_names.append(name_id)
+                key_starts.append(match.start() == 0)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        grams, gram_names = [], []
+        trigram_counts = np.zeros(len(names), dtype=np.int64)
+        for name_id, key in enumerate(normalized):
+            name_grams = trigrams(key)
+            trigram_counts[name_id] = len(name_grams)
+            grams.extend(name_grams)
+            gram_names.extend([name_id] * len(name_grams))
+
+        return cls(
+            names=names,
+            recipes=recipes,
+            exact=exact,
+            keys=[keys[i] for i in order],
+            key_names=np.asarray(key_names, dtype=np.int64)[order],
+            key_starts=np.asarray(key_starts, dtype=bool)[order],
+            name_trigrams=PostingIndex.from_pairs(grams, gram_names),
+            trigram_counts=trigram_counts,
+        )
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    # ----------------- Autocomplete -----------------
+    def _complete(self, key: str, limit: int) -> np.ndarray:
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + "\uffff", lo)
+        ids, starts = self.key_names[lo:hi], self.key_starts[lo:hi]
+        order = np.lexsort((ids, -self.recipes[ids], ~starts))
+        # a name can match at several words; keep its best-ranked occurrence
+        unique, first = np.unique(ids[order], return_index=True)
+        return unique[np.argsort(first)][:limit]
+
+    def autocomplete(self, prefix: str, limit: int = 10) -> list[tuple[str, int]]:
+        """(name, recipes) completing `prefix`: names starting with it first, then by popularity."""
+        key = ingredient_key(prefix)
+        if not key:
+            return []
+        if len(key) <= SHORT_PREFIX and limit <= MAX_SUGGESTIONS:
+            best = self.short_completions.get(key, EMPTY_POSTING)[:limit]
+        else:
+            best = self._complete(key, limit)
+        return [(self.names[i], int(self.recipes[i])) for i in best]
+
+    # ----------------- Resolution -----------------
+    def candidates(self, name: str, limit: int = 5) -> list[tuple[str, int]]:
+        """(name, edit distance) of the closest vocabulary names within max_edits, best first."""
+        key = ingredient_key(name)
+        query_grams = trigrams(key)
+        ids, shared = self.name_trigrams.overlap_counts(list(query_grams))
+        if not len(ids):
+            return []
+        dice = 2 * shared / (len(query_grams) + self.trigram_counts[ids])
+        keep = dice >= MIN_DICE
+        ids, dice = ids[keep], dice[keep]
+        top = ids[np.lexsort((-self.recipes[ids], -dice))[:MAX_CANDIDATES]]
+
+        limit_edits = max_edits(key)
+        scored = []
+        for name_id in top:
+            distance = edit_distance(key, ingredient_key(self.names[name_id]), limit_edits)
+            if distance <= limit_edits:
+                scored.append((distance, -int(self.recipes[name_id]), int(name_id)))
+        return [(self.names[i], d) for d, _, i in sorted(scored)[:limit]]
+
+    def resolve(self, name: str) -> tuple[str | None, int | None]:
+        """(vocabulary name, edit distance): distance 0 for an exact match, (None, None) when nothing is close."""
+        name_id = self.exact.get(ingredient_key(name))
+        if name_id is not None:
+            return self.names[name_id], 0
+        found = self.candidates(name, limit=1)
+        return found[0] if found else (None, None)
+
+    def canonical(self, name: str) -> str | None:
+        """The vocabulary spelling of `name`, or of the one name it is a typo of.
+
+        None when nothing is close, or when several names are equally close:
+        "peax" could be "peas" or "pear", and picking the more popular one
+        would rewrite words the caller spelled correctly.
+        """
+        name_id = self.exact.get(ingredient_key(name))
+        if name_id is not None:
+            return self.names[name_id]
+        found = self.candidates(name, limit=2)
+        if not found or (len(found) > 1 and found[0][1] == found[1][1]):
+            return None
+        return found[0][0]
+
+
+@lru_cache(maxsize=1)
+def load_ingredient_resolver() -> IngredientResolver:
+    vocabulary = pd.read_csv(INGREDIENT_VOCABULARY_PATH, keep_default_na=False)
+    return IngredientResolver.from_names(vocabulary["name"].astype(str).tolist(), vocabulary["recipes"].to_numpy())
+
+
+@lru_cache(maxsize=1)
+def load_ner_resolver() -> IngredientResolver:
+    """The recipes' NER terms (what suggest_recipes matches against), ranked by document frequency."""
+    postings = PostingIndex.load(NER_POSTINGS_PATH)
+    return IngredientResolver.from_names(postings.terms, np.diff(postings.indptr))
+
+
+# -------------------------
+# Request canonicalization
+# -------------------------
+# Each caller corrects against the vocabulary it matches on, so a word that
+# vocabulary knows ("eggs" for NER overlap, "onion" for the graph) is never rewritten.
+def canonical_ingredient(name: str) -> str | None:
+    """Graph vocabulary spelling of a normalized ingredient name; None if not unambiguous or there is no vocabulary."""
+    if not INGREDIENT_VOCABULARY_PATH.exists():
+        return None
+    return load_ingredient_resolver().canonical(name)
+
+
+def canonical_recipe_terms(names: list[str]) -> list[str]:
+    """suggest_recipes ingredients spelled as NER terms; names no term is unambiguously close to stay as given."""
+    if not NER_POSTINGS_PATH.exists():
+        return names
+    resolver = load_ner_resolver()
+    return [resolver.canonical(n) or n for n in names]
@@ -0,0 +1,252 @@
+import asyncio
+import functools
+import os
+import time
+from contextvars import ContextVar
+
+from fastapi.routing import APIRoute
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.multiprocess import MultiProcessCollector
+
+from src.services.profiling import record_stage
+
+# With INFERENCE_WORKERS > 0, stage timers run inside the worker processes; set
+# PROMETHEUS_MULTIPROC_DIR (to an empty directory) so their samples are merged here.
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+REQUESTS = Counter(
+    "plate_planner_http_requests_total", "HTTP requests served", ["method", "route", "status"]
+)
+REQUEST_SECONDS = Histogram(
+    "plate_planner_http_request_duration_seconds", "End-to-end HTTP request latency",
+    ["method", "route"], buckets=LATENCY_BUCKETS,
+)
+STAGE_SECONDS = Histogram(
+    "plate_planner_stage_duration_seconds", "Latency of one stage of an operation",
+    ["operation", "stage"], buckets=LATENCY_BUCKETS,
+)
+NEO4J_FALLBACKS = Counter(
+    "plate_planner_neo4j_fallbacks_total", "Reads answered by the local graph snapshot after a recent Neo4j error",
+    ["operation"],
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _stage(operation: str, stage: str):
+    return STAGE_SECONDS.labels(operation, stage)
+
+
+class stage_timer:
+    """Context manager observing the wrapped block into plate_planner_stage_duration_seconds.
+
+    The timing is also added to the request's profile when it is being profiled.
+    """
+
+    __slots__ = ("operation", "stage", "start")
+
+    def __init__(self, operation: str, stage: str):
+        self.operation = operation
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        _stage(self.operation, self.stage).observe(elapsed)
+        record_stage(self.operation, self.stage, elapsed)
+
+
+# ----------------- HTTP -----------------
+class MetricsMiddleware:
+    """Pure ASGI middleware: request count and latency per route template (not per raw path)."""
+
+    def __init__(self, app):
+        self.app = app
+        self._routes: dict | None = None
+
+    def _route_of(self, scope) -> str:
+        if self._routes is None:
+            self._routes = {r.endpoint: r.path for r in scope["app"].routes if hasattr(r, "endpoint")}
+        return self._routes.get(scope.get("endpoint"), "unmatched")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router has stored the matched endpoint in scope by now
+            route = self._route_of(scope)
+            REQUEST_SECONDS.labels(scope["method"], route).observe(time.perf_counter() - start)
+            REQUESTS.labels(scope["method"], route, str(status_code)).inc()
+
+
+_endpoint_seconds: ContextVar[list | None] = ContextVar("endpoint_seconds", default=None)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute splitting handler time into the endpoint body and FastAPI's own work.
+
+    "serialization" is everything the route does outside the endpoint
+    function: request parsing/validation and response-model serialization.
+    """
+
+    def __init__(self, path, endpoint, **kwargs):
+        if asyncio.iscoroutinefunction(endpoint):
+            @functools.wraps(endpoint)
+            async def timed_endpoint(*args, **kw):
+                start = time.perf_counter()
+                try:
+                    return await endpoint(*args, **kw)
+                finally:
+                    holder = _endpoint_seconds.get()
+                    if holder is not None:
+                        holder.append(time.perf_counter() - start)
+
+            super().__init__(path, timed_endpoint, **kwargs)
+        else:
+            super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        endpoint_stage = STAGE_SECONDS.labels(self.path, "endpoint")
+        serialization_stage = STAGE_SECONDS.labels(self.path, "serialization")
+
+        async def timed_handler(request):
+            holder = []
+            token = _endpoint_seconds.set(holder)
+            start = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                total = time.perf_counter() - start
+                _endpoint_seconds.reset(token)
+                if holder:
+                    endpoint_stage.observe(holder[0])
+                    serialization_stage.observe(max(0.0, total - holder[0]))
+
+        return timed_handler
+
+
+# ----------------- Runtime gauges (read at scrape time, zero hot-path cost) -----------------
+_caches: dict[str, object] = {}
+_neo4j_drivers: dict[str, object] = {}
+_inference_pool = None
+
+
+def register_cache(name: str, cached_fn) -> None:
+    """Expose the hit/miss counts of a functools.lru_cache-wrapped function."""
+    _caches[name] = cached_fn
+
+
+def register_neo4j_driver(name: str, driver) -> None:
+    _neo4j_drivers[name] = driver
+
+
+def register_inference_pool(pool) -> None:
+    global _inference_pool
+    _inference_pool = pool
+
+
+def _neo4j_pool_usage(driver) -> tuple[int, int, int] | None:
+    """(in use, idle, max size) from the driver's connection pool; None if the internals differ."""
+    try:
+        pool = driver._pool
+        connections = [c for conns in list(pool.connections.values()) for c in list(conns)]
+        in_use = sum(1 for c in connections if c.in_use)
+        return in_use, len(connections) - in_use, pool.pool_config.max_connection_pool_size
+    except AttributeError:
+        return None
+
+
+class RuntimeCollector:
+    def collect(self):
+        hits = CounterMetricFamily("plate_planner_cache_hits", "Cache hits", labels=["cache"])
+        misses = CounterMetricFamily("plate_planner_cache_misses", "Cache misses", labels=["cache"])
+        ratio = GaugeMetricFamily("plate_planner_cache_hit_ratio", "Cache hit ratio", labels=["cache"])
+        for name, fn in _caches.items():
+            info = fn.cache_info()
+            hits.add_metric([name], info.hits)
+            misses.add_metric([name], info.misses)
+            ratio.add_metric([name], info.hits / (info.hits + info.misses) if info.hits + info.misses else 0.0)
+        yield from (hits, misses, ratio)
+
+        conns = GaugeMetricFamily("plate_planner_neo4j_pool_connections", "Neo4j pool connections",
+                                  labels=["driver", "state"])
+        utilization = GaugeMetricFamily("plate_planner_neo4j_pool_utilization",
+                                        "Neo4j connections in use / max pool size", labels=["driver"])
+        for name, driver in _neo4j_drivers.items():
+            usage = _neo4j_pool_usage(driver)
+            if usage is None:
+                continue
+            in_use, idle, max_size = usage
+            conns.add_metric([name, "in_use"], in_use)
+            conns.add_metric([name, "idle"], idle)
+            utilization.add_metric([name], in_use / max_size if max_size else 0.0)
+        yield from (conns, utilization)
+
+        queue = GaugeMetricFamily("plate_planner_threadpool_queue_depth",
+                                  "Calls waiting for a thread in the event loop's default executor")
+        threads = GaugeMetricFamily("plate_planner_threadpool_threads", "Threads in the default executor")
+        executor = _default_executor()
+        if executor is not None:
+            queue.add_metric([], executor._work_queue.qsize())
+            threads.add_metric([], len(executor._threads))
+        yield from (queue, threads)
+
+        pool = _inference_pool
+        if pool is not None:
+            yield GaugeMetricFamily("plate_planner_inference_inflight", "Admitted inference calls", value=pool.inflight)
+            yield GaugeMetricFamily("plate_planner_inference_queue_depth", "Inference calls waiting for a worker",
+                                    value=pool.queue_depth)
+            yield GaugeMetricFamily("plate_planner_inference_capacity", "Max admitted inference calls",
+                                    value=pool.capacity)
+            yield CounterMetricFamily("plate_planner_inference_rejected", "Calls shed with 503",
+                                      value=pool.rejected)
+            yield CounterMetricFamily("plate_planner_inference_expired", "Calls past their deadline",
+                                      value=pool.expired)
+
+
+def _default_executor():
+    try:
+        return asyncio.get_running_loop()._default_executor
+    except (RuntimeError, AttributeError):
+        return None
+
+
+runtime_collector = RuntimeCollector()
+if not MULTIPROCESS:
+    REGISTRY.register(runtime_collector)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Prometheus exposition of this process (plus inference workers in multiprocess mode)."""
+    if not MULTIPROCESS:
+        return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry)
+    registry.register(runtime_collector)
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,68 @@
+# The one place Neo4j drivers are created (pool settings from config.py).
+#
+# API code shares one lazily created driver: get_driver() on first use,
+# close_driver() at shutdown. Scripts and pipelines open their own with
+# `with create_driver() as driver:`, which closes it (and its pool) on exit.
+
+import threading
+
+from neo4j import Driver, GraphDatabase
+
+from src.config.config import (
+    NEO4J_CONNECTION_ACQUISITION_TIMEOUT_S,
+    NEO4J_FETCH_SIZE,
+    NEO4J_MAX_CONNECTION_LIFETIME_S,
+    NEO4J_MAX_POOL_SIZE,
+    NEO4J_PASSWORD,
+    NEO4J_URI,
+    NEO4J_USER,
+)
+from src.services.metrics import register_neo4j_driver
+
+_lock = threading.Lock()
+_shared: Driver | None = None
+
+
+def driver_config(**overrides) -> dict:
+    """Pool and fetch settings for GraphDatabase.driver; `overrides` win."""
+    return {
+        "max_connection_pool_size": NEO4J_MAX_POOL_SIZE,
+        "max_connection_lifetime": NEO4J_MAX_CONNECTION_LIFETIME_S,
+        "connection_acquisition_timeout": NEO4J_CONNECTION_ACQUISITION_TIMEOUT_S,
+        "fetch_size": NEO4J_FETCH_SIZE,
+        **overrides,
+    }
+
+
+def create_driver(uri: str = NEO4J_URI, user: str = NEO4J_USER, password: str = NEO4J_PASSWORD,
+                  **overrides) -> Driver:
+    """A new driver the caller owns (and closes)."""
+    return GraphDatabase.driver(uri, auth=(user, password), **driver_config(**overrides))
+
+
+def get_driver() -> Driver:
+    """The process-wide shared driver, created on first use."""
+    global _shared
+    if _shared is None:
+        with _lock:
+            if _shared is None:
+                _shared = create_driver()
+                register_neo4j_driver("shared", _shared)
+    return _shared
+
+
+def set_driver(driver) -> None:
+    """Install `driver` (e.g. evaluation/fake_neo4j.FakeNeo4jDriver) as the shared driver."""
+    global _shared
+    with _lock:
+        _shared = driver
+        register_neo4j_driver("shared", driver)
+
+
+def close_driver() -> None:
+    """Close the shared driver, if one was created; the next get_driver() opens a new one."""
+    global _shared
+    with _lock:
+        driver, _shared = _shared, None
+    if driver is not None:
+        driver.close()
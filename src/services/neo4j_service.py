@@ -1,49 +1,149 @@
-from neo4j import GraphDatabase
+from functools import lru_cache
 
-from src.config.config import NEO4J_PASSWORD, NEO4J_URI, NEO4J_USER
-from src.evaluation.hybrid_substitution import (
-    get_direct_subs,
-    get_hybrid_subs,
-    normalize_ingredient,
-)
+from src.evaluation.hybrid_substitution import normalize_ingredient, normalize_ingredients
+from src.services.ingredient_resolver import canonical_ingredient
+from src.services.metrics import register_cache, stage_timer
+from src.services.neo4j_driver import get_driver
+from src.services.substitution_graph import SubstitutionGraph
+from src.services.substitution_reads import read_substitutes
+from src.utils.substitution_queries import by_score, get_batch_subs, get_direct_subs, get_hybrid_subs
+from src.utils.titles import title_key
+
+# spaCy lemmatization per request is the slow part of a cache-warm lookup
+normalize_cached = lru_cache(maxsize=50_000)(normalize_ingredient)
+register_cache("ingredient_normalization", normalize_cached)
+
+
+def graph_ingredients(names: list[str]) -> list[tuple[str, str]]:
+    """(normalized, graph name) per name, in one spaCy pass.
+
+    The graph name is the normalized name, typo-corrected by
+    services/ingredient_resolver.py only when the graph vocabulary doesn't
+    know it; pass it to the lookups below with `normalized=True`.
+    """
+    with stage_timer("graph_ingredients", "normalize"):
+        unique = list(dict.fromkeys(names))
+        normalized = [normalize_cached(unique[0])] if len(unique) == 1 else normalize_ingredients(unique)
+    resolved = {
+        name: (norm, canonical_ingredient(norm) or norm)
+        for name, norm in zip(unique, normalized, strict=True)
+    }
+    return [resolved[name] for name in names]
 
-driver = GraphDatabase.driver(NEO4J_URI, auth=(NEO4J_USER, NEO4J_PASSWORD))
 
 def get_hybrid_substitutes(
     ingredient: str,
     context: str | None = None,
     top_k: int = 5,
     alpha: float = 0.9,
-    use_hybrid: bool = True
+    use_hybrid: bool = True,
+    normalized: bool = False,
 ):
-    norm_ing = normalize_ingredient(ingredient)
+    operation = "get_hybrid_substitutes"
+    norm_ing = ingredient
+    if not normalized:
+        with stage_timer(operation, "normalize"):
+            norm_ing = normalize_cached(ingredient)
 
-    with driver.session() as session:
-        if use_hybrid:
-            return session.execute_read(get_hybrid_subs, norm_ing, context, top_k, alpha)
-        else:
-            return session.execute_read(_direct_only, norm_ing, context, top_k)
+    if use_hybrid:
+        return read_substitutes(operation, get_hybrid_subs, SubstitutionGraph.get_hybrid_subs,
+                                norm_ing, context, top_k, alpha)
+    return read_substitutes(operation, _direct_only, _local_direct_only, norm_ing, context, top_k)
+
+def get_batch_substitutes(
+    items: list[tuple[str, str | None]],
+    top_k: int = 5,
+    alpha: float = 0.9,
+    use_hybrid: bool = True,
+    normalized: bool = False,
+) -> list[list[dict]]:
+    """get_hybrid_substitutes for many (ingredient, context) pairs: one spaCy pass, one session, one query."""
+    operation = "get_batch_substitutes"
+    if not normalized:
+        with stage_timer(operation, "normalize"):
+            names = list(dict.fromkeys(name for name, _ in items))
+            forms = dict(zip(names, normalize_ingredients(names), strict=True))
+        items = [(forms[name], context) for name, context in items]
+
+    return read_substitutes(operation, get_batch_subs, SubstitutionGraph.get_batch_subs,
+                            items, top_k, alpha, use_hybrid)
 
 # Helper: direct-only fallback
 def _direct_only(tx, ingredient, context=None, top_k=5):
     direct, _ = get_direct_subs(tx, ingredient, context, top_k)
-    return sorted(direct, key=lambda x: -x["score"])[:top_k]
+    return sorted(direct, key=by_score)[:top_k]
+
+def _local_direct_only(graph: SubstitutionGraph, ingredient, context=None, top_k=5):
+    direct, _ = graph.get_direct_subs(ingredient, context, top_k)
+    return sorted(direct, key=by_score)[:top_k]
 
 
 def recipe_details(title: str):
     def _fetch_recipe(tx, title):
+        # Index seek on recipe_title_key instead of a toLower() scan over all recipes
         result = tx.run("""
-            MATCH (r:Recipe)
-            WHERE toLower(r.title) = toLower($title)
+            MATCH (r:Recipe {title_key: $title_key})
+            WITH r LIMIT 1
             OPTIONAL MATCH (r)-[:HAS_INGREDIENT]->(i:Ingredient)
-            RETURN r.title AS title,
+            RETURN r.recipe_id AS recipe_id,
+                   r.title AS title,
                    r.directions AS directions,
                    r.link AS link,
                    r.source AS source,
                    collect(i.name) AS ingredients
-        """, title=title)
+        """, title_key=title_key(title))
         return result.single()
 
-    with driver.session() as session:
+    with get_driver().session() as session:
         return session.execute_read(_fetch_recipe, title)
 
+
+def recipes_details(titles: list[str] | None = None, recipe_ids: list[int] | None = None):
+    """Fetch many recipes in one round trip, by title (case-insensitive) and/or recipe_id.
+
+    Returns (found, missing_titles, missing_recipe_ids); `found` keeps the
+    request order (titles first, then ids) and skips duplicates.
+    """
+    titles = titles or []
+    recipe_ids = recipe_ids or []
+    keys = list(dict.fromkeys(title_key(t) for t in titles))
+    ids = list(dict.fromkeys(int(rid) for rid in recipe_ids))
+
+    def _fetch_recipes(tx, keys, ids):
+        result = tx.run("""
+            CALL {
+                UNWIND $keys AS key
+                MATCH (r:Recipe {title_key: key})
+                WITH key, head(collect(r)) AS r
+                RETURN 'title' AS lookup, key, r
+                UNION ALL
+                UNWIND $ids AS key
+                MATCH (r:Recipe {recipe_id: key})
+                RETURN 'id' AS lookup, key, r
+            }
+            OPTIONAL MATCH (r)-[:HAS_INGREDIENT]->(i:Ingredient)
+            RETURN lookup, key,
+                   r.recipe_id AS recipe_id,
+                   r.title AS title,
+                   r.directions AS directions,
+                   r.link AS link,
+                   r.source AS source,
+                   collect(i.name) AS ingredients
+        """, keys=keys, ids=ids)
+        return [record.data() for record in result]
+
+    with get_driver().session() as session:
+        records = session.execute_read(_fetch_recipes, keys, ids)
+
+    by_title = {r["key"]: r for r in records if r["lookup"] == "title"}
+    by_id = {r["key"]: r for r in records if r["lookup"] == "id"}
+
+    found, seen = [], set()
+    for record in [by_title.get(k) for k in keys] + [by_id.get(i) for i in ids]:
+        if record is not None and record["recipe_id"] not in seen:
+            seen.add(record["recipe_id"])
+            found.append(record)
+
+    missing_titles = [t for t in dict.fromkeys(titles) if title_key(t) not in by_title]
+    missing_ids = [i for i in ids if i not in by_id]
+    return found, missing_titles, missing_ids
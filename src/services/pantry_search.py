@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.posting_index import PostingIndex
+
+paths = DataPaths()
+PANTRY_INDEX_DIR = paths.pantry_index
+
+
+# -------------------------
+# Index (built by pipelines/build_pantry_index.py)
+# -------------------------
+@dataclass(frozen=True)
+class PantryIndex:
+    postings: PostingIndex        # ingredient -> sorted recipe_ids (HAS_INGREDIENT)
+    sim_indptr: np.ndarray        # CSR over ingredient ids of SIMILAR_TO targets, best first
+    sim_dst: np.ndarray
+    sim_score: np.ndarray
+    recipe_ids: np.ndarray        # sorted
+    titles: np.ndarray
+    n_ingredients: np.ndarray
+
+    @property
+    def id_space(self) -> int:
+        return int(self.recipe_ids[-1]) + 1 if len(self.recipe_ids) else 0
+
+    def expansions(self, term_id: int, with_substitutes: bool, min_edge_score: float):
+        """(ingredient id, weight) pairs a pantry item can stand in for: itself at 1.0, plus SIMILAR_TO targets."""
+        yield term_id, 1.0
+        if not with_substitutes:
+            return
+        lo, hi = self.sim_indptr[term_id], self.sim_indptr[term_id + 1]
+        for dst, score in zip(self.sim_dst[lo:hi], self.sim_score[lo:hi], strict=True):
+            if score < min_edge_score:
+                break  # sorted best first
+            yield int(dst), float(score)
+
+
+@lru_cache(maxsize=1)
+def load_pantry_index() -> PantryIndex:
+    recipes = pd.read_csv(PANTRY_INDEX_DIR / "recipes.csv")
+    return PantryIndex(
+        postings=PostingIndex.load(PANTRY_INDEX_DIR),
+        sim_indptr=np.load(PANTRY_INDEX_DIR / "similar.indptr.npy"),
+        sim_dst=np.load(PANTRY_INDEX_DIR / "similar.dst.npy"),
+        sim_score=np.load(PANTRY_INDEX_DIR / "similar.score.npy"),
+        recipe_ids=recipes["recipe_id"].to_numpy(np.int64),
+        titles=recipes["title"].fillna("").astype(str).to_numpy(),
+        n_ingredients=recipes["n_ingredients"].to_numpy(np.int64),
+    )
+
+
+# -------------------------
+# Pantry Search
+# -------------------------
+def search_by_pantry(
+    pantry: list[str],
+    top_k: int = 10,
+    expand_substitutes: bool = True,
+    min_edge_score: float = 0.0,
+    min_matched: int = 1,
+) -> dict:
+    """Rank recipes by how much of the pantry they use, letting SIMILAR_TO substitutes count.
+
+    Each pantry item contributes once per recipe, with the weight of its best
+    match in that recipe: 1.0 for the item itself, the SIMILAR_TO edge score
+    for a substitute. Work is proportional to the posting lists touched, with
+    no variable-length graph traversal.
+    """
+    idx = load_pantry_index()
+    n = idx.id_space
+
+    scores = np.zeros(n, dtype=np.float32)
+    matched = np.zeros(n, dtype=np.int16)
+    best = np.zeros(n, dtype=np.float32)
+    seen = np.zeros(n, dtype=bool)      # recipes the current item already matched
+
+    used_terms: dict[int, float] = {}
+    unknown: list[str] = []
+    for item in dict.fromkeys(p.strip().lower() for p in pantry):
+        term_id = idx.postings.term_ids.get(item)
+        if term_id is None:
+            unknown.append(item)
+            continue
+
+        # Only posting entries are touched: each expansion adds the increase of
+        # this item's best weight to the recipe score, then `best` and `seen` are reset.
+        touched = []
+        for exp_id, weight in idx.expansions(term_id, expand_substitutes, min_edge_score):
+            ids = idx.postings.posting_of(exp_id)
+            old = best[ids]
+            new = np.maximum(old, weight)
+            scores[ids] += new - old
+            matched[ids] += ~seen[ids]
+            seen[ids] = True
+            best[ids] = new
+            touched.append(ids)
+            used_terms[exp_id] = max(used_terms.get(exp_id, 0.0), weight)
+        for ids in touched:
+            best[ids] = 0.0
+            seen[ids] = False
+
+    candidates = np.flatnonzero(matched >= max(min_matched, 1))
+    if len(candidates) > top_k:
+        part = np.argpartition(-scores[candidates], top_k - 1)[:top_k]
+        candidates = candidates[part]
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+
+    rows = np.searchsorted(idx.recipe_ids, candidates)
+    results = []
+    for rank, (rid, row) in enumerate(zip(candidates, rows, strict=True), start=1):
+        known = row < len(idx.recipe_ids) and idx.recipe_ids[row] == rid
+        n_ings = int(idx.n_ingredients[row]) if known else 0
+        results.append({
+            "recipe_id": int(rid),
+            "title": idx.titles[row] if known else "",
+            "score": float(scores[rid]),
+            "matched_items": int(matched[rid]),
+            "n_ingredients": n_ings,
+            "coverage": min(1.0, float(scores[rid]) / n_ings) if n_ings else 0.0,
+            "matched_ingredients": _matched_ingredients(idx, used_terms, int(rid)),
+            "rank": rank,
+        })
+
+    return {"results": results, "unknown_items": unknown}
+
+
+def _matched_ingredients(idx: PantryIndex, used_terms: dict[int, float], recipe_id: int) -> list[str]:
+    """Which of the touched ingredients (pantry items or their substitutes) this recipe contains."""
+    hits = []
+    for term_id in used_terms:
+        posting = idx.postings.posting_of(term_id)
+        pos = np.searchsorted(posting, recipe_id)
+        if pos < len(posting) and posting[pos] == recipe_id:
+            hits.append(idx.postings.terms[term_id])
+    return hits
@@ -0,0 +1,197 @@
+import asyncio
+import contextvars
+import hmac
+import itertools
+import json
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+from pyinstrument import Profiler
+from pyinstrument.renderers import HTMLRenderer, SpeedscopeRenderer
+from pyinstrument.session import Session
+
+from src.config.config import PROFILING_ADMIN_TOKEN, PROFILING_SAMPLE_EVERY
+from src.config.paths import DataPaths
+
+paths = DataPaths()
+PROFILES_DIR = paths.profiles
+
+PROFILE_HEADER = "x-profile"
+ADMIN_TOKEN_HEADER = "x-admin-token"
+SAMPLING_INTERVAL = 0.001
+
+# Never profiled: scrapes and the profile download endpoint itself
+EXCLUDED_PATHS = ("/metrics", "/debug/")
+
+PROFILE_FORMATS = {"html": ".html", "speedscope": ".speedscope.json", "json": ".json"}
+
+
+# ----------------- Per-request state -----------------
+@dataclass
+class RequestProfile:
+    """Stage timings and profiler sessions collected while one request is being profiled."""
+
+    stages: list[tuple[str, str, float]] = field(default_factory=list)
+    sessions: list[Session] = field(default_factory=list)
+
+
+current_profile: contextvars.ContextVar[RequestProfile | None] = contextvars.ContextVar(
+    "current_profile", default=None
+)
+
+
+def record_stage(operation: str, stage: str, seconds: float) -> None:
+    profile = current_profile.get()
+    if profile is not None:
+        profile.stages.append((operation, stage, seconds))
+
+
+def profile_call(fn, args: tuple, kwargs: dict):
+    """Run fn under its own sampling profiler; returns (result, (stages, session JSON)).
+
+    Used in worker threads/processes, which the event-loop profiler cannot see.
+    The profile is plain data so that it can be returned from another process.
+    """
+    profile = RequestProfile()
+    token = current_profile.set(profile)
+    profiler = Profiler(interval=SAMPLING_INTERVAL, async_mode="disabled")
+    profiler.start()
+    try:
+        result = fn(*args, **kwargs)
+    finally:
+        session = profiler.stop()
+        current_profile.reset(token)
+    return result, (profile.stages, session.to_json())
+
+
+def absorb_call_profile(call_profile) -> None:
+    """Merge the (stages, session JSON) returned by profile_call into the current request's profile."""
+    profile = current_profile.get()
+    if profile is None or call_profile is None:
+        return
+    stages, session_json = call_profile
+    profile.stages.extend(stages)
+    profile.sessions.append(Session.from_json(session_json))
+
+
+async def run_in_thread(fn, *args, **kwargs):
+    """asyncio.to_thread that also profiles the thread's work when the request is being profiled."""
+    if current_profile.get() is None:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    result, call_profile = await asyncio.to_thread(profile_call, fn, args, kwargs)
+    absorb_call_profile(call_profile)
+    return result
+
+
+# ----------------- Output -----------------
+def server_timing(stages: list[tuple[str, str, float]], total: float) -> str:
+    """Server-Timing header value: one metric per stage (summed if repeated) plus the total."""
+    summed: dict[str, float] = {}
+    for operation, stage, seconds in stages:
+        name = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{operation}.{stage}").strip("_")
+        summed[name] = summed.get(name, 0.0) + seconds
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in summed.items()]
+    parts.append(f"total;dur={total * 1000:.2f}")
+    return ", ".join(parts)
+
+
+def store_profile(profile_id: str, session: Session, summary: dict) -> Path:
+    """Write the flamegraph (speedscope JSON), pyinstrument's HTML view and the stage summary."""
+    PROFILES_DIR.mkdir(parents=True, exist_ok=True)
+    base = PROFILES_DIR / profile_id
+    Path(f"{base}.speedscope.json").write_text(SpeedscopeRenderer().render(session))
+    Path(f"{base}.html").write_text(HTMLRenderer().render(session))
+    Path(f"{base}.json").write_text(json.dumps(summary, indent=2))
+    return base
+
+
+def profile_file(profile_id: str, fmt: str) -> Path | None:
+    if fmt not in PROFILE_FORMATS or not re.fullmatch(r"[\w-]+", profile_id):
+        return None
+    path = PROFILES_DIR / f"{profile_id}{PROFILE_FORMATS[fmt]}"
+    return path if path.exists() else None
+
+
+def is_admin(token: str | None) -> bool:
+    return bool(PROFILING_ADMIN_TOKEN) and token is not None and hmac.compare_digest(token, PROFILING_ADMIN_TOKEN)
+
+
+# ----------------- Middleware -----------------
+class ProfilingMiddleware:
+    """Profiles a request on demand (X-Profile: 1 or ?profile=1, plus X-Admin-Token) or 1 in N in the background.
+
+    On-demand responses carry X-Profile-Id and a Server-Timing stage breakdown;
+    the flamegraph is fetched from /debug/profiles/{id}. Sampled requests are
+    only written to disk.
+    """
+
+    def __init__(self, app, sample_every: int = PROFILING_SAMPLE_EVERY):
+        self.app = app
+        self.sample_every = sample_every
+        self._counter = itertools.count(1)
+
+    def _mode(self, scope) -> str | None:
+        if scope["type"] != "http" or scope["path"].startswith(EXCLUDED_PATHS):
+            return None
+        headers = dict(scope["headers"])
+        requested = headers.get(PROFILE_HEADER.encode()) == b"1" or re.search(
+            rb"(^|&)profile=1(&|$)", scope.get("query_string", b"")
+        )
+        if requested and is_admin(headers.get(ADMIN_TOKEN_HEADER.encode(), b"").decode() or None):
+            return "on_demand"
+        if self.sample_every > 0 and next(self._counter) % self.sample_every == 0:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        mode = self._mode(scope)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}"
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        status_code = 500
+        profiler = Profiler(interval=SAMPLING_INTERVAL, async_mode="enabled")
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if mode == "on_demand":
+                    timing = server_timing(profile.stages, time.perf_counter() - start)
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"x-profile-id", profile_id.encode()),
+                        (b"server-timing", timing.encode()),
+                    ]
+            await send(message)
+
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            session = profiler.stop()
+            total = time.perf_counter() - start
+            current_profile.reset(token)
+            for worker_session in profile.sessions:
+                session = Session.combine(session, worker_session)
+            summary = {
+                "id": profile_id,
+                "mode": mode,
+                "method": scope["method"],
+                "path": scope["path"],
+                "query": scope.get("query_string", b"").decode(),
+                "status": status_code,
+                "total_ms": total * 1000,
+                "stages": [
+                    {"operation": op, "stage": stage, "ms": seconds * 1000} for op, stage, seconds in profile.stages
+                ],
+            }
+            # The response is already sent; rendering happens off the event loop
+            await asyncio.to_thread(store_profile, profile_id, session, summary)
@@ -0,0 +1,145 @@
+# One recipe shard: the recipe suggestion model loaded on a single recipe_id
+# range (a data tree written by pipelines/build_recipe_shards.py), answering the
+# candidate requests of services/sharded_search.py.
+#
+#   PLATE_PLANNER_DATA_ROOT=<shards>/shard_0 python -m src.services.recipe_shard --port 9100
+#
+# or, for every shard of a manifest on localhost:
+#
+#   python -m src.services.recipe_shard --all --base-port 9100
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+
+import httpx
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
+
+from src.config.paths import DataPaths
+from src.pipelines.build_recipe_shards import MANIFEST_FILE
+from src.services.inference_pool import SHARD_CANDIDATES, InferencePool, InferenceUnavailable
+from src.utils.recipe_attributes import RecipeFilter
+from src.utils.recipe_scoring import LEXICAL_K, MIN_OVERLAP, RAW_K
+
+paths = DataPaths()
+
+# Shards run only the candidate search; no substitution models to preload or warm up
+shard_pool = InferencePool(preload=(SHARD_CANDIDATES,), warmup=())
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await shard_pool.start()
+    yield
+    await shard_pool.shutdown()
+
+
+app = FastAPI(title="Plate Planner recipe shard", lifespan=lifespan)
+
+
+@app.exception_handler(InferenceUnavailable)
+async def inference_unavailable_handler(request: Request, exc: InferenceUnavailable):
+    headers = {"Retry-After": str(exc.retry_after)} if exc.retry_after else None
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=headers)
+
+
+class CandidateRequest(BaseModel):
+    ingredients: list[str]
+    raw_k: int = Field(RAW_K, ge=1)
+    min_overlap: int = Field(MIN_OVERLAP, ge=0)
+    lexical_k: int = Field(LEXICAL_K, ge=0)
+    filters: dict[str, list[str]] = Field(default_factory=dict)
+
+
+@app.get("/")
+async def health() -> dict:
+    return {"message": "Recipe shard is running.", "data_root": str(paths.data_root)}
+
+
+@app.post("/candidates")
+async def candidates(request: CandidateRequest) -> dict:
+    filters = RecipeFilter(**{name: tuple(values) for name, values in request.filters.items()})
+    return await shard_pool.run(
+        SHARD_CANDIDATES, request.ingredients, request.raw_k, request.min_overlap, request.lexical_k, filters,
+    )
+
+
+# ----------------- Local launcher -----------------
+def read_manifest(shards_dir: Path) -> dict:
+    return json.loads((Path(shards_dir) / MANIFEST_FILE).read_text())
+
+
+@contextmanager
+def local_shards(shards_dir: Path, base_port: int, startup_timeout: float = 300):
+    """Start one shard process per manifest entry on 127.0.0.1:base_port+i; yields their URLs."""
+    shards_dir = Path(shards_dir).resolve()
+    manifest = read_manifest(shards_dir)
+    processes, urls = [], []
+    try:
+        for i, shard in enumerate(manifest["shards"]):
+            env = {**os.environ, "PLATE_PLANNER_DATA_ROOT": str(shards_dir / shard["path"])}
+            port = base_port + i
+            processes.append(subprocess.Popen(
+                [sys.executable, "-m", "src.services.recipe_shard", "--port", str(port)],
+                cwd=paths.project_root, env=env,
+            ))
+            urls.append(f"http://127.0.0.1:{port}")
+
+        deadline = time.time() + startup_timeout
+        pending = dict(zip(urls, processes, strict=True))
+        while pending:
+            for url, process in list(pending.items()):
+                if process.poll() is not None:
+                    raise RuntimeError(f"Shard {url} exited during startup (code {process.returncode})")
+                try:
+                    if httpx.get(f"{url}/", timeout=1).status_code == 200:
+                        del pending[url]
+                except httpx.HTTPError:
+                    pass
+            if time.time() > deadline:
+                raise TimeoutError(f"Shards {sorted(pending)} did not start within {startup_timeout:.0f}s")
+            time.sleep(0.5)
+        yield urls
+    finally:
+        for process in processes:
+            process.terminate()
+        for process in processes:
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve one recipe shard (or all shards of a manifest locally)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--all", action="store_true", help="Start every shard in --shards on consecutive ports")
+    parser.add_argument("--shards", type=Path, default=paths.recipe_shards)
+    parser.add_argument("--base-port", type=int, default=9100)
+    args = parser.parse_args()
+
+    if not args.all:
+        import uvicorn
+
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+        return
+
+    with local_shards(args.shards, args.base_port) as urls:
+        print(f"🚀 {len(urls)} shards up; start the API with RECIPE_SHARDS={','.join(urls)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
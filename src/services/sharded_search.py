@@ -0,0 +1,119 @@
+# Scatter-gather suggest_recipes over recipe shards (see services/recipe_shard.py).
+#
+# Each shard serves one recipe_id range with its own FAISS index, metadata and
+# posting lists, and returns its best FAISS hits and lexical candidates. The
+# coordinator merges those sorted lists with a heap into the global top raw_k /
+# lexical_k (the same candidates one unsharded index would produce) and applies
+# the overlap rerank itself, so it never loads a model, an index or metadata.
+
+import asyncio
+import heapq
+from dataclasses import asdict
+from itertools import islice
+
+import httpx
+
+from src.config.config import COLLAPSE_DUPLICATE_RECIPES, RECIPE_SHARD_TIMEOUT_MS, RECIPE_SHARDS
+from src.services.inference_pool import InferenceDeadlineExceeded, InferenceUnavailable
+from src.services.metrics import stage_timer
+from src.utils.recipe_attributes import RecipeFilter
+from src.utils.recipe_scoring import (
+    LEXICAL_K,
+    MIN_OVERLAP,
+    RAW_K,
+    collapse_duplicates,
+    score_recipe,
+    top_results,
+)
+
+
+def merge_shard_candidates(
+    responses: list[dict],
+    ingredients: list[str],
+    top_n: int = 5,
+    rerank_weight: float = 0.6,
+    raw_k: int = RAW_K,
+    min_overlap: int = MIN_OVERLAP,
+    lexical_k: int = LEXICAL_K,
+    collapse: bool = COLLAPSE_DUPLICATE_RECIPES,
+) -> list[dict]:
+    """Global top candidates from per-shard `shard_candidates` responses, reranked and cut to top_n.
+
+    Shards built with recipe clusters tag each candidate with its cluster_id;
+    with `collapse`, duplicates across (and within) shards count once.
+    """
+    # Every shard list is sorted best first, so a k-way heap merge stops after k items
+    semantic = islice(heapq.merge(*(r["semantic"] for r in responses), key=lambda hit: -hit[1]), raw_k)
+    lexical = islice(heapq.merge(*(r["lexical"] for r in responses), key=lambda hit: (-hit[1], hit[0])), lexical_k)
+    keep = {recipe_id for recipe_id, _ in semantic} | {recipe_id for recipe_id, _ in lexical}
+
+    results, cluster_of = [], {}
+    for response in responses:
+        for recipe in response["recipes"]:
+            if recipe["recipe_id"] not in keep:
+                continue
+            scored = score_recipe(recipe["recipe_id"], recipe["title"], recipe["NER"], recipe["semantic_score"],
+                                  ingredients, rerank_weight, min_overlap)
+            if scored is not None:
+                results.append(scored)
+                if "cluster_id" in recipe:
+                    cluster_of[recipe["recipe_id"]] = recipe["cluster_id"]
+    if collapse and cluster_of:
+        results = collapse_duplicates(results, cluster_of)
+    return top_results(results, top_n)
+
+
+class ShardedRecipeSearch:
+    """Fans suggest_recipes out to every shard URL and merges the answers.
+
+    A query needs all shards: one that fails or misses the timeout turns the
+    request into a 503/504 (InferenceUnavailable) rather than silently
+    dropping part of the corpus.
+    """
+
+    def __init__(self, urls: list[str], timeout_ms: int = RECIPE_SHARD_TIMEOUT_MS):
+        self.urls = [url.rstrip("/") for url in urls]
+        self.timeout = timeout_ms / 1000
+        self._client: httpx.AsyncClient | None = None
+
+    async def start(self) -> None:
+        self._client = httpx.AsyncClient(
+            timeout=self.timeout, limits=httpx.Limits(max_keepalive_connections=64 * len(self.urls))
+        )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _query(self, url: str, payload: dict) -> dict:
+        try:
+            response = await self._client.post(f"{url}/candidates", json=payload)
+        except httpx.TimeoutException:
+            raise InferenceDeadlineExceeded(f"Recipe shard {url} timed out")
+        except httpx.HTTPError as exc:
+            raise InferenceUnavailable(f"Recipe shard {url} unreachable: {exc}", retry_after=1)
+        if response.status_code != 200:
+            raise InferenceUnavailable(f"Recipe shard {url} answered {response.status_code}", retry_after=1)
+        return response.json()
+
+    async def suggest_recipes(
+        self,
+        ingredients: list[str],
+        top_n: int = 5,
+        rerank_weight: float = 0.6,
+        raw_k: int = RAW_K,
+        min_overlap: int = MIN_OVERLAP,
+        lexical_k: int = LEXICAL_K,
+        filters: RecipeFilter | None = None,
+    ) -> list[dict]:
+        payload = {"ingredients": ingredients, "raw_k": raw_k, "min_overlap": min_overlap, "lexical_k": lexical_k,
+                   "filters": asdict(filters or RecipeFilter())}
+        with stage_timer("suggest_recipes", "shard_fanout"):
+            responses = await asyncio.gather(*(self._query(url, payload) for url in self.urls))
+        with stage_timer("suggest_recipes", "shard_merge"):
+            return merge_shard_candidates(responses, ingredients, top_n, rerank_weight, raw_k, min_overlap, lexical_k)
+
+
+# Used by the API instead of the in-process model when RECIPE_SHARDS is set
+recipe_shards = ShardedRecipeSearch(RECIPE_SHARDS) if RECIPE_SHARDS else None
@@ -0,0 +1,188 @@
+import json
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.substitution_queries import by_score, cooccurrence_results, direct_results, merge_hybrid
+
+paths = DataPaths()
+SUBSTITUTION_GRAPH_DIR = paths.substitution_graph
+
+ARRAYS = ("sub_indptr", "sub_dst", "sub_score", "sub_context", "sim_indptr", "sim_dst", "sim_score",
+          "ing_indptr", "ing_recipes", "rec_indptr", "rec_ingredients")
+
+
+def _csr(src: np.ndarray, n: int) -> np.ndarray:
+    indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return indptr
+
+
+# -------------------------
+# Snapshot (built by pipelines/build_substitution_graph.py)
+# -------------------------
+@dataclass(frozen=True)
+class SubstitutionGraph:
+    """In-process copy of SUBSTITUTES_WITH, SIMILAR_TO and HAS_INGREDIENT for the /substitute reads.
+
+    Ingredient names are interned into one sorted table, so an id order is a
+    name order. Every relationship is a CSR adjacency over those ids, e.g. the
+    SUBSTITUTES_WITH targets of ingredient `i` are
+    `sub_dst[sub_indptr[i]:sub_indptr[i + 1]]`, best first (ties by name),
+    matching the ORDER BY of utils/substitution_queries.py.
+    """
+
+    names: list[str]
+    contexts: list[str]          # SUBSTITUTES_WITH contexts, "" for none
+    sub_indptr: np.ndarray       # int64, len(names) + 1
+    sub_dst: np.ndarray          # int32 ingredient ids
+    sub_score: np.ndarray        # float64, as stored in Neo4j
+    sub_context: np.ndarray      # int16 ids into contexts
+    sim_indptr: np.ndarray       # SIMILAR_TO, same layout
+    sim_dst: np.ndarray
+    sim_score: np.ndarray
+    ing_indptr: np.ndarray       # ingredient id -> recipe rows
+    ing_recipes: np.ndarray      # int32
+    rec_indptr: np.ndarray       # recipe row -> ingredient ids
+    rec_ingredients: np.ndarray  # int32
+    name_ids: dict[str, int] = field(init=False, repr=False, compare=False)
+    context_ids: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "name_ids", {n: i for i, n in enumerate(self.names)})
+        object.__setattr__(self, "context_ids", {c: i for i, c in enumerate(self.contexts)})
+
+    # ----------------- Build -----------------
+    @classmethod
+    def from_frames(cls, substitutes: pd.DataFrame, similar: pd.DataFrame,
+                    recipe_ingredients: pd.DataFrame) -> "SubstitutionGraph":
+        """Build from exported rows: substitutes (source, target, score, context),
+        similar (source, target, score) and recipe_ingredients (recipe_id, ingredient)."""
+        recipe_ingredients = recipe_ingredients.drop_duplicates(["recipe_id", "ingredient"])
+        names = sorted(set(substitutes["source"]) | set(substitutes["target"]) | set(similar["source"])
+                       | set(similar["target"]) | set(recipe_ingredients["ingredient"]))
+        name_ids = pd.Series(np.arange(len(names)), index=names)
+        n = len(names)
+
+        def adjacency(edges: pd.DataFrame):
+            src = name_ids[edges["source"]].to_numpy(np.int64)
+            dst = name_ids[edges["target"]].to_numpy(np.int32)
+            score = edges["score"].to_numpy(np.float64)
+            order = np.lexsort((dst, -score, src))
+            return _csr(src, n), dst[order], score[order], order
+
+        sub_indptr, sub_dst, sub_score, order = adjacency(substitutes)
+        context_codes, contexts = pd.factorize(substitutes["context"].fillna("").astype(str), sort=True)
+        sim_indptr, sim_dst, sim_score, _ = adjacency(similar)
+
+        recipe_rows, _ = pd.factorize(recipe_ingredients["recipe_id"], sort=True)
+        ingredient_ids = name_ids[recipe_ingredients["ingredient"]].to_numpy(np.int64)
+        by_ingredient = np.lexsort((recipe_rows, ingredient_ids))
+        by_recipe = np.lexsort((ingredient_ids, recipe_rows))
+        n_recipes = int(recipe_rows.max()) + 1 if len(recipe_rows) else 0
+
+        return cls(
+            names=names,
+            contexts=list(contexts),
+            sub_indptr=sub_indptr,
+            sub_dst=sub_dst,
+            sub_score=sub_score,
+            sub_context=context_codes[order].astype(np.int16),
+            sim_indptr=sim_indptr,
+            sim_dst=sim_dst,
+            sim_score=sim_score,
+            ing_indptr=_csr(ingredient_ids, n),
+            ing_recipes=recipe_rows[by_ingredient].astype(np.int32),
+            rec_indptr=_csr(recipe_rows, n_recipes),
+            rec_ingredients=ingredient_ids[by_recipe].astype(np.int32),
+        )
+
+    # ----------------- Queries -----------------
+    def _substitutes_of(self, ingredient_id: int) -> slice:
+        return slice(self.sub_indptr[ingredient_id], self.sub_indptr[ingredient_id + 1])
+
+    def _subs(self, edges: slice, mask: np.ndarray | None, top_k: int) -> list[dict]:
+        dst, score, context = self.sub_dst[edges], self.sub_score[edges], self.sub_context[edges]
+        if mask is not None:
+            dst, score, context = dst[mask], score[mask], context[mask]
+        return [{"name": self.names[d], "score": float(s), "context": self.contexts[c] or None}
+                for d, s, c in zip(dst[:top_k], score[:top_k], context[:top_k], strict=True)]
+
+    def get_direct_subs(self, ingredient, context=None, top_k=5):
+        """utils/substitution_queries.get_direct_subs without Neo4j."""
+        ingredient_id = self.name_ids.get(ingredient)
+        if ingredient_id is None:
+            return direct_results([], [], context)
+        edges = self._substitutes_of(ingredient_id)
+        if context and context in self.context_ids:
+            matched = self._subs(edges, self.sub_context[edges] == self.context_ids[context], top_k)
+            if matched:
+                return direct_results(matched, [], context)
+        return direct_results([], self._subs(edges, None, top_k), context)
+
+    def get_cooccurrence_subs(self, ingredient, top_k=5):
+        """utils/substitution_queries.get_cooccurrence_subs without Neo4j: one bincount over the shared recipes."""
+        ingredient_id = self.name_ids.get(ingredient)
+        if ingredient_id is None:
+            return []
+        rows = self.ing_recipes[self.ing_indptr[ingredient_id]:self.ing_indptr[ingredient_id + 1]]
+        if not len(rows):
+            return []
+        starts, ends = self.rec_indptr[rows], self.rec_indptr[rows + 1]
+        lengths = ends - starts
+        # positions of every ingredient of every shared recipe, without a Python loop over recipes
+        positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+        counts = np.bincount(self.rec_ingredients[positions], minlength=len(self.names))
+        counts[ingredient_id] = 0
+
+        candidates = np.flatnonzero(counts)
+        if len(candidates) > top_k:
+            # keep every id tied with the k-th count, then order by (count desc, name)
+            kth = np.partition(counts[candidates], len(candidates) - top_k)[len(candidates) - top_k]
+            candidates = candidates[counts[candidates] >= kth]
+        best = candidates[np.lexsort((candidates, -counts[candidates]))][:top_k]
+        return cooccurrence_results([{"name": self.names[i], "score": int(counts[i])} for i in best])
+
+    def get_hybrid_subs(self, ingredient, context=None, top_k=5, alpha=0.9):
+        direct_subs, _ = self.get_direct_subs(ingredient, context, top_k=top_k * 2)
+        cooc_subs = self.get_cooccurrence_subs(ingredient, top_k=top_k * 2)
+        return merge_hybrid(direct_subs, cooc_subs, context, top_k, alpha)
+
+    def get_batch_subs(self, items: list[tuple[str, str | None]], top_k=5, alpha=0.9, hybrid=True):
+        """utils/substitution_queries.get_batch_subs without Neo4j."""
+        substitutes = {}
+        for name, context in dict.fromkeys(items):
+            if hybrid:
+                substitutes[name, context] = self.get_hybrid_subs(name, context, top_k, alpha)
+            else:
+                direct, _ = self.get_direct_subs(name, context, top_k)
+                substitutes[name, context] = sorted(direct, key=by_score)[:top_k]
+        return [substitutes[item] for item in items]
+
+    # ----------------- Persistence -----------------
+    def save(self, directory: Path | str) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in ARRAYS:
+            np.save(directory / f"{name}.npy", getattr(self, name))
+        (directory / "names.json").write_text(json.dumps(self.names))
+        (directory / "contexts.json").write_text(json.dumps(self.contexts))
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "SubstitutionGraph":
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        return cls(
+            names=json.loads((directory / "names.json").read_text()),
+            contexts=json.loads((directory / "contexts.json").read_text()),
+            **{name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in ARRAYS},
+        )
+
+
+@lru_cache(maxsize=1)
+def load_substitution_graph() -> SubstitutionGraph:
+    return SubstitutionGraph.load(SUBSTITUTION_GRAPH_DIR)
@@ -0,0 +1,54 @@
+# Substitution reads on SUBSTITUTION_READ_PATH (see config.py).
+#
+# In "fallback" mode Neo4j is a fast path, not a dependency: a failed read is
+# not retried (the driver would otherwise retry ServiceUnavailable for 30 s)
+# but answered from the services/substitution_graph.py snapshot at once, and
+# for SUBSTITUTION_BREAKER_S afterwards reads skip Neo4j altogether, so an
+# outage costs one failed attempt rather than one per request.
+
+import logging
+import time
+
+from neo4j import unit_of_work
+from neo4j.exceptions import DriverError, Neo4jError
+
+from src.config.config import SUBSTITUTION_BREAKER_S, SUBSTITUTION_QUERY_TIMEOUT_MS, SUBSTITUTION_READ_PATH
+from src.services.metrics import NEO4J_FALLBACKS, stage_timer
+from src.services.neo4j_driver import get_driver
+from src.services.substitution_graph import SUBSTITUTION_GRAPH_DIR, load_substitution_graph
+
+logger = logging.getLogger("plate_planner.neo4j")
+
+# Server-side timeout, so a slow graph fails over to the snapshot instead of holding the request
+_substitution_read = unit_of_work(timeout=SUBSTITUTION_QUERY_TIMEOUT_MS / 1000)
+
+# time.monotonic() until which fallback reads go straight to the snapshot
+_neo4j_skipped_until = 0.0
+
+
+def read_substitutes(operation: str, transaction_fn, local_fn, *args):
+    """Run one substitution read.
+
+    `transaction_fn(tx, *args)` reads Neo4j; `local_fn(graph, *args)` answers
+    the same from the snapshot.
+    """
+    global _neo4j_skipped_until
+    if SUBSTITUTION_READ_PATH == "local":
+        with stage_timer(operation, "local_graph"):
+            return local_fn(load_substitution_graph(), *args)
+    fallback = SUBSTITUTION_READ_PATH == "fallback" and SUBSTITUTION_GRAPH_DIR.exists()
+    if not fallback or time.monotonic() >= _neo4j_skipped_until:
+        # Retries only delay an answer the snapshot can give right away
+        session_config = {"max_transaction_retry_time": 0} if fallback else {}
+        try:
+            with stage_timer(operation, "neo4j_query"), get_driver().session(**session_config) as session:
+                return session.execute_read(_substitution_read(transaction_fn), *args)
+        except (Neo4jError, DriverError):
+            if not fallback:
+                raise
+            logger.warning(f"{operation}: Neo4j read failed, answering from the local graph snapshot "
+                           f"for the next {SUBSTITUTION_BREAKER_S:g} s", exc_info=True)
+            _neo4j_skipped_until = time.monotonic() + SUBSTITUTION_BREAKER_S
+    NEO4J_FALLBACKS.labels(operation).inc()
+    with stage_timer(operation, "local_graph"):
+        return local_fn(load_substitution_graph(), *args)
@@ -0,0 +1,19 @@
+from ast import literal_eval
+
+
+def parse_directions(raw) -> list[str]:
+    """Recipe directions as a list of steps.
+
+    RecipeNLG stores them as a stringified list; upload_recipe_metadata writes
+    the parsed list to Neo4j, but graphs loaded before that still hold the
+    string, so the API parses those on read.
+    """
+    if isinstance(raw, list):
+        return [str(step) for step in raw]
+    if not isinstance(raw, str) or not raw.strip():
+        return []
+    try:
+        steps = literal_eval(raw)
+    except (ValueError, SyntaxError):
+        return [raw]
+    return [str(step) for step in steps] if isinstance(steps, (list, tuple)) else [str(steps)]
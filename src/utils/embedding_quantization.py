@@ -0,0 +1,96 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+# Storage formats for recipe embeddings (and the matching FAISS scalar quantizer)
+EMBEDDING_DTYPES = ("float32", "fp16", "int8")
+
+SQ_TYPES = {
+    "fp16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def quantized_path(path: Path, dtype: str) -> Path:
+    """recipe_embeddings.npy -> recipe_embeddings.int8.npy; float32 keeps the original file."""
+    return path if dtype == "float32" else path.with_name(f"{path.stem}.{dtype}{path.suffix}")
+
+
+@dataclass(frozen=True)
+class QuantizedEmbeddings:
+    """L2-normalized row vectors stored as float32, float16 or per-dimension scaled int8.
+
+    int8 is symmetric: `vector ≈ codes * scale`, with `scale[d] = max|x[:, d]| / 127`,
+    so a dot product with a query never materializes float32 rows:
+    `(codes * scale) @ q == codes @ (scale * q)`.
+    """
+
+    codes: np.ndarray
+    scale: np.ndarray | None = None
+
+    @classmethod
+    def from_vectors(cls, vectors: np.ndarray, dtype: str = "float32") -> "QuantizedEmbeddings":
+        if dtype not in EMBEDDING_DTYPES:
+            raise ValueError(f"Unknown embedding dtype {dtype!r}; expected one of {EMBEDDING_DTYPES}")
+        vectors = np.array(vectors, dtype="float32", copy=True)
+        faiss.normalize_L2(vectors)
+
+        if dtype == "float32":
+            return cls(vectors)
+        if dtype == "fp16":
+            return cls(vectors.astype(np.float16))
+
+        scale = np.abs(vectors).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        codes = np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+        return cls(codes, scale.astype(np.float32))
+
+    @property
+    def dtype(self) -> str:
+        return {np.dtype(np.float16): "fp16", np.dtype(np.int8): "int8"}.get(self.codes.dtype, "float32")
+
+    @property
+    def nbytes(self) -> int:
+        return int(self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def decode(self, rows) -> np.ndarray:
+        vectors = self.codes[rows].astype(np.float32)
+        return vectors * self.scale if self.scale is not None else vectors
+
+    def dot(self, rows, query: np.ndarray) -> np.ndarray:
+        """Inner products of the given rows with one float32 query vector."""
+        query = np.asarray(query, dtype=np.float32)
+        if self.scale is not None:
+            query = query * self.scale
+        return self.codes[rows].astype(np.float32) @ query
+
+    # ----------------- Persistence -----------------
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, self.codes)
+        if self.scale is not None:
+            np.save(path.with_name(f"{path.stem}.scale{path.suffix}"), self.scale)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "QuantizedEmbeddings":
+        """Load a file written by save(); the codes are memory-mapped by default."""
+        codes = np.load(path, mmap_mode="r" if mmap else None)
+        scale_path = path.with_name(f"{path.stem}.scale{path.suffix}")
+        scale = np.load(scale_path) if codes.dtype == np.int8 else None
+        return cls(codes, scale)
+
+
+def load_recipe_embeddings(path: Path, dtype: str = "float32") -> QuantizedEmbeddings:
+    """Serving copy of the recipe embeddings.
+
+    float32 reads (and normalizes) the original .npy in memory; fp16/int8 map the
+    already-normalized files written by pipelines/build_recipe_index.py.
+    """
+    if dtype == "float32":
+        return QuantizedEmbeddings.from_vectors(np.load(path), "float32")
+    return QuantizedEmbeddings.load(quantized_path(path, dtype))
@@ -4,8 +4,12 @@ import re
 import wordninja
 import yaml
 
+from src.config.paths import DataPaths
+
+NORMALIZER_CONFIG_PATH = DataPaths().normalizer_config
+
 # Load YAML configuration for normalization
-with open("src/ml_training/normalizer_config.yaml") as f:
+with open(NORMALIZER_CONFIG_PATH) as f:
     config = yaml.safe_load(f)
 
 DESCRIPTORS = set(config.get("descriptors", []))
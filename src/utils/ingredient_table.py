@@ -0,0 +1,63 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class IngredientTable:
+    """Pre-encoded query-encoder vector for every known ingredient.
+
+    Queries are just `" ".join(ingredients)`, so a query vector can be pooled
+    from per-ingredient vectors instead of running the transformer; only
+    ingredients missing from the table go through the fallback encoder.
+    """
+
+    terms: list[str]
+    vectors: np.ndarray    # float32 (len(terms), dim), L2-normalized rows
+    term_ids: dict[str, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "term_ids", {t: i for i, t in enumerate(self.terms)})
+
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def lookup(self, ingredient: str) -> int | None:
+        term_id = self.term_ids.get(ingredient)
+        return self.term_ids.get(ingredient.strip().lower()) if term_id is None else term_id
+
+    def encode(self, ingredients: list[str], fallback=None) -> np.ndarray:
+        """(1, dim) mean of the ingredients' vectors; OOV ingredients are encoded by `fallback` in one batch.
+
+        Without a fallback, OOV ingredients are skipped (zeros if none are known).
+        """
+        known, oov = [], []
+        for ingredient in dict.fromkeys(ingredients):
+            term_id = self.lookup(ingredient)
+            if term_id is None:
+                oov.append(ingredient)
+            else:
+                known.append(term_id)
+
+        parts = [self.vectors[known]] if known else []
+        if oov and fallback is not None:
+            encoded = np.asarray(fallback.encode(oov), dtype=np.float32)
+            parts.append(encoded / np.clip(np.linalg.norm(encoded, axis=1, keepdims=True), 1e-12, None))
+        if not parts:
+            return np.zeros((1, self.vectors.shape[1]), dtype=np.float32)
+        return np.concatenate(parts).mean(axis=0, keepdims=True).astype(np.float32)
+
+    # ----------------- Persistence -----------------
+    def save(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "vectors.npy", self.vectors)
+        (directory / "terms.json").write_text(json.dumps(self.terms))
+
+    @classmethod
+    def load(cls, directory: Path, mmap: bool = True) -> "IngredientTable":
+        return cls(
+            terms=json.loads((directory / "terms.json").read_text()),
+            vectors=np.load(directory / "vectors.npy", mmap_mode="r" if mmap else None),
+        )
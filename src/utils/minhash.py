@@ -0,0 +1,85 @@
+import re
+from collections.abc import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Smallest prime above 2**32: (a * h + b) % P is a universal hash of 32-bit h without uint64 overflow
+_PRIME = np.uint64(4294967311)
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+
+# Generic title words that say nothing about which dish it is
+TITLE_STOPWORDS = frozenset({"recipe", "recipes", "the", "a", "an", "and", "with", "of", "my", "best", "easy", "i"})
+
+
+def recipe_features(title: str, ingredients: Iterable[str]) -> list[str]:
+    """The set MinHash compares: title words plus whole NER ingredient names."""
+    words = {w for w in re.findall(r"[a-z]+", str(title).lower()) if w not in TITLE_STOPWORDS}
+    return [f"t:{w}" for w in sorted(words)] + [f"i:{i.lower()}" for i in sorted(set(ingredients))]
+
+
+def lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """(bands, rows) with bands * rows <= num_perm whose S-curve midpoint (1/b)^(1/r) is closest to threshold."""
+    candidates = [(b, num_perm // b) for b in range(1, num_perm + 1)]
+    return min(candidates, key=lambda br: (abs((1 / br[0]) ** (1 / br[1]) - threshold), -br[0] * br[1]))
+
+
+def minhash_signatures(
+    feature_lists: Sequence[Sequence[str]], num_perm: int = 128, seed: int = 1, chunk_size: int = 50_000
+) -> np.ndarray:
+    """(len(feature_lists), num_perm) uint32 MinHash signatures; empty sets get all-max rows."""
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+    b = rng.integers(0, int(_MAX_HASH), size=num_perm, dtype=np.uint64)
+    signatures = np.full((len(feature_lists), num_perm), int(_MAX_HASH), dtype=np.uint32)
+
+    for start in range(0, len(feature_lists), chunk_size):
+        chunk = feature_lists[start:start + chunk_size]
+        lengths = np.fromiter((len(f) for f in chunk), dtype=np.int64, count=len(chunk))
+        flat = [feature for features in chunk for feature in features]
+        if not flat:
+            continue
+        hashes = pd.util.hash_array(np.asarray(flat, dtype=object)) & _MAX_HASH
+        # permuted hashes of every feature, then the minimum per recipe (recipes are contiguous runs)
+        permuted = ((hashes[:, None] * a + b) % _PRIME & _MAX_HASH).astype(np.uint32)
+        nonempty = lengths > 0
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))[nonempty]
+        signatures[start:start + len(chunk)][nonempty] = np.minimum.reduceat(permuted, offsets, axis=0)
+    return signatures
+
+
+def _find(parent: np.ndarray, i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def duplicate_clusters(signatures: np.ndarray, threshold: float = 0.8) -> np.ndarray:
+    """Cluster label (row of the cluster's first member) per row, linking rows whose estimated Jaccard >= threshold.
+
+    Rows sharing a bucket in any LSH band are candidates; each is compared to
+    the first row of its bucket on the full signature before being merged,
+    so band collisions alone never link two recipes.
+    """
+    n, num_perm = signatures.shape
+    bands, rows = lsh_params(threshold, num_perm)
+    parent = np.arange(n)
+
+    for band in range(bands):
+        block = np.ascontiguousarray(signatures[:, band * rows:(band + 1) * rows])
+        keys = pd.util.hash_pandas_object(pd.DataFrame(block), index=False).to_numpy()
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        sizes = np.diff(np.r_[starts, n])
+        for start, size in zip(starts[sizes > 1], sizes[sizes > 1], strict=True):
+            members = order[start:start + size]
+            head = members[0]
+            similar = (signatures[members[1:]] == signatures[head]).mean(axis=1) >= threshold
+            for other in members[1:][similar]:
+                root_a, root_b = _find(parent, head), _find(parent, other)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    return np.array([_find(parent, i) for i in range(n)])
@@ -3,7 +3,8 @@ import os
 
 import pandas as pd
 from gensim.models import Word2Vec
-from neo4j import GraphDatabase
+
+from src.services.neo4j_driver import create_driver
 
 # Setup logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
@@ -84,7 +85,7 @@ def batch_push_to_neo4j(substitution_pairs: list[tuple[str, str, float]], uri: s
                         batch_size: int = 500):
     logging.info(f"Pushing {len(substitution_pairs)} substitution relationships to Neo4j in batches of {batch_size}...")
 
-    driver = GraphDatabase.driver(uri, auth=(user, password))
+    driver = create_driver(uri, user, password)
 
     def execute_batch(tx, batch):
         tx.run("""
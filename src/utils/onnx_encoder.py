@@ -0,0 +1,43 @@
+from pathlib import Path
+
+import numpy as np
+import onnxruntime as ort
+from transformers import AutoTokenizer
+
+INT8_MODEL_FILE = "model.int8.onnx"
+FP32_MODEL_FILE = "model.onnx"
+
+# all-MiniLM-L6-v2's SentenceTransformer max_seq_length
+MAX_LENGTH = 256
+
+
+class OnnxQueryEncoder:
+    """ONNX Runtime stand-in for SentenceTransformer.encode over all-MiniLM-L6-v2.
+
+    Runs the transformer exported by pipelines/export_onnx_encoder.py (int8
+    dynamic quantization by default) and reproduces the SentenceTransformer
+    head: attention-masked mean pooling followed by L2 normalization.
+    """
+
+    def __init__(self, model_dir: Path | str, model_file: str = INT8_MODEL_FILE, num_threads: int | None = None):
+        model_dir = Path(model_dir)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(model_dir / model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def encode(self, texts: list[str]) -> np.ndarray:
+        batch = self.tokenizer(texts, padding=True, truncation=True, max_length=MAX_LENGTH, return_tensors="np")
+        feeds = {name: batch[name].astype(np.int64) for name in self.input_names}
+        token_embeddings = self.session.run(None, feeds)[0]
+
+        mask = batch["attention_mask"][..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
@@ -0,0 +1,106 @@
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+EMPTY_POSTING = np.empty(0, dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class PostingIndex:
+    """Inverted index from a term (ingredient name) to the sorted recipe_ids containing it.
+
+    Stored CSR-style: the postings of term `t` are
+    `postings[indptr[t]:indptr[t + 1]]`, sorted and duplicate-free, so they can
+    be intersected/merged with plain numpy and memory-mapped from disk.
+    """
+
+    terms: list[str]
+    indptr: np.ndarray     # int64, len(terms) + 1
+    postings: np.ndarray   # int64 recipe_ids
+    term_ids: dict[str, int] = field(init=False, repr=False, compare=False)
+    _max_recipe_id: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "term_ids", {t: i for i, t in enumerate(self.terms)})
+        object.__setattr__(self, "_max_recipe_id", int(self.postings.max()) if len(self.postings) else -1)
+
+    # ----------------- Build -----------------
+    @classmethod
+    def from_pairs(cls, terms: Sequence[str], recipe_ids: Sequence[int]) -> "PostingIndex":
+        """Build from parallel (term, recipe_id) sequences; duplicate pairs are dropped."""
+        codes, uniques = pd.factorize(pd.Series(terms, dtype="object"), sort=True)
+        ids = np.asarray(recipe_ids, dtype=np.int64)
+
+        order = np.lexsort((ids, codes))
+        codes, ids = codes[order], ids[order]
+        keep = np.ones(len(ids), dtype=bool)
+        keep[1:] = (codes[1:] != codes[:-1]) | (ids[1:] != ids[:-1])
+        codes, ids = codes[keep], ids[keep]
+
+        indptr = np.zeros(len(uniques) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(codes, minlength=len(uniques)), out=indptr[1:])
+        return cls(terms=list(uniques), indptr=indptr, postings=ids)
+
+    # ----------------- Lookup -----------------
+    def __len__(self) -> int:
+        return len(self.terms)
+
+    def __contains__(self, term: str) -> bool:
+        return term in self.term_ids
+
+    def posting_of(self, term_id: int) -> np.ndarray:
+        return self.postings[self.indptr[term_id]:self.indptr[term_id + 1]]
+
+    def posting(self, term: str) -> np.ndarray:
+        term_id = self.term_ids.get(term)
+        return EMPTY_POSTING if term_id is None else self.posting_of(term_id)
+
+    def document_frequency(self, term: str) -> int:
+        term_id = self.term_ids.get(term)
+        return 0 if term_id is None else int(self.indptr[term_id + 1] - self.indptr[term_id])
+
+    def overlap_counts(self, terms: Sequence[str]) -> tuple[np.ndarray, np.ndarray]:
+        """Recipe ids containing at least one of `terms`, with how many of them each contains.
+
+        Merges the sorted postings of the distinct terms; for very long
+        postings (e.g. "salt") a dense bincount is cheaper than a sort-merge.
+        """
+        lists = [self.posting(t) for t in dict.fromkeys(terms)]
+        lists = [p for p in lists if len(p)]
+        if not lists:
+            return EMPTY_POSTING, EMPTY_POSTING
+        if len(lists) == 1:
+            return np.asarray(lists[0]), np.ones(len(lists[0]), dtype=np.int64)
+
+        merged = np.concatenate(lists)
+        if len(merged) * 8 > self.max_recipe_id:
+            counts = np.bincount(merged)
+            ids = np.flatnonzero(counts)
+            return ids, counts[ids]
+        return np.unique(merged, return_counts=True)
+
+    @property
+    def max_recipe_id(self) -> int:
+        return self._max_recipe_id
+
+    # ----------------- Persistence -----------------
+    def save(self, directory: Path | str, name: str = "postings") -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / f"{name}.indptr.npy", self.indptr)
+        np.save(directory / f"{name}.ids.npy", self.postings)
+        (directory / f"{name}.terms.json").write_text(json.dumps(self.terms))
+
+    @classmethod
+    def load(cls, directory: Path | str, name: str = "postings", mmap: bool = True) -> "PostingIndex":
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        return cls(
+            terms=json.loads((directory / f"{name}.terms.json").read_text()),
+            indptr=np.load(directory / f"{name}.indptr.npy", mmap_mode=mode),
+            postings=np.load(directory / f"{name}.ids.npy", mmap_mode=mode),
+        )
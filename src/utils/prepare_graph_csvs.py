@@ -7,6 +7,8 @@ import re
 import pandas as pd
 from tqdm import tqdm
 
+from src.utils.recipe_ids import ensure_recipe_ids
+
 tqdm.pandas()
 
 RAW_DATA_PATH = "/Users/rangareddy/Development/Projects/plate-planner-api/app/src/data/raw/recipe_dataset.csv"
@@ -34,7 +36,7 @@ def safe_literal_eval(x):
 
 def main():
     print("Loading raw dataset...")
-    df = pd.read_csv(RAW_DATA_PATH)
+    df = ensure_recipe_ids(pd.read_csv(RAW_DATA_PATH))
 
     print("Parsing NER ingredients...")
     df["ner_list"] = df["NER"].progress_apply(safe_literal_eval)
@@ -47,10 +49,6 @@ def main():
     print("Filtering recipes with no cleaned ingredients...")
     df = df[df["ner_list_cleaned"].apply(lambda x: len(x) > 0)]
 
-    print("Assigning recipe IDs...")
-    df = df.reset_index(drop=True)
-    df["recipe_id"] = df.index
-
     # --- Create Ingredients Table ---
     print("Building ingredients list...")
     all_ingredients = set(ing for lst in df["ner_list_cleaned"] for ing in lst)
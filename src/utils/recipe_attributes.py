@@ -0,0 +1,181 @@
+import json
+import math
+import re
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from pathlib import Path
+
+import faiss
+import numpy as np
+import yaml
+
+from src.config.paths import DataPaths
+
+paths = DataPaths()
+
+
+# ----------------- Bitmaps -----------------
+# FAISS IDSelectorBitmap layout: id i is selected when bit (i & 7) of byte i >> 3 is set.
+def ids_to_bitmap(ids: np.ndarray, n_ids: int) -> np.ndarray:
+    mask = np.zeros(n_ids, dtype=bool)
+    mask[np.asarray(ids, dtype=np.int64)] = True
+    return np.packbits(mask, bitorder="little")
+
+
+def bitmap_contains(bitmap: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """Boolean mask: which of `ids` are selected by `bitmap` (ids past its end are not)."""
+    ids = np.asarray(ids, dtype=np.int64)
+    inside = ids < len(bitmap) * 8
+    found = np.zeros(len(ids), dtype=bool)
+    found[inside] = (bitmap[ids[inside] >> 3] >> (ids[inside] & 7)) & 1 == 1
+    return found
+
+
+def filtered_search_params(bitmap: np.ndarray, nprobe: int | None = None) -> faiss.SearchParameters:
+    """Search parameters restricting any index (flat, SQ, IVF, behind IndexIDMap) to the ids in `bitmap`."""
+    # IDSelectorBitmap takes the bitmap length in bytes; ids past its end are not selected
+    selector = faiss.IDSelectorBitmap(len(bitmap), faiss.swig_ptr(bitmap))
+    params = faiss.SearchParametersIVF(sel=selector, nprobe=nprobe) if nprobe else faiss.SearchParameters(sel=selector)
+    params.referenced_objects = [selector, bitmap]   # the C++ side only holds raw pointers
+    return params
+
+
+def filtered_nprobe(nprobe: int, selectivity: float, nlist: int) -> int:
+    """Probe more IVF lists for selective filters, so ~nprobe lists' worth of allowed vectors is scanned."""
+    return min(nlist, math.ceil(nprobe / max(selectivity, 1e-6)))
+
+
+# ----------------- Tag rules -----------------
+def term_pattern(terms: Iterable[str]) -> re.Pattern:
+    """Matches any of `terms` as whole words of a lower-cased ingredient name."""
+    alternatives = "|".join(re.escape(t.lower()) for t in sorted(terms, key=len, reverse=True))
+    return re.compile(rf"\b(?:{alternatives})\b")
+
+
+@dataclass(frozen=True)
+class TagRules:
+    """Diet and cuisine tags of a recipe, from its ingredient names (see utils/recipe_tag_config.yaml)."""
+
+    groups: dict[str, re.Pattern]
+    exceptions: frozenset[str]
+    diets: dict[str, tuple[str, ...]]                 # tag -> excluded groups
+    cuisines: dict[str, tuple[re.Pattern, int]]       # tag -> (signature terms, min matches)
+    _group_cache: dict[str, frozenset[str]] = field(default_factory=dict, repr=False, compare=False)
+
+    @classmethod
+    def from_config(cls, config: dict) -> "TagRules":
+        groups = {name: term_pattern(terms) for name, terms in config["groups"].items()}
+        diets = {tag: tuple(rule["exclude"]) for tag, rule in config.get("diets", {}).items()}
+        for tag, excluded in diets.items():
+            unknown = set(excluded) - set(groups)
+            if unknown:
+                raise ValueError(f"Diet {tag!r} excludes unknown groups {sorted(unknown)}")
+        return cls(
+            groups=groups,
+            exceptions=frozenset(e.lower() for e in config.get("exceptions", [])),
+            diets=diets,
+            cuisines={
+                tag: (term_pattern(rule["any"]), int(rule.get("min_matches", 1)))
+                for tag, rule in config.get("cuisines", {}).items()
+            },
+        )
+
+    @classmethod
+    def load(cls, path: Path = paths.recipe_tag_config) -> "TagRules":
+        with open(path) as f:
+            return cls.from_config(yaml.safe_load(f))
+
+    @property
+    def tags(self) -> list[str]:
+        return [*self.diets, *self.cuisines]
+
+    def ingredient_groups(self, name: str) -> frozenset[str]:
+        cached = self._group_cache.get(name)
+        if cached is None:
+            lowered = name.lower().strip()
+            cached = frozenset() if lowered in self.exceptions else frozenset(
+                group for group, pattern in self.groups.items() if pattern.search(lowered)
+            )
+            self._group_cache[name] = cached
+        return cached
+
+    def recipe_tags(self, ingredients: Sequence[str]) -> set[str]:
+        present = set().union(*(self.ingredient_groups(name) for name in ingredients))
+        tags = {tag for tag, excluded in self.diets.items() if present.isdisjoint(excluded)}
+        for tag, (pattern, min_matches) in self.cuisines.items():
+            if sum(1 for name in set(ingredients) if pattern.search(name.lower())) >= min_matches:
+                tags.add(tag)
+        return tags
+
+
+@lru_cache(maxsize=1)
+def known_tags() -> frozenset[str]:
+    return frozenset(TagRules.load().tags)
+
+
+# ----------------- Attribute index -----------------
+@dataclass(frozen=True)
+class RecipeAttributes:
+    """One recipe_id bitmap per tag, usable directly as a FAISS IDSelectorBitmap."""
+
+    tags: list[str]
+    bitmaps: np.ndarray   # uint8 (len(tags), ceil((max recipe_id + 1) / 8))
+
+    @classmethod
+    def from_recipes(cls, recipe_ids: Sequence[int], ner_lists: Iterable[Sequence[str]],
+                     rules: TagRules) -> "RecipeAttributes":
+        recipe_ids = np.asarray(recipe_ids, dtype=np.int64)
+        n_ids = int(recipe_ids.max()) + 1 if len(recipe_ids) else 0
+        tag_rows = {tag: row for row, tag in enumerate(rules.tags)}
+        masks = np.zeros((len(tag_rows), n_ids), dtype=bool)
+        for recipe_id, ingredients in zip(recipe_ids, ner_lists, strict=True):
+            for tag in rules.recipe_tags(ingredients):
+                masks[tag_rows[tag], recipe_id] = True
+        return cls(tags=rules.tags, bitmaps=np.packbits(masks, axis=1, bitorder="little"))
+
+    def tag_bitmap(self, tag: str, n_ids: int) -> np.ndarray:
+        """The recipes tagged `tag`, as a bitmap over ids [0, n_ids)."""
+        if tag not in self.tags:
+            raise ValueError(f"Unknown tag {tag!r}; known tags: {', '.join(self.tags)}")
+        bitmap = np.zeros((n_ids + 7) // 8, dtype=np.uint8)
+        row = self.bitmaps[self.tags.index(tag)]
+        n_bytes = min(len(row), len(bitmap))
+        bitmap[:n_bytes] = row[:n_bytes]
+        return bitmap
+
+    def counts(self) -> dict[str, int]:
+        return {tag: int(np.unpackbits(row).sum()) for tag, row in zip(self.tags, self.bitmaps, strict=True)}
+
+    # ----------------- Persistence -----------------
+    def save(self, directory: Path | str) -> None:
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        np.save(directory / "bitmaps.npy", self.bitmaps)
+        (directory / "tags.json").write_text(json.dumps(self.tags))
+
+    @classmethod
+    def load(cls, directory: Path | str, mmap: bool = True) -> "RecipeAttributes":
+        directory = Path(directory)
+        return cls(
+            tags=json.loads((directory / "tags.json").read_text()),
+            bitmaps=np.load(directory / "bitmaps.npy", mmap_mode="r" if mmap else None),
+        )
+
+
+# ----------------- Query filters -----------------
+@dataclass(frozen=True)
+class RecipeFilter:
+    """Constraints on suggest_recipes candidates; ingredient terms match NER names as whole words."""
+
+    include_ingredients: tuple[str, ...] = ()
+    exclude_ingredients: tuple[str, ...] = ()
+    include_tags: tuple[str, ...] = ()
+    exclude_tags: tuple[str, ...] = ()
+
+    def __bool__(self) -> bool:
+        return any((self.include_ingredients, self.exclude_ingredients, self.include_tags, self.exclude_tags))
+
+    @property
+    def tags(self) -> tuple[str, ...]:
+        return self.include_tags + self.exclude_tags
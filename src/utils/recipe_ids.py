@@ -0,0 +1,26 @@
+import pandas as pd
+
+RECIPE_ID = "recipe_id"
+
+# RecipeNLG_dataset.csv ships its own row id as an unnamed first column; the
+# sampled recipe_dataset_*k.csv files keep it (written with index=False).
+RECIPENLG_ID_COLUMN = "Unnamed: 0"
+
+
+def ensure_recipe_ids(df: pd.DataFrame) -> pd.DataFrame:
+    """Give every row the one stable `recipe_id` shared by the graph, embeddings, FAISS and metadata.
+
+    Prefers an existing `recipe_id` column, then RecipeNLG's own row id, and
+    only falls back to the frame's index for files that carry neither. Call it
+    before any filtering so ids never depend on which rows were dropped.
+    """
+    if RECIPE_ID in df.columns:
+        df = df.copy()
+    elif RECIPENLG_ID_COLUMN in df.columns:
+        df = df.rename(columns={RECIPENLG_ID_COLUMN: RECIPE_ID})
+    else:
+        df = df.copy()
+        df[RECIPE_ID] = df.index
+
+    df[RECIPE_ID] = df[RECIPE_ID].astype("int64")
+    return df
@@ -0,0 +1,78 @@
+from ast import literal_eval
+from collections.abc import Mapping
+
+from src.config.config import SUGGEST_LEXICAL_K
+
+# suggest_recipes defaults, shared by the in-process model and the shard coordinator
+RAW_K = 50           # FAISS neighbours per query
+MIN_OVERLAP = 2      # query ingredients a recipe must contain
+# Lexical candidates (by ingredient overlap) added to the FAISS hits; 0 = FAISS only
+LEXICAL_K = SUGGEST_LEXICAL_K
+
+
+def score_recipe(
+    recipe_id: int,
+    title: str,
+    raw_ner: str,
+    sem_score: float,
+    ingredients: list[str],
+    rerank_weight: float,
+    min_overlap: int,
+) -> dict | None:
+    """Blend a candidate's cosine with its ingredient overlap; None if it overlaps less than min_overlap."""
+    # Convert input list to a set for faster lookups:
+    input_set = set(ingredients)
+    try:
+        raw_list = literal_eval(raw_ner)
+    except (ValueError, SyntaxError):
+        return None
+
+    # 1) dedupe the recipe's ingredient list, preserving order
+    seen = set()
+    unique_full_list = []
+    for ing in raw_list:
+        if ing not in seen:
+            unique_full_list.append(ing)
+            seen.add(ing)
+
+    # 2) find the intersection as a set (no duplicates)
+    overlap_set = unique_full_list and (input_set & set(unique_full_list))
+    if len(overlap_set) < min_overlap:
+        return None
+
+    # 3) compute semantic similarity in [0,1]
+    sem_score = max(0.0, min(1.0, sem_score))          # cosine ∈[-1,1]: drop negatives, clamp to [0,1]
+
+    # 4) compute overlap in [0,1]
+    overlap_score = len(overlap_set) / max(len(ingredients), 1)
+
+    # 5) convex blend & clamp combined_score in [0,1]
+    combined_score = (1 - rerank_weight)*sem_score + rerank_weight*overlap_score
+    combined_score = max(0.0, min(1.0, combined_score))
+
+    return {
+        "recipe_id": int(recipe_id),
+        "title": title,
+        "ingredients": [i for i in unique_full_list if i in overlap_set],
+        "semantic_score": sem_score,
+        "overlap_score": overlap_score,
+        "combined_score": combined_score,
+    }
+
+
+def top_results(results: list[dict], top_n: int) -> list[dict]:
+    """Sort by combined score, rank, and return the top_n."""
+    results = sorted(results, key=lambda x: x["combined_score"], reverse=True)
+    for rank, r in enumerate(results[:top_n], start=1):
+        r["rank"] = rank
+    return results[:top_n]
+
+
+def collapse_duplicates(results: list[dict], cluster_of: Mapping[int, int]) -> list[dict]:
+    """Keep the best-scoring result of each near-duplicate cluster; recipes without a cluster stand alone."""
+    best: dict[int, dict] = {}
+    for r in results:
+        cluster = cluster_of.get(r["recipe_id"], r["recipe_id"])
+        if cluster not in best or r["combined_score"] > best[cluster]["combined_score"]:
+            best[cluster] = r
+    return list(best.values())
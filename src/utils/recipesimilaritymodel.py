@@ -0,0 +1,105 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import faiss
+import numpy as np
+import pandas as pd
+
+from src.config.paths import DataPaths
+from src.utils.titles import title_key
+
+# -------------------------
+# Constants
+# -------------------------
+paths = DataPaths()
+
+CONTEXT_VECTORS_PATH = paths.context_vectors
+CONTEXT_METADATA_PATH = paths.context_metadata
+CONTEXT_INDEX_PATH = paths.faiss_context_index
+
+
+# -------------------------
+# Index (loaded lazily, memory-mapped)
+# -------------------------
+@dataclass(frozen=True)
+class ContextIndex:
+    index: faiss.Index
+    vectors: np.ndarray          # memory-mapped context_vectors.npy (not L2-normalized)
+    titles: np.ndarray
+    recipe_ids: np.ndarray | None   # None for context metadata written before recipe ids existed
+    title_rows: dict[str, int]   # title_key -> first row with that title
+
+    def recipe_id(self, row: int) -> int | None:
+        return int(self.recipe_ids[row]) if self.recipe_ids is not None else None
+
+    @property
+    def is_ivf(self) -> bool:
+        return faiss.try_extract_index_ivf(self.index) is not None
+
+
+@lru_cache(maxsize=1)
+def load_context_index() -> ContextIndex:
+    """Map the context vectors and FAISS index and build the title hash index once per process."""
+    vectors = np.load(CONTEXT_VECTORS_PATH, mmap_mode="r")
+    index = faiss.read_index(str(CONTEXT_INDEX_PATH), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+    metadata = pd.read_csv(CONTEXT_METADATA_PATH)
+    titles = metadata["title"].fillna("").astype(str)
+    recipe_ids = metadata["recipe_id"].to_numpy("int64") if "recipe_id" in metadata.columns else None
+
+    assert len(titles) == vectors.shape[0] == index.ntotal, \
+        f"Metadata rows ({len(titles)}), vectors ({vectors.shape[0]}) and index ({index.ntotal}) differ"
+
+    keys = titles.map(title_key)
+    first = ~keys.duplicated()
+    title_rows = dict(zip(keys[first], np.flatnonzero(first.to_numpy()), strict=True))
+
+    print(f"✅ Loaded context index: {index.ntotal} vectors, {len(title_rows)} distinct titles.")
+    return ContextIndex(
+        index=index,
+        vectors=vectors,
+        titles=titles.to_numpy(),
+        recipe_ids=recipe_ids,
+        title_rows=title_rows,
+    )
+
+
+# -------------------------
+# Recipe-level Similarity
+# -------------------------
+def similar_recipes(titles: list[str], top_k: int = 5, nprobe: int | None = None) -> list[dict | None]:
+    """Find recipes with the most similar ingredient/action context, for a batch of titles.
+
+    Titles are resolved through the exact (case-insensitive) title hash index;
+    unknown titles yield None in their slot. All found titles are searched in
+    a single FAISS call.
+    """
+    ctx = load_context_index()
+    rows = [ctx.title_rows.get(title_key(t)) for t in titles]
+    found = [r for r in rows if r is not None]
+    if not found:
+        return [None] * len(titles)
+
+    queries = np.ascontiguousarray(ctx.vectors[found], dtype="float32")
+    faiss.normalize_L2(queries)
+
+    params = faiss.SearchParametersIVF(nprobe=nprobe) if nprobe and ctx.is_ivf else None
+    # +1 so the query recipe itself can be dropped from its own results
+    distances, indices = ctx.index.search(queries, top_k + 1, params=params)
+
+    by_row: dict[int, dict] = {}
+    for q, row in enumerate(found):
+        results = []
+        for dist, idx in zip(distances[q], indices[q], strict=True):
+            if idx < 0 or idx == row:
+                continue
+            # Vectors are unit-length, so squared L2 = 2 − 2·cos
+            results.append({
+                "recipe_id": ctx.recipe_id(idx),
+                "title": ctx.titles[idx],
+                "score": max(0.0, min(1.0, 1.0 - float(dist) / 2.0)),
+            })
+        for rank, r in enumerate(results[:top_k], start=1):
+            r["rank"] = rank
+        by_row[row] = {"recipe_id": ctx.recipe_id(row), "title": ctx.titles[row], "results": results[:top_k]}
+
+    return [by_row[r] if r is not None else None for r in rows]
@@ -1,9 +1,33 @@
-from ast import literal_eval
+from functools import lru_cache
 
 import faiss
 import numpy as np
 import pandas as pd
+from src.config.config import COLLAPSE_DUPLICATE_RECIPES, QUERY_ENCODER, QUERY_ENCODING, RECIPE_EMBEDDING_DTYPE
 from src.config.paths import DataPaths
+from src.pipelines.build_recipe_index import index_has_recipe_ids, label_rows
+from src.services.metrics import stage_timer
+from src.utils.embedding_quantization import load_recipe_embeddings
+from src.utils.ingredient_table import IngredientTable
+from src.utils.posting_index import EMPTY_POSTING, PostingIndex
+from src.utils.recipe_attributes import (
+    RecipeAttributes,
+    RecipeFilter,
+    bitmap_contains,
+    filtered_nprobe,
+    filtered_search_params,
+    ids_to_bitmap,
+    term_pattern,
+)
+from src.utils.recipe_scoring import (
+    LEXICAL_K,
+    MIN_OVERLAP,
+    RAW_K,
+    collapse_duplicates,
+    score_recipe,
+    top_results,
+)
+from src.utils.recipe_ids import ensure_recipe_ids
 from sentence_transformers import SentenceTransformer
 
 # -------------------------
@@ -17,83 +41,274 @@ paths = DataPaths()
 RECIPE_METADATA_PATH = paths.recipe_metadata
 EMBEDDINGS_PATH = paths.recipe_embeddings
 FAISS_INDEX_PATH = paths.recipe_faiss_index
+NER_POSTINGS_PATH = paths.recipe_ner_postings
+RECIPE_ATTRIBUTES_DIR = paths.recipe_attributes
+RECIPE_CLUSTERS_PATH = paths.recipe_clusters
+QUERY_ENCODER_ONNX_DIR = paths.query_encoder_onnx
+INGREDIENT_TABLE_DIR = paths.ingredient_embedding_table
+
+# Inverted lists probed per query when the recipe index is IVF (build_recipe_index --nlist)
+NPROBE = 16
 
 # -------------------------
 # Load model + index once
 # -------------------------
 print("🔄 Loading model, metadata, and FAISS index...")
 
-model = SentenceTransformer(MODEL_NAME)
-metadata_df = pd.read_csv(RECIPE_METADATA_PATH)
+def load_query_encoder(kind: str = QUERY_ENCODER):
+    """SentenceTransformer (float32 PyTorch) or its int8 ONNX Runtime export; both expose .encode(texts)."""
+    if kind == "onnx":
+        from src.utils.onnx_encoder import OnnxQueryEncoder
+
+        return OnnxQueryEncoder(QUERY_ENCODER_ONNX_DIR)
+    return SentenceTransformer(MODEL_NAME)
+
+
+model = load_query_encoder()
+metadata_df = ensure_recipe_ids(pd.read_csv(RECIPE_METADATA_PATH))
 
-recipe_embeddings = np.load(EMBEDDINGS_PATH).astype("float32")
-faiss.normalize_L2(recipe_embeddings)
+# float32, fp16 or int8 (see pipelines/build_recipe_index.py --quantization)
+recipe_embeddings = load_recipe_embeddings(EMBEDDINGS_PATH, RECIPE_EMBEDDING_DTYPE)
 
 index = faiss.read_index(str(FAISS_INDEX_PATH))
+search_params = faiss.SearchParametersIVF(nprobe=NPROBE) if faiss.try_extract_index_ivf(index) else None
+
+# FAISS ids are recipe_ids for indexes built by pipelines/build_recipe_index.py;
+# older plain indexes return metadata row positions instead (see label_rows).
+recipe_id_index = pd.Index(metadata_df["recipe_id"])
+assert recipe_id_index.is_unique, "recipe_id must be unique in recipe_metadata.csv"
+# Filter bitmaps cover ids [0, N_RECIPE_IDS)
+N_RECIPE_IDS = int(recipe_id_index.max()) + 1 if len(recipe_id_index) else 0
+
+# Built by pipelines/build_ingredient_postings.py; without it suggest_recipes is FAISS-only.
+ner_postings = PostingIndex.load(NER_POSTINGS_PATH) if NER_POSTINGS_PATH.exists() else None
+
+# Built by pipelines/build_recipe_attributes.py; needed for include_tags / exclude_tags
+recipe_attributes = RecipeAttributes.load(RECIPE_ATTRIBUTES_DIR) if RECIPE_ATTRIBUTES_DIR.exists() else None
+
+
+def load_recipe_clusters(path=RECIPE_CLUSTERS_PATH) -> dict[int, int]:
+    """recipe_id -> cluster_id of every recipe that is a near-duplicate of another (representatives omitted)."""
+    clusters = pd.read_csv(path)
+    duplicates = clusters[clusters["recipe_id"] != clusters["cluster_id"]]
+    return dict(zip(duplicates["recipe_id"].tolist(), duplicates["cluster_id"].tolist(), strict=True))
+
+
+# Built by pipelines/build_recipe_clusters.py; each duplicate cluster yields one suggestion
+recipe_clusters = (load_recipe_clusters() if COLLAPSE_DUPLICATE_RECIPES and RECIPE_CLUSTERS_PATH.exists()
+                   else None)
+
+# Built by pipelines/build_ingredient_table.py; used when QUERY_ENCODING=table
+ingredient_table = IngredientTable.load(INGREDIENT_TABLE_DIR) if QUERY_ENCODING == "table" else None
+
+print(f"✅ Loaded: {len(metadata_df)} recipes ({recipe_embeddings.dtype} embeddings, {QUERY_ENCODER} encoder, {QUERY_ENCODING} queries), "
+      f"FAISS index with {index.ntotal} vectors.")
+
+# -------------------------
+# Query Encoding
+# -------------------------
+def encode_query(ingredients: list[str]) -> np.ndarray:
+    """(1, dim) L2-normalized query vector.
+
+    With the ingredient table, known ingredients cost a lookup and only
+    out-of-vocabulary ones go through the encoder.
+    """
+    if ingredient_table is not None:
+        query_vec = ingredient_table.encode(ingredients, fallback=model)
+    else:
+        query_vec = np.asarray(model.encode([" ".join(ingredients)]), dtype=np.float32)
+    faiss.normalize_L2(query_vec)
+    return query_vec
+
+
+# -------------------------
+# Candidate Generation
+# -------------------------
+def ranked_lexical_candidates(
+    ingredients: list[str], k: int, min_overlap: int, allowed: np.ndarray | None = None
+) -> tuple[np.ndarray, np.ndarray]:
+    """Up to `k` (recipe_ids, overlap counts) sharing the most ingredients with the query, best first.
+
+    Merges the sorted posting lists of the query ingredients, so rare pantries
+    still get candidates that the semantic search ranked below raw_k. With an
+    `allowed` bitmap, only those recipes compete for the k slots.
+    """
+    if ner_postings is None or k <= 0:
+        return EMPTY_POSTING, EMPTY_POSTING
+    ids, counts = ner_postings.overlap_counts(ingredients)
+    keep = counts >= min_overlap
+    if allowed is not None:
+        keep &= bitmap_contains(allowed, ids)
+    ids, counts = ids[keep], counts[keep]
+    # most overlap first; among ties the lowest recipe_ids, for a deterministic cut
+    order = np.lexsort((ids, -counts))[:k]
+    return ids[order], counts[order]
+
+
+def lexical_candidates(ingredients: list[str], k: int, min_overlap: int, allowed: np.ndarray | None = None) -> np.ndarray:
+    """Up to `k` recipe_ids sharing the most ingredients with the query (at least `min_overlap`)."""
+    return ranked_lexical_candidates(ingredients, k, min_overlap, allowed)[0]
+
+
+# -------------------------
+# Filtering
+# -------------------------
+@lru_cache(maxsize=128)
+def ingredient_bitmap(term: str) -> np.ndarray:
+    """Recipes with an NER ingredient containing `term` as whole words ("nuts" -> "pine nuts")."""
+    if ner_postings is None:
+        raise RuntimeError("Ingredient filters need the NER postings (pipelines/build_ingredient_postings.py)")
+    pattern = term_pattern([term])
+    postings = [ner_postings.posting_of(i) for i, name in enumerate(ner_postings.terms) if pattern.search(name.lower())]
+    return ids_to_bitmap(np.concatenate(postings) if postings else EMPTY_POSTING, N_RECIPE_IDS)
+
+
+def allowed_recipes(filters: RecipeFilter) -> np.ndarray:
+    """Bitmap over recipe_ids of the recipes passing every filter."""
+    if filters.tags and recipe_attributes is None:
+        raise RuntimeError("Tag filters need the recipe attributes (pipelines/build_recipe_attributes.py)")
+    allowed = np.full((N_RECIPE_IDS + 7) // 8, 0xFF, dtype=np.uint8)
+    for tag in filters.include_tags:
+        allowed &= recipe_attributes.tag_bitmap(tag, N_RECIPE_IDS)
+    for tag in filters.exclude_tags:
+        allowed &= ~recipe_attributes.tag_bitmap(tag, N_RECIPE_IDS)
+    for term in filters.include_ingredients:
+        allowed &= ingredient_bitmap(term)
+    for term in filters.exclude_ingredients:
+        allowed &= ~ingredient_bitmap(term)
+    return allowed
+
+
+def restricted_search_params(allowed: np.ndarray) -> faiss.SearchParameters:
+    """FAISS search parameters that only visit the allowed recipes, inside the index scan."""
+    if index_has_recipe_ids(index):
+        bitmap = allowed
+    else:
+        # legacy index: FAISS ids are metadata row positions
+        bitmap = np.packbits(bitmap_contains(allowed, recipe_id_index.to_numpy()), bitorder="little")
+    if search_params is None:
+        return filtered_search_params(bitmap)
+    selectivity = bitmap_contains(allowed, recipe_id_index.to_numpy()).mean()
+    ivf = faiss.extract_index_ivf(index)
+    return filtered_search_params(bitmap, nprobe=filtered_nprobe(NPROBE, selectivity, ivf.nlist))
 
-print(f"✅ Loaded: {len(metadata_df)} recipes, FAISS index with {index.ntotal} vectors.")
 
 # -------------------------
 # Recipe Suggestion Logic
 # -------------------------
+def _rerank(candidates: dict[int, float], ingredients: list[str], rerank_weight: float, min_overlap: int) -> list[dict]:
+    """Score metadata rows {row: cosine} by the semantic/overlap blend; rows below min_overlap are dropped."""
+    results: list[dict] = []
+    for pos, sem_score in candidates.items():
+        row = metadata_df.iloc[pos]
+        scored = score_recipe(row["recipe_id"], row["title"], row["NER"], sem_score,
+                              ingredients, rerank_weight, min_overlap)
+        if scored is not None:
+            results.append(scored)
+    return results
+
+
+def recipe_candidates(
+    ingredients: list[str],
+    raw_k: int = RAW_K,
+    min_overlap: int = MIN_OVERLAP,
+    lexical_k: int = LEXICAL_K,
+    filters: RecipeFilter | None = None,
+    operation: str = "suggest_recipes",
+) -> tuple[dict[int, float], np.ndarray, np.ndarray, dict[int, float]]:
+    """Candidate metadata rows of a query, before the rerank.
+
+    Returns the FAISS hits {row: cosine} (best first), the ranked lexical
+    candidates (recipe_ids, overlap counts) and the cosine of the lexical
+    rows the FAISS search did not return. `filters` are applied inside both
+    candidate generators, so a constrained query still gets `raw_k`
+    semantic candidates instead of a post-filtered subset.
+    """
+    allowed, params = None, search_params
+    if filters:
+        with stage_timer(operation, "filter"):
+            allowed = allowed_recipes(filters)
+            if not allowed.any():
+                return {}, EMPTY_POSTING, EMPTY_POSTING, {}
+            params = restricted_search_params(allowed)
+
+    with stage_timer(operation, "encode"):
+        query_vec = encode_query(ingredients)
+    with stage_timer(operation, "faiss_search"):
+        distances, indices = index.search(query_vec, raw_k, params=params)
+
+    # recipe_id -> metadata row (hash lookup), or the row positions of a legacy index
+    rows = label_rows(index, indices[0], recipe_id_index)
+    semantic = {int(pos): float(dist) for pos, dist in zip(rows, distances[0], strict=True) if pos >= 0}
+
+    # Lexical-only candidates get their cosine from the stored (normalized) embedding
+    with stage_timer(operation, "lexical_candidates"):
+        lexical_ids, lexical_counts = ranked_lexical_candidates(ingredients, lexical_k, min_overlap, allowed)
+        lexical_rows = recipe_id_index.get_indexer(lexical_ids)
+        extra = [int(pos) for pos in lexical_rows if pos >= 0 and pos not in semantic]
+        lexical_scores = {}
+        if extra:
+            sims = recipe_embeddings.dot(extra, query_vec[0])
+            lexical_scores = dict(zip(extra, sims.tolist(), strict=True))
+
+    return semantic, lexical_ids, lexical_counts, lexical_scores
+
+
 def suggest_recipes(
     ingredients: list[str],
     top_n: int = 5,
     rerank_weight: float = 0.6,
-    raw_k: int = 50,
-    min_overlap: int = 2
+    raw_k: int = RAW_K,
+    min_overlap: int = MIN_OVERLAP,
+    lexical_k: int = LEXICAL_K,
+    filters: RecipeFilter | None = None,
 ) -> list[dict]:
-    """Suggest recipes based on semantic similarity + ingredient overlap."""
-    query_vec = model.encode([" ".join(ingredients)])
-    faiss.normalize_L2(query_vec)
-    distances, indices = index.search(query_vec, raw_k)
+    """Suggest recipes based on semantic similarity + ingredient overlap.
 
-    # Convert input list to a set for faster lookups:
-    input_set = set(ingredients)
+    Candidates are the union of the `raw_k` FAISS neighbours and the
+    `lexical_k` best-overlapping recipes from the ingredient posting lists
+    (`lexical_k=0`: FAISS only); all of them are scored with the same
+    `rerank_weight` blend of the two signals. Near-duplicate recipes
+    (recipe_clusters.csv) count once, by their best member.
+    """
+    operation = "suggest_recipes"
+    semantic, _, _, lexical_scores = recipe_candidates(ingredients, raw_k, min_overlap, lexical_k, filters, operation)
 
-    results: list[dict] = []
-    for dist_i, idx in enumerate(indices[0]):
-        row = metadata_df.iloc[idx]
-        try:
-            raw_list = literal_eval(row["NER"])
-        except (ValueError, SyntaxError):
-            continue
-
-        # 1) dedupe the recipe's ingredient list, preserving order
-        seen = set()
-        unique_full_list = []
-        for ing in raw_list:
-            if ing not in seen:
-                unique_full_list.append(ing)
-                seen.add(ing)
-
-        # 2) find the intersection as a set (no duplicates)
-        overlap_set = unique_full_list and (input_set & set(unique_full_list))
-        if len(overlap_set) < min_overlap:
-            continue
-
-        # 3) compute semantic similarity in [0,1]
-        sem_score = float(distances[0][dist_i])            # now already cosine ∈[-1,1]
-        sem_score = max(0.0, min(1.0, sem_score))          # drop negatives, clamp to [0,1]
-
-        # 4) compute overlap in [0,1]
-        overlap_score = len(overlap_set) / max(len(ingredients), 1)
-
-        # 5) convex blend & clamp combined_score in [0,1]
-        combined_score = (1 - rerank_weight)*sem_score + rerank_weight*overlap_score
-        combined_score = max(0.0, min(1.0, combined_score))
-
-        results.append({
-            "title": row["title"],
-            "ingredients": [i for i in unique_full_list if i in overlap_set],
-            "semantic_score": sem_score,
-            "overlap_score": overlap_score,
-            "combined_score": combined_score,
-        })
-
-    # sort, rank, and return top_n
-    results = sorted(results, key=lambda x: x["combined_score"], reverse=True)
-    for rank, r in enumerate(results[:top_n], start=1):
-        r["rank"] = rank
-
-    return results[:top_n]
+    with stage_timer(operation, "rerank"):
+        results = _rerank({**semantic, **lexical_scores}, ingredients, rerank_weight, min_overlap)
+        if recipe_clusters is not None:
+            results = collapse_duplicates(results, recipe_clusters)
+
+    return top_results(results, top_n)
+
+
+def shard_candidates(
+    ingredients: list[str],
+    raw_k: int = RAW_K,
+    min_overlap: int = MIN_OVERLAP,
+    lexical_k: int = LEXICAL_K,
+    filters: RecipeFilter | None = None,
+) -> dict:
+    """This process's share of a sharded suggest_recipes query (see services/sharded_search.py).
+
+    The shard's FAISS hits and lexical candidates, best first, plus what the
+    coordinator needs to rerank every one of them; merging the top lists of
+    all shards gives exactly the candidates of a single unsharded index.
+    """
+    semantic, lexical_ids, lexical_counts, lexical_scores = recipe_candidates(
+        ingredients, raw_k, min_overlap, lexical_k, filters, operation="shard_candidates"
+    )
+    recipes = []
+    for pos, score in {**semantic, **lexical_scores}.items():
+        row = metadata_df.iloc[pos]
+        recipe = {"recipe_id": int(row["recipe_id"]), "title": row["title"], "NER": row["NER"],
+                  "semantic_score": score}
+        if recipe_clusters is not None:
+            recipe["cluster_id"] = recipe_clusters.get(recipe["recipe_id"], recipe["recipe_id"])
+        recipes.append(recipe)
+    recipe_ids = metadata_df["recipe_id"].to_numpy()
+    return {
+        "semantic": [[int(recipe_ids[pos]), score] for pos, score in semantic.items()],
+        "lexical": [[int(i), int(c)] for i, c in zip(lexical_ids, lexical_counts, strict=True)],
+        "recipes": recipes,
+    }
@@ -0,0 +1,177 @@
+# Neo4j read queries behind /substitute: direct SUBSTITUTES_WITH edges, recipe
+# co-occurrence and their hybrid blend, per ingredient or for a whole batch.
+# Ingredient names are expected already normalized (see
+# evaluation/hybrid_substitution.py normalize_ingredient). Equal scores are
+# ordered by name, so every read path (and services/substitution_graph.py)
+# returns the same list.
+
+from src.config.config import MATERIALIZED_SUBSTITUTES
+
+# Co-occurrence counts are scaled by this before blending with edge scores
+COOCCURRENCE_SCALE = 50.0
+
+
+# ----------------- Result shaping -----------------
+def by_score(sub: dict) -> tuple:
+    return -sub["score"], sub["name"]
+
+
+def direct_results(matched: list[dict], fallback: list[dict], context: str | None) -> tuple[list[dict], str]:
+    """Context-matched edges when there are any ("matched"), else the best edges of any context ("fallback")."""
+    if context and matched:
+        return [{"name": s["name"], "score": s["score"], "context": context, "source": "direct"} for s in matched], \
+            "matched"
+    return [{"name": s["name"], "score": s["score"], "context": s.get("context"), "source": "direct"}
+            for s in fallback], "fallback"
+
+
+def materialized_results(record, context: str | None, top_k: int) -> tuple[list[dict], str]:
+    """direct_results from the list properties of database/materialize_top_substitutes.py."""
+    subs = [{"name": n, "score": s, "context": c or None}
+            for n, s, c in zip(record["names"], record["scores"], record["contexts"], strict=True)]
+    matched = [s for s in subs if s["context"] == context][:top_k] if context else []
+    return direct_results(matched, sorted(subs, key=by_score)[:top_k], context)
+
+
+def cooccurrence_results(rows: list[dict]) -> list[dict]:
+    return [{"name": r["name"], "score": round(r["score"] / COOCCURRENCE_SCALE, 4), "context": None,
+             "source": "cooccurrence"} for r in rows]
+
+
+def merge_hybrid(direct_subs: list[dict], cooc_subs: list[dict], context: str | None, top_k: int,
+                 alpha: float) -> list[dict]:
+    """alpha * direct score + (1 - alpha) * co-occurrence score per candidate, best top_k."""
+    direct_dict = {s["name"]: s for s in direct_subs}
+    cooc_dict = {s["name"]: s for s in cooc_subs}
+
+    merged = []
+    all_names = set(direct_dict) | set(cooc_dict)
+
+    for name in all_names:
+        d = direct_dict.get(name)
+        c = cooc_dict.get(name)
+        d_score = d["score"] if d else 0.0
+        c_score = c["score"] if c else 0.0
+        total = round(alpha * d_score + (1 - alpha) * c_score, 4)
+        merged.append({
+            "name": name,
+            "score": total,
+            "context": context if d else None,
+            "source": "hybrid"
+        })
+
+    return sorted(merged, key=by_score)[:top_k]
+
+
+# ----------------- Per ingredient -----------------
+TOP_SUBSTITUTES_QUERY = """
+    MATCH (a:Ingredient {name: $ingredient})
+    RETURN a.top_substitutes AS names,
+           a.top_substitute_scores AS scores,
+           a.top_substitute_contexts AS contexts,
+           a.top_substitutes_k AS k
+"""
+
+
+def get_direct_subs(tx, ingredient, context=None, top_k=5, materialized=MATERIALIZED_SUBSTITUTES):
+    if materialized:
+        # One node property read; unknown ingredients have no edges either
+        record = tx.run(TOP_SUBSTITUTES_QUERY, ingredient=ingredient).single()
+        if record is None:
+            return direct_results([], [], context)
+        if record["k"] is not None and top_k <= record["k"]:
+            return materialized_results(record, context, top_k)
+
+    if context:
+        result = tx.run("""
+            MATCH (a:Ingredient {name: $ingredient})-[r:SUBSTITUTES_WITH]->(b)
+            WHERE r.context = $context
+            RETURN b.name AS substitute, r.score AS score
+            ORDER BY score DESC, substitute
+            LIMIT $top_k
+        """, ingredient=ingredient, context=context, top_k=top_k)
+        matched = [{"name": r["substitute"], "score": r["score"]} for r in result]
+        if matched:
+            return direct_results(matched, [], context)
+
+    result = tx.run("""
+        MATCH (a:Ingredient {name: $ingredient})-[r:SUBSTITUTES_WITH]->(b)
+        RETURN b.name AS substitute, r.score AS score, r.context AS context
+        ORDER BY score DESC, substitute
+        LIMIT $top_k
+    """, ingredient=ingredient, top_k=top_k)
+    return direct_results([], [{"name": r["substitute"], "score": r["score"], "context": r.get("context")}
+                               for r in result], context)
+
+
+def get_cooccurrence_subs(tx, ingredient, top_k=5):
+    # Ingredients sharing a recipe with $ingredient (one HAS_INGREDIENT hop each way from the recipe)
+    result = tx.run("""
+        MATCH (i:Ingredient {name: $ingredient})<-[:HAS_INGREDIENT]-(r:Recipe)-[:HAS_INGREDIENT]->(sub:Ingredient)
+        WHERE sub <> i
+        RETURN sub.name AS substitute, COUNT(*) AS score
+        ORDER BY score DESC, substitute
+        LIMIT $top_k
+    """, ingredient=ingredient, top_k=top_k)
+    return cooccurrence_results([{"name": r["substitute"], "score": r["score"]} for r in result])
+
+
+def get_hybrid_subs(tx, ingredient, context=None, top_k=5, alpha=0.9):
+    direct_subs, mode = get_direct_subs(tx, ingredient, context, top_k=top_k * 2)
+    cooc_subs = get_cooccurrence_subs(tx, ingredient, top_k=top_k * 2)
+    return merge_hybrid(direct_subs, cooc_subs, context, top_k, alpha)
+
+
+# ----------------- Batch -----------------
+# Each subquery ends in an ungrouped collect(), so it yields one row (possibly an
+# empty list) per item even when nothing matches or the co-occurrence part is off
+BATCH_SUBSTITUTES_QUERY = """
+    UNWIND $items AS item
+    CALL {
+        WITH item
+        MATCH (:Ingredient {name: item.name})-[r:SUBSTITUTES_WITH]->(b:Ingredient)
+        WITH r, b ORDER BY r.score DESC, b.name
+        RETURN collect({name: b.name, score: r.score, context: r.context}) AS direct
+    }
+    CALL {
+        WITH item
+        WITH item WHERE $hybrid
+        MATCH (i:Ingredient {name: item.name})<-[:HAS_INGREDIENT]-(:Recipe)-[:HAS_INGREDIENT]->(sub:Ingredient)
+        WHERE sub <> i
+        WITH sub, count(*) AS together ORDER BY together DESC, sub.name LIMIT $top_k
+        RETURN collect({name: sub.name, score: together}) AS cooccurrence
+    }
+    RETURN item.name AS ingredient,
+           item.context AS context,
+           [s IN direct WHERE s.context = item.context][..$top_k] AS matched,
+           direct[..$top_k] AS fallback,
+           cooccurrence
+"""
+
+
+def get_batch_subs(tx, items: list[tuple[str, str | None]], top_k=5, alpha=0.9, hybrid=True) -> list[list[dict]]:
+    """Substitutes of many (ingredient, context) pairs in one UNWIND query, in item order.
+
+    Each item gets exactly what get_hybrid_subs (hybrid) or the best top_k of
+    get_direct_subs would return for it, for one round trip in total.
+    """
+    k = top_k * 2 if hybrid else top_k
+    unique = list(dict.fromkeys(items))
+    result = tx.run(
+        BATCH_SUBSTITUTES_QUERY,
+        items=[{"name": name, "context": context} for name, context in unique],
+        top_k=k,
+        hybrid=hybrid,
+    )
+    rows = {(r["ingredient"], r["context"]): r for r in result}
+
+    substitutes = {}
+    for name, context in unique:
+        row = rows.get((name, context))
+        matched, fallback, cooccurrence = (row["matched"], row["fallback"], row["cooccurrence"]) if row else ([], [], [])
+        direct, _ = direct_results(matched, fallback, context)
+        if hybrid:
+            substitutes[name, context] = merge_hybrid(direct, cooccurrence_results(cooccurrence), context, top_k, alpha)
+        else:
+            substitutes[name, context] = sorted(direct, key=by_score)[:top_k]
+    return [substitutes[item] for item in items]
@@ -0,0 +1,7 @@
+def title_key(title: str) -> str:
+    """Normalized lookup key for a recipe title (case- and edge-whitespace-insensitive).
+
+    Kept equivalent to Cypher's `toLower(trim(title))` so keys computed in
+    Python and backfilled in Neo4j agree.
+    """
+    return title.strip().lower()
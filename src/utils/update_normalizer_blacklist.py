@@ -1,17 +1,19 @@
 import string
 
 import yaml
-from gensim.models import Word2Vec
+from gensim.models import KeyedVectors
 from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
 
+from src.config.paths import DataPaths
+
 # --- Config ---
-W2V_MODEL_PATH = "/app/src/data/models/ingredient_substitution/ingredient_w2v.model"
-NORMALIZER_CONFIG_PATH = "src/ml_training/normalizer_config.yaml"
+W2V_KV_PATH = str(DataPaths().ingredient_kv)
+NORMALIZER_CONFIG_PATH = DataPaths().normalizer_config
 TOP_K = 1000  # How many top tokens to consider
 
-# --- Load Word2Vec ---
-print("📦 Loading Word2Vec model...")
-model = Word2Vec.load(W2V_MODEL_PATH)
+# --- Load ingredient KeyedVectors (mmap) ---
+print("📦 Loading ingredient KeyedVectors...")
+vectors = KeyedVectors.load(W2V_KV_PATH, mmap="r")
 
 # --- Load YAML Config ---
 with open(NORMALIZER_CONFIG_PATH) as f:
@@ -34,7 +36,7 @@ def is_noise(token):
 
 # --- Extract and Filter ---
 print(f"🔍 Scanning top {TOP_K} tokens...")
-vocab = model.wv.index_to_key[:TOP_K]
+vocab = vectors.index_to_key[:TOP_K]
 
 # Filter: single words only and not whitelisted
 candidates = [t for t in vocab if is_noise(t) and t not in whitelist]
@@ -0,0 +1,46 @@
+import os
+
+import numpy as np
+import pytest
+from gensim.models import KeyedVectors
+
+from src.evaluation.fake_neo4j import FakeNeo4jDriver, RecordingGraph
+from src.evaluation.synthetic_fixture import ACTIONS, INGREDIENTS
+
+# Dimensions of the Word2Vec models trained by pipelines/build_context_vectors.py
+INGREDIENT_DIM = 100
+ACTION_DIM = 50
+
+
+@pytest.fixture(scope="session")
+def keyed_vectors(tmp_path_factory):
+    """(ingredient, action) KeyedVectors with the production dimensions, plus the ingredient .kv path."""
+    rng = np.random.default_rng(0)
+    vectors = []
+    for words, dim in ((INGREDIENTS, INGREDIENT_DIM), (ACTIONS, ACTION_DIM)):
+        kv = KeyedVectors(dim)
+        kv.add_vectors(words, rng.standard_normal((len(words), dim)).astype(np.float32))
+        vectors.append(kv)
+    kv_path = tmp_path_factory.mktemp("kv") / "ingredient_w2v.kv"
+    vectors[0].save(str(kv_path))
+    return vectors[0], vectors[1], str(kv_path)
+
+
+# ----------------- Neo4j -----------------
+@pytest.fixture
+def neo4j_driver():
+    """A RecordingGraph fake, or a real server when BENCH_NEO4J_URI is set.
+
+    The loaders MERGE into whatever BENCH_NEO4J_URI points at: use a throwaway
+    local container, never a populated graph.
+    """
+    uri = os.getenv("BENCH_NEO4J_URI")
+    if not uri:
+        yield FakeNeo4jDriver(RecordingGraph())
+        return
+
+    from src.services.neo4j_driver import create_driver
+
+    driver = create_driver(uri)
+    yield driver
+    driver.close()
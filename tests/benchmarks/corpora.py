@@ -0,0 +1,29 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from src.evaluation.synthetic_fixture import ACTIONS, INGREDIENTS, generate_recipes
+
+
+# Built once per size and test session
+@lru_cache(maxsize=None)
+def raw_corpus(n_recipes: int) -> pd.DataFrame:
+    """RecipeNLG-shaped recipes: stringified NER and directions."""
+    return generate_recipes(n_recipes, np.random.default_rng(n_recipes))
+
+
+@lru_cache(maxsize=None)
+def cleaned_corpus(n_recipes: int) -> pd.DataFrame:
+    """cleaned_ner_actions.csv-shaped recipes: ner_list_cleaned and actions as lists."""
+    rng = np.random.default_rng([n_recipes, 1])
+    df = raw_corpus(n_recipes)[["recipe_id", "title", "directions"]].copy()
+    df["ner_list_cleaned"] = [
+        [INGREDIENTS[i] for i in rng.choice(len(INGREDIENTS), int(rng.integers(4, 13)), replace=False)]
+        for _ in range(n_recipes)
+    ]
+    df["actions"] = [
+        [ACTIONS[i] for i in rng.choice(len(ACTIONS), int(rng.integers(1, 5)), replace=False)]
+        for _ in range(n_recipes)
+    ]
+    return df
@@ -0,0 +1,135 @@
+"""Per-stage benchmarks of the offline pipeline on synthetic corpora.
+
+Run with `task bench:pipelines` (or `pytest tests/benchmarks --benchmark-only
+--corpus-sizes 10000,100000,1000000`); src/evaluation/pipeline_scaling_report.py
+turns the --benchmark-json output into per-stage scaling curves.
+"""
+
+import pandas as pd
+import pytest
+
+from src.database import add_edges_from_csv, build_similar_to_edges, load_into_neo4j, upload_recipe_metadata
+from src.evaluation.fake_neo4j import RecordingGraph
+from src.evaluation.synthetic_fixture import CONTEXTS
+from src.pipelines import add_substitutes_with_edges, build_context_vectors, extract_cooking_verbs
+from src.pipelines.parse_raw_recipes import normalize_ner_lists, parse_ner_column
+from src.utils.titles import title_key
+
+from .corpora import cleaned_corpus, raw_corpus
+
+ROUNDS = 3
+
+
+def run(benchmark, fn, *args):
+    # Stages take seconds at 100k+ recipes: a few single-shot rounds, no calibration
+    return benchmark.pedantic(fn, args=args, rounds=ROUNDS, iterations=1)
+
+
+# ----------------- Parsing / normalization -----------------
+def test_ner_parsing(benchmark, n_recipes):
+    benchmark.group = "ner_parsing"
+    ner = raw_corpus(n_recipes)["NER"]
+    parsed = run(benchmark, parse_ner_column, ner)
+    assert len(parsed) == n_recipes
+
+
+def test_normalizer(benchmark, n_recipes):
+    benchmark.group = "normalizer"
+    ner_lists = parse_ner_column(raw_corpus(n_recipes)["NER"])
+    normalized = run(benchmark, normalize_ner_lists, ner_lists)
+    assert len(normalized) == n_recipes
+
+
+def test_verb_extraction(benchmark, n_recipes):
+    benchmark.group = "verb_extraction"
+    try:
+        extract_cooking_verbs.load_nlp()
+        extract_cooking_verbs.initialize_culinary_verbs()
+    except (OSError, LookupError) as exc:
+        pytest.skip(f"spaCy model / VerbNet not available: {exc}")
+    directions = raw_corpus(n_recipes)["directions"]
+    actions = run(benchmark, extract_cooking_verbs.extract_culinary_actions, directions, 1)
+    assert len(actions) == n_recipes
+
+
+# ----------------- Vectors / edges -----------------
+def test_context_vectors(benchmark, n_recipes, keyed_vectors):
+    benchmark.group = "context_vectors"
+    ingredient_kv, action_kv, _ = keyed_vectors
+    df = cleaned_corpus(n_recipes)
+    matrix = run(benchmark, build_context_vectors.build_context_matrix,
+                 df["ner_list_cleaned"], df["actions"], ingredient_kv, action_kv)
+    assert matrix.shape == (n_recipes, ingredient_kv.vector_size + action_kv.vector_size)
+
+
+def test_substitution_edges(benchmark, n_recipes, keyed_vectors):
+    benchmark.group = "substitution_edges"
+    ingredient_kv, action_kv, kv_path = keyed_vectors
+    df = cleaned_corpus(n_recipes)[["ner_list_cleaned", "actions"]]
+    add_substitutes_with_edges._init_worker(kv_path)   # what each pool worker does once
+    ingredient_vecs = {w: ingredient_kv[w] for w in ingredient_kv.index_to_key}
+    action_vecs = {w: action_kv[w] for w in action_kv.index_to_key}
+    edges = run(benchmark, add_substitutes_with_edges.process_chunk, df, ingredient_vecs, action_vecs,
+                ingredient_kv.vector_size, action_kv.vector_size)
+    benchmark.extra_info["edges"] = len(edges)
+
+
+# ----------------- Neo4j loaders -----------------
+def _batches(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _loader_inputs(name: str, n_recipes: int) -> tuple:
+    """(transaction function, one argument tuple per execute_write call) as each loader's main() builds them."""
+    raw = raw_corpus(n_recipes)
+    cleaned = cleaned_corpus(n_recipes)
+    batch_size = load_into_neo4j.BATCH_SIZE
+
+    if name == "ingredients":
+        names = sorted({i for lst in cleaned["ner_list_cleaned"] for i in lst})
+        return load_into_neo4j.create_ingredients, [(b,) for b in _batches(names, batch_size)]
+    if name == "recipes":
+        return load_into_neo4j.create_recipes, [(b,) for b in load_into_neo4j.batch(raw[["recipe_id", "title"]], batch_size)]
+    if name == "has_ingredient":
+        relations = cleaned[["recipe_id", "ner_list_cleaned"]].explode("ner_list_cleaned")
+        relations = relations.rename(columns={"ner_list_cleaned": "ingredient"}).reset_index(drop=True)
+        return load_into_neo4j.create_relations, [(b,) for b in load_into_neo4j.batch(relations, batch_size)]
+    if name == "recipe_metadata":
+        records = raw[["recipe_id", "title", "directions", "link", "source"]].copy()
+        records["title_key"] = records["title"].map(title_key)
+        records["directions"] = records["directions"].map(upload_recipe_metadata.parse_directions)
+        rows = records.to_dict(orient="records")
+        return upload_recipe_metadata.create_recipe_nodes, [
+            (b,) for b in upload_recipe_metadata.batch_iter(rows, upload_recipe_metadata.BATCH_SIZE)
+        ]
+    if name == "substitution_edges":
+        pairs = cleaned["ner_list_cleaned"].map(lambda lst: (lst[0], lst[1]))
+        edges = pd.DataFrame({
+            "source": [s for s, _ in pairs], "target": [t for _, t in pairs],
+            "score": 0.95, "context": [CONTEXTS[i % len(CONTEXTS)] for i in range(n_recipes)],
+        }).to_dict(orient="records")
+        return add_edges_from_csv.batch_insert, [(b,) for b in _batches(edges, add_edges_from_csv.BATCH_SIZE)]
+    if name == "similar_to":
+        # build_similar_to_edges writes one edge per transaction, TOP_N per ingredient
+        edges = cleaned["ner_list_cleaned"].map(lambda lst: (lst[0], lst[1], 0.9)).tolist()
+        return build_similar_to_edges.create_similar_relationship, edges
+    raise ValueError(name)
+
+
+@pytest.mark.parametrize(
+    "loader", ["ingredients", "recipes", "has_ingredient", "recipe_metadata", "substitution_edges", "similar_to"]
+)
+def test_neo4j_loader(benchmark, n_recipes, loader, neo4j_driver):
+    benchmark.group = f"neo4j_{loader}"
+    tx_fn, calls = _loader_inputs(loader, n_recipes)
+
+    def load():
+        with neo4j_driver.session() as session:
+            for args in calls:
+                session.execute_write(tx_fn, *args)
+
+    run(benchmark, load)
+    graph = getattr(neo4j_driver, "graph", None)
+    if isinstance(graph, RecordingGraph):
+        benchmark.extra_info["queries_per_round"] = graph.queries // ROUNDS
+        benchmark.extra_info["transactions_per_round"] = len(calls)
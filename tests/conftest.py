@@ -0,0 +1,50 @@
+import hashlib
+
+import numpy as np
+import pytest
+
+
+# ----------------- Shared helpers -----------------
+class HashingEncoder:
+    """Bag-of-words vectors, so fixtures build without downloading a model."""
+
+    def encode(self, texts, batch_size=32):
+        vectors = np.zeros((len(texts), 64), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.split():
+                vectors[row, int(hashlib.md5(word.encode()).hexdigest(), 16) % 64] += 1
+        return vectors
+
+
+@pytest.fixture(scope="session")
+def hashing_encoder() -> type[HashingEncoder]:
+    """The HashingEncoder class: call it for an encoder, or pass it where an encoder factory is expected."""
+    return HashingEncoder
+
+
+# ----------------- Pipeline benchmarks -----------------
+# Options and collection hooks for the pipeline benchmarks in tests/benchmarks;
+# options must live in a top-level conftest to be accepted on the command line.
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--corpus-sizes", default="10000",
+        help="Comma-separated synthetic corpus sizes for the pipeline benchmarks, e.g. 10000,100000,1000000",
+    )
+
+
+def pytest_generate_tests(metafunc):
+    if "n_recipes" in metafunc.fixturenames:
+        sizes = [int(size) for size in metafunc.config.getoption("corpus_sizes").split(",")]
+        metafunc.parametrize("n_recipes", sizes, ids=[f"{size:_}" for size in sizes])
+
+
+def pytest_collection_modifyitems(config, items):
+    # The pipeline benchmarks take minutes; plain `pytest` runs only the unit tests
+    if config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="pipeline benchmark: run with --benchmark-only")
+    for item in items:
+        if "benchmarks" in item.path.parts:
+            item.add_marker(skip)
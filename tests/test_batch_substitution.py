@@ -0,0 +1,53 @@
+import time
+
+import numpy as np
+import pytest
+
+from src.evaluation.fake_neo4j import FakeGraph, FakeNeo4jDriver
+from src.evaluation.synthetic_fixture import generate_recipes, generate_substitution_edges
+from src.utils.substitution_queries import get_batch_subs, get_direct_subs, get_hybrid_subs
+
+ITEMS = [("butter", "baking"), ("milk", None), ("sugar", "frying"), ("butter", None),
+         ("tofu", "no_such_context"), ("not_an_ingredient", None), ("butter", "baking")]
+
+
+@pytest.fixture(scope="module")
+def graph():
+    rng = np.random.default_rng(11)
+    return FakeGraph(generate_recipes(400, rng), generate_substitution_edges(rng))
+
+
+@pytest.mark.parametrize("hybrid", [True, False])
+def test_batch_matches_per_ingredient_queries(graph, hybrid):
+    with FakeNeo4jDriver(graph).session() as session:
+        batch = session.execute_read(get_batch_subs, ITEMS, 4, 0.9, hybrid)
+        for (name, context), subs in zip(ITEMS, batch, strict=True):
+            if hybrid:
+                expected = session.execute_read(get_hybrid_subs, name, context, 4, 0.9)
+                # equal blended scores may come out in either order
+                assert sorted(subs, key=lambda s: (-s["score"], s["name"])) == \
+                    sorted(expected, key=lambda s: (-s["score"], s["name"]))
+            else:
+                direct, _ = session.execute_read(get_direct_subs, name, context, 4)
+                assert subs == sorted(direct, key=lambda x: -x["score"])[:4]
+    assert batch[0] == batch[-1] and batch[-2] == []
+
+
+def test_batch_is_one_round_trip(graph):
+    items = [(name, "baking") for name in ["butter", "milk", "sugar", "flour", "lemon", "chicken", "walnut", "rice"]]
+    driver = FakeNeo4jDriver(graph, latency_ms=5)
+
+    start = time.perf_counter()
+    with driver.session() as session:
+        for name, context in items:
+            session.execute_read(get_hybrid_subs, name, context, 5, 0.9)
+    one_by_one = time.perf_counter() - start
+
+    start = time.perf_counter()
+    with driver.session() as session:
+        session.execute_read(get_batch_subs, items, 5, 0.9, True)
+    batched = time.perf_counter() - start
+
+    # per ingredient: 2-3 queries of 5 ms each; batched: a single query
+    assert one_by_one > 8 * 2 * 0.005
+    assert batched < 3 * 0.005
@@ -0,0 +1,72 @@
+import faiss
+import pandas as pd
+import pytest
+
+from src.config.paths import DataPaths
+from src.evaluation.benchmark_api import compare_to_baseline, generate_requests, latency_summary
+from src.evaluation.fake_neo4j import FakeGraph, FakeNeo4jDriver
+from src.evaluation.synthetic_fixture import build_fixture, fixture_path
+from src.utils.titles import title_key
+
+paths = DataPaths()
+
+
+@pytest.fixture(scope="module")
+def fixture_root(tmp_path_factory, hashing_encoder):
+    root = tmp_path_factory.mktemp("api_fixture")
+    build_fixture(root, n_recipes=300, seed=7, encoder=hashing_encoder())
+    return root
+
+
+def test_fixture_matches_data_paths_layout(fixture_root):
+    metadata = pd.read_csv(fixture_path(fixture_root, paths.recipe_metadata))
+    index = faiss.read_index(str(fixture_path(fixture_root, paths.recipe_faiss_index)))
+
+    assert len(metadata) == 300
+    assert metadata["recipe_id"].is_unique
+    assert index.ntotal == 300
+    assert fixture_path(fixture_root, paths.recipe_ner_postings).is_dir()
+    assert fixture_path(fixture_root, paths.ingredient_kv).exists()
+
+
+def test_requests_are_reproducible(fixture_root):
+    metadata = pd.read_csv(fixture_path(fixture_root, paths.recipe_metadata))
+    for scenario in ("suggest_recipes", "substitute", "recipe_details"):
+        assert generate_requests(scenario, metadata, 20, seed=1) == generate_requests(scenario, metadata, 20, seed=1)
+    pantries = [spec["json"]["ingredients"] for spec in generate_requests("suggest_recipes", metadata, 50, seed=1)]
+    assert all(2 <= len(p) <= 8 and len(set(p)) == len(p) for p in pantries)
+
+
+def test_fake_driver_serves_api_queries(fixture_root):
+    driver = FakeNeo4jDriver(FakeGraph.from_fixture(fixture_root))
+    metadata = pd.read_csv(fixture_path(fixture_root, paths.recipe_metadata))
+    title = metadata["title"].iloc[0]
+
+    with driver.session() as session:
+        record = session.run("MATCH (r:Recipe {title_key: $title_key}) RETURN r", title_key=title_key(title)).single()
+        direct = list(session.run(
+            "MATCH (a:Ingredient {name: $ingredient})-[r:SUBSTITUTES_WITH]->(b) RETURN b",
+            ingredient="butter", top_k=3,
+        ))
+        cooccurring = list(session.run(
+            "MATCH (r:Recipe)-[:HAS_INGREDIENT]->(i:Ingredient {name: $ingredient}) RETURN i",
+            ingredient="butter", top_k=5,
+        ))
+        with pytest.raises(NotImplementedError):
+            session.run("MATCH (n) RETURN n")
+
+    assert record["title"] == title
+    assert record["recipe_id"] == metadata["recipe_id"].iloc[0]
+    assert 0 < len(direct) <= 3
+    assert [r["score"] for r in direct] == sorted((r["score"] for r in direct), reverse=True)
+    assert cooccurring and all(r["substitute"] != "butter" for r in cooccurring)
+
+
+def test_compare_to_baseline_flags_regressions():
+    def row(p95, rps, errors=0.0):
+        return {"scenario": "substitute", "concurrency": 8, "throughput_rps": rps, "error_rate": errors,
+                "latency_ms": latency_summary([p95 / 2, p95])}
+
+    baseline = [row(p95=10.0, rps=100.0)]
+    assert compare_to_baseline([row(p95=11.0, rps=95.0)], baseline, tolerance=0.2) == []
+    assert len(compare_to_baseline([row(p95=20.0, rps=50.0, errors=0.1)], baseline, tolerance=0.2)) == 3
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.evaluation.synthetic_fixture import generate_recipes
+from src.pipelines.build_recipe_embeddings import (
+    build_recipe_embeddings,
+    partial_path,
+    progress_path,
+    recipe_text,
+)
+
+
+class FlakyEncoder:
+    """Wraps an encoder and fails on its `fail_at`-th encode call, like a build killed halfway."""
+
+    def __init__(self, encoder, fail_at: int):
+        self.encoder = encoder
+        self.calls = 0
+        self.fail_at = fail_at
+
+    def encode(self, texts, batch_size=32):
+        self.calls += 1
+        if self.calls == self.fail_at:
+            raise RuntimeError("interrupted")
+        return self.encoder.encode(texts, batch_size)
+
+
+@pytest.fixture
+def metadata_path(tmp_path):
+    path = tmp_path / "recipe_metadata.csv"
+    generate_recipes(250, np.random.default_rng(3)).to_csv(path, index=False)
+    return path
+
+
+def _interrupt(metadata_path, output, hashing_encoder):
+    with pytest.raises(RuntimeError):
+        # call 1 probes the dimension, calls 2-3 encode the first two chunks
+        build_recipe_embeddings(metadata_path, output, chunk_size=60,
+                                encoder_factory=lambda: FlakyEncoder(hashing_encoder(), fail_at=4))
+    assert partial_path(output).exists() and not output.exists()
+
+
+def test_embeddings_keep_metadata_row_order(metadata_path, tmp_path, hashing_encoder):
+    output = tmp_path / "recipe_embeddings.npy"
+    stats = build_recipe_embeddings(metadata_path, output, encoder_factory=hashing_encoder, chunk_size=60, batch_size=16)
+
+    texts = pd.read_csv(metadata_path)["NER"].map(recipe_text).tolist()
+    assert stats["encoded"] == 250
+    np.testing.assert_array_equal(np.load(output), hashing_encoder().encode(texts))
+    assert not partial_path(output).exists() and not progress_path(output).exists()
+
+
+def test_interrupted_build_resumes(metadata_path, tmp_path, hashing_encoder):
+    output = tmp_path / "recipe_embeddings.npy"
+    _interrupt(metadata_path, output, hashing_encoder)
+
+    stats = build_recipe_embeddings(metadata_path, output, encoder_factory=hashing_encoder, chunk_size=60)
+    assert stats["encoded"] == 250 - 2 * 60
+
+    expected = tmp_path / "expected.npy"
+    build_recipe_embeddings(metadata_path, expected, encoder_factory=hashing_encoder, chunk_size=60)
+    np.testing.assert_array_equal(np.load(output), np.load(expected))
+
+
+def test_changed_metadata_with_same_row_count_starts_over(metadata_path, tmp_path, hashing_encoder):
+    output = tmp_path / "recipe_embeddings.npy"
+    _interrupt(metadata_path, output, hashing_encoder)
+
+    # Same number of recipes, different ingredients in the already encoded rows
+    generate_recipes(250, np.random.default_rng(4)).to_csv(metadata_path, index=False)
+    stats = build_recipe_embeddings(metadata_path, output, encoder_factory=hashing_encoder, chunk_size=60)
+    assert stats["encoded"] == 250
+
+    texts = pd.read_csv(metadata_path)["NER"].map(recipe_text).tolist()
+    np.testing.assert_array_equal(np.load(output), hashing_encoder().encode(texts))
+
+
+def test_worker_processes_match_single_process(metadata_path, tmp_path, hashing_encoder):
+    single, pooled = tmp_path / "single.npy", tmp_path / "pooled.npy"
+    build_recipe_embeddings(metadata_path, single, encoder_factory=hashing_encoder, chunk_size=40)
+    build_recipe_embeddings(metadata_path, pooled, encoder_factory=hashing_encoder, workers=2, chunk_size=40)
+    np.testing.assert_array_equal(np.load(single), np.load(pooled))
@@ -0,0 +1,44 @@
+import faiss
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.pipelines.build_recipe_index import build_recipe_index, index_has_recipe_ids, label_rows
+
+
+def _corpus(n: int = 400, dim: int = 16):
+    rng = np.random.default_rng(2)
+    vectors = rng.standard_normal((n, dim)).astype(np.float32)
+    recipe_ids = rng.permutation(n * 5)[:n].astype(np.int64)   # sparse, unordered: never row positions
+    return vectors, recipe_ids
+
+
+@pytest.mark.parametrize("quantization, nlist", [("float32", 0), ("int8", 0), ("float32", 8), ("int8", 8)])
+def test_read_back_index_serves_recipe_ids(tmp_path, quantization, nlist):
+    vectors, recipe_ids = _corpus()
+    path = tmp_path / "recipe_index.faiss"
+    faiss.write_index(build_recipe_index(vectors, recipe_ids, quantization, nlist), str(path))
+    index = faiss.read_index(str(path))
+    assert index_has_recipe_ids(index)
+
+    # Metadata in another order than the index, as after a rebuild with --drop-duplicates
+    metadata = pd.DataFrame({"recipe_id": recipe_ids[::-1]})
+    queries = vectors[:50].copy()
+    faiss.normalize_L2(queries)
+    params = faiss.SearchParametersIVF(nprobe=nlist) if nlist else None
+    _, labels = index.search(queries, 1, params=params)
+
+    rows = label_rows(index, labels[:, 0], pd.Index(metadata["recipe_id"]))
+    assert (rows >= 0).all()
+    assert metadata["recipe_id"].to_numpy()[rows].tolist() == recipe_ids[:50].tolist()
+
+
+def test_plain_index_labels_are_row_positions():
+    vectors, _ = _corpus()
+    faiss.normalize_L2(vectors)
+    legacy = faiss.IndexFlatIP(vectors.shape[1])
+    legacy.add(vectors)
+    assert not index_has_recipe_ids(legacy)
+
+    _, labels = legacy.search(vectors[:5], 1)
+    assert label_rows(legacy, labels[:, 0], pd.Index(np.arange(len(vectors)) + 1000)).tolist() == [0, 1, 2, 3, 4]
@@ -0,0 +1,15 @@
+import pytest
+
+from src.utils.directions import parse_directions
+
+
+@pytest.mark.parametrize(("raw", "expected"), [
+    (["Preheat oven.", "Bake."], ["Preheat oven.", "Bake."]),               # native list (current graphs)
+    ('["Preheat oven.", "Bake."]', ["Preheat oven.", "Bake."]),             # stringified list (older graphs)
+    ("Just bake it.", ["Just bake it."]),                                   # not a literal
+    ("['unterminated", ["['unterminated"]),
+    ("", []),
+    (None, []),
+])
+def test_parse_directions(raw, expected):
+    assert parse_directions(raw) == expected
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+from neo4j.exceptions import TransientError
+
+from src.database.add_edges_from_csv import bucket_jobs, node_buckets, upload_edges
+from src.evaluation.fake_neo4j import FakeNeo4jDriver, FakeResult
+from src.evaluation.synthetic_fixture import CONTEXTS, INGREDIENTS
+
+
+class LockCheckingGraph:
+    """Records edges, and counts transactions that touch a node another open transaction holds."""
+
+    def __init__(self, fail_first: int = 0):
+        self.lock = threading.Lock()
+        self.held = Counter()
+        self.conflicts = 0
+        self.overlapped = False
+        self.edges = []
+        self.fail_first = fail_first
+
+    def run(self, query, params):
+        rows = params["batch"]
+        nodes = {r["source"] for r in rows} | {r["target"] for r in rows}
+        with self.lock:
+            if self.fail_first:
+                self.fail_first -= 1
+                raise TransientError("deadlock detected")
+            self.conflicts += any(self.held[n] for n in nodes)
+            self.overlapped |= bool(+self.held)
+            self.held.update(nodes)
+        time.sleep(0.002)   # hold the "locks" until commit
+        with self.lock:
+            self.held.subtract(nodes)
+            self.edges.extend((r["source"], r["target"]) for r in rows)
+        return FakeResult()
+
+
+def _edges(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    pairs = rng.choice(len(INGREDIENTS), size=(n, 2))
+    pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+    return pd.DataFrame({
+        "source": [INGREDIENTS[i] for i in pairs[:, 0]],
+        "target": [INGREDIENTS[i] for i in pairs[:, 1]],
+        "score": rng.uniform(0.9, 1.0, len(pairs)),
+        "context": [CONTEXTS[i % len(CONTEXTS)] for i in range(len(pairs))],
+    })
+
+
+@pytest.mark.parametrize("n_buckets", [2, 6, 16])
+def test_each_edge_lands_in_the_job_of_its_endpoint_buckets(n_buckets):
+    edges = _edges(2000)
+    jobs = bucket_jobs(edges, n_buckets)
+    assert sum(len(rows) for rows in jobs.values()) == len(edges)
+
+    bucket = dict(zip(edges["source"], node_buckets(edges["source"], n_buckets), strict=True))
+    bucket.update(zip(edges["target"], node_buckets(edges["target"], n_buckets), strict=True))
+    for (a, b), rows in jobs.items():
+        assert a <= b
+        assert all(sorted((bucket[r["source"]], bucket[r["target"]])) == [a, b] for r in rows)
+
+
+def test_parallel_upload_never_shares_a_node_between_transactions():
+    edges = _edges(4000)
+    graph = LockCheckingGraph()
+    stats = upload_edges(FakeNeo4jDriver(graph), [edges[:1500], edges[1500:]], workers=4, batch_size=50)
+
+    assert stats["edges"] == len(edges) and stats["retries"] == 0
+    assert sorted(graph.edges) == sorted(zip(edges["source"], edges["target"], strict=True))
+    assert graph.conflicts == 0
+    assert graph.overlapped   # writers did run concurrently
+
+
+def test_transient_errors_are_retried():
+    edges = _edges(300, seed=1)
+    graph = LockCheckingGraph(fail_first=2)
+    stats = upload_edges(FakeNeo4jDriver(graph), [edges], workers=2, batch_size=100)
+    assert stats["retries"] == 2
+    assert len(graph.edges) == len(edges)
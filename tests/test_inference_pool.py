@@ -0,0 +1,97 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from src.services.inference_pool import (
+    InferenceDeadlineExceeded,
+    InferenceOverloaded,
+    InferencePool,
+    InferenceUnavailable,
+)
+
+SLEEP = "tests.test_inference_pool:sleep_then_return"
+CRASH = "tests.test_inference_pool:crash"
+RUNNING = threading.Event()
+
+
+def sleep_then_return(seconds: float, value=None):
+    RUNNING.set()
+    time.sleep(seconds)
+    return value
+
+
+def crash():
+    os._exit(1)
+
+
+def _pool(**kwargs) -> InferencePool:
+    return InferencePool(preload=(), warmup=(), **kwargs)
+
+
+async def _until_idle(pool: InferencePool, timeout: float = 5.0):
+    end = time.monotonic() + timeout
+    while pool.inflight and time.monotonic() < end:
+        await asyncio.sleep(0.01)
+
+
+def test_full_queue_sheds_with_retry_after():
+    async def scenario():
+        pool = _pool(workers=0, queue_size=1, deadline_ms=5000)
+        await pool.start()
+        calls = [asyncio.create_task(pool.run(SLEEP, 0.3, i)) for i in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(InferenceOverloaded) as shed:
+            await pool.run(SLEEP, 0.0)
+        assert await asyncio.gather(*calls) == [0, 1]
+        await pool.shutdown()
+        return pool, shed.value
+
+    pool, shed = asyncio.run(scenario())
+    assert shed.status_code == 503 and shed.retry_after >= 1
+    assert pool.rejected == 1 and pool.inflight == 0
+
+
+def test_expired_call_keeps_its_slot_until_it_finishes():
+    async def scenario():
+        pool = _pool(workers=0, queue_size=0, deadline_ms=5000)
+        await pool.start()
+        RUNNING.clear()
+        with pytest.raises(InferenceDeadlineExceeded) as expired:
+            await pool.run(SLEEP, 0.5, deadline_ms=50)
+        assert RUNNING.is_set()
+
+        # The caller gave up, but the call is still running: no new admission
+        assert pool.inflight == 1
+        with pytest.raises(InferenceOverloaded):
+            await pool.run(SLEEP, 0.0)
+
+        await _until_idle(pool)
+        assert pool.inflight == 0
+        assert await pool.run(SLEEP, 0.0, "ok") == "ok"
+        await pool.shutdown()
+        return pool, expired.value
+
+    pool, expired = asyncio.run(scenario())
+    assert expired.status_code == 504
+    assert pool.expired == 1
+
+
+def test_worker_crash_restarts_the_pool():
+    async def scenario():
+        pool = _pool(workers=2, queue_size=4, deadline_ms=20000)
+        await pool.start()
+        crashed = pool._executor
+        with pytest.raises(InferenceUnavailable) as died:
+            await pool.run(CRASH)
+        assert pool._executor is not crashed
+        assert await pool.run(SLEEP, 0.0, "after restart") == "after restart"
+        await _until_idle(pool)
+        await pool.shutdown()
+        return pool, died.value
+
+    pool, died = asyncio.run(scenario())
+    assert died.status_code == 503
+    assert pool.inflight == 0
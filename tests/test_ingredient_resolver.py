@@ -0,0 +1,70 @@
+import time
+
+import numpy as np
+
+from src.evaluation.synthetic_fixture import INGREDIENTS, popularity
+from src.services.ingredient_resolver import IngredientResolver, edit_distance
+
+NAMES = ["butter", "peanut butter", "buttermilk", "cheddar cheese", "sharp cheddar cheese", "cheese",
+         "brown sugar", "sugar", "soy_sauce", "Baking Powder"]
+RECIPES = [900, 120, 300, 400, 50, 800, 350, 1000, 90, 600]
+
+
+def test_autocomplete_prefers_name_starts_then_popularity():
+    resolver = IngredientResolver.from_names(NAMES, RECIPES)
+    assert [n for n, _ in resolver.autocomplete("butt")] == ["butter", "buttermilk", "peanut butter"]
+    assert [n for n, _ in resolver.autocomplete("ched")] == ["cheddar cheese", "sharp cheddar cheese"]
+    assert [n for n, _ in resolver.autocomplete("CHEESE", limit=2)] == ["cheese", "cheddar cheese"]
+    assert resolver.autocomplete("soy s") == [("soy_sauce", 90)]
+    assert resolver.autocomplete("xyz") == []
+
+
+def test_resolve_exact_and_typos():
+    resolver = IngredientResolver.from_names(NAMES, RECIPES)
+    assert resolver.resolve("Baking  powder") == ("Baking Powder", 0)
+    assert resolver.resolve("buter") == ("butter", 1)
+    assert resolver.resolve("chedar chese") == ("cheddar cheese", 2)
+    assert resolver.resolve("brwon sugar") == ("brown sugar", 1)   # transposition
+    assert resolver.resolve("sgar") == ("sugar", 1)
+    assert resolver.resolve("tofu") == (None, None)
+    assert edit_distance("kitten", "sitting", 5) == 3
+
+
+def test_lookups_stay_sub_millisecond():
+    rng = np.random.default_rng(0)
+    names = [f"{a} {b}".replace("_", " ") for a in INGREDIENTS for b in INGREDIENTS]
+    resolver = IngredientResolver.from_names(names, rng.integers(1, 10_000, len(names)))
+    queries = [names[i] for i in rng.choice(len(names), 200, p=popularity(len(names)))]
+    typos = [q[:3] + q[4:] for q in queries]
+
+    start = time.perf_counter()
+    for query, typo in zip(queries, typos, strict=True):
+        resolver.autocomplete(query[:4])
+        assert resolver.resolve(typo)[0] is not None
+    per_lookup_ms = (time.perf_counter() - start) * 1000 / (2 * len(queries))
+    assert per_lookup_ms < 1.0, f"{per_lookup_ms:.3f} ms per lookup over {len(names):,} names"
+
+
+def test_canonical_keeps_known_words_and_ambiguous_typos():
+    resolver = IngredientResolver.from_names(["pear", "peas", "egg", "eggs", "onion"], [900, 100, 800, 700, 600])
+    assert resolver.canonical("peas") == "peas"       # one edit from the more popular "pear"
+    assert resolver.canonical("Eggs") == "eggs"       # a known plural is not singularized
+    assert resolver.canonical("onions") == "onion"    # unknown here, and only one name is close
+    assert resolver.canonical("peax") is None         # "pear" and "peas" are equally close
+    assert resolver.canonical("tofu") is None
+    assert resolver.resolve("peax") == ("pear", 1)    # /ingredients/resolve still ranks a best guess
+
+
+def test_canonical_recipe_terms_match_ner_terms(tmp_path, monkeypatch):
+    from src.services import ingredient_resolver
+    from src.utils.posting_index import PostingIndex
+
+    PostingIndex.from_pairs(["eggs", "onions", "peas", "pear", "pear", "butter"], [0, 0, 1, 1, 2, 2]).save(tmp_path)
+    monkeypatch.setattr(ingredient_resolver, "NER_POSTINGS_PATH", tmp_path)
+    ingredient_resolver.load_ner_resolver.cache_clear()
+    try:
+        assert ingredient_resolver.canonical_recipe_terms(["eggs", "onions", "peas", "buter", "peax", "tofu"]) == [
+            "eggs", "onions", "peas", "butter", "peax", "tofu",
+        ]
+    finally:
+        ingredient_resolver.load_ner_resolver.cache_clear()
@@ -0,0 +1,52 @@
+import numpy as np
+import pytest
+
+from src.evaluation.fake_neo4j import FakeGraph, FakeNeo4jDriver
+from src.evaluation.synthetic_fixture import generate_recipes, generate_substitution_edges
+from src.utils.substitution_queries import get_direct_subs
+
+ITEMS = [("butter", "baking"), ("milk", None), ("sugar", "frying"), ("tofu", "no_such_context"),
+         ("not_an_ingredient", "baking"), ("rice", None)]
+
+
+class CountingGraph(FakeGraph):
+    queries = 0
+
+    def run(self, query, params):
+        self.queries += 1
+        return super().run(query, params)
+
+
+@pytest.fixture()
+def graph():
+    rng = np.random.default_rng(5)
+    return CountingGraph(generate_recipes(300, rng), generate_substitution_edges(rng))
+
+
+def _ranked(subs):
+    # equal scores may come out in either order
+    return sorted(subs, key=lambda s: (-s["score"], s["name"]))
+
+
+@pytest.mark.parametrize("top_k", [1, 3, 10])
+def test_materialized_lists_match_edge_queries(graph, top_k):
+    graph.materialize_top_substitutes(10)
+    with FakeNeo4jDriver(graph).session() as session:
+        for name, context in ITEMS:
+            edges, edges_mode = session.execute_read(get_direct_subs, name, context, top_k, False)
+            graph.queries = 0
+            stored, stored_mode = session.execute_read(get_direct_subs, name, context, top_k, True)
+            assert graph.queries == 1
+            assert (_ranked(stored), stored_mode) == (_ranked(edges), edges_mode)
+
+
+def test_unmaterialized_or_too_small_falls_back_to_edges(graph):
+    with FakeNeo4jDriver(graph).session() as session:
+        expected = session.execute_read(get_direct_subs, "butter", "baking", 5, False)
+        assert expected[1] == "matched"
+        assert session.execute_read(get_direct_subs, "butter", "baking", 5, True) == expected
+
+        graph.materialize_top_substitutes(2)
+        graph.queries = 0
+        assert session.execute_read(get_direct_subs, "butter", "baking", 5, True) == expected
+        assert graph.queries == 2   # the node read, then the context-filtered edge query
@@ -0,0 +1,25 @@
+from src.evaluation.fake_neo4j import FakeNeo4jDriver, RecordingGraph
+from src.services import neo4j_driver
+
+
+def test_driver_config_is_applied():
+    # Creating a driver does not connect, so no server is needed
+    with neo4j_driver.create_driver("neo4j://localhost:7687", max_connection_pool_size=7, fetch_size=250) as driver:
+        assert driver._pool.pool_config.max_connection_pool_size == 7
+        assert driver._default_workspace_config.fetch_size == 250
+    assert neo4j_driver.driver_config(fetch_size=5)["fetch_size"] == 5
+
+
+def test_shared_driver_is_lazy_and_closable():
+    neo4j_driver.close_driver()
+    assert neo4j_driver._shared is None
+
+    shared = neo4j_driver.get_driver()
+    assert neo4j_driver.get_driver() is shared
+    neo4j_driver.close_driver()
+    assert neo4j_driver._shared is None
+
+    fake = FakeNeo4jDriver(RecordingGraph())
+    neo4j_driver.set_driver(fake)
+    assert neo4j_driver.get_driver() is fake
+    neo4j_driver.close_driver()
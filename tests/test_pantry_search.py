@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from src.services import pantry_search
+from src.services.pantry_search import PantryIndex, search_by_pantry
+from src.utils.posting_index import PostingIndex
+
+# butter -> margarine (0.8), oil (0.0), lard (-0.2); recipe 1 has all four, recipe 2 only the two weakest substitutes
+TERMS = ["butter", "lard", "margarine", "oil", "sugar"]
+PAIRS = [("butter", 1), ("margarine", 1), ("oil", 1), ("lard", 1), ("sugar", 1),
+         ("oil", 2), ("lard", 2), ("sugar", 3)]
+
+
+@pytest.fixture
+def pantry_index(monkeypatch):
+    postings = PostingIndex.from_pairs([t for t, _ in PAIRS], [r for _, r in PAIRS])
+    assert postings.terms == TERMS
+    term = postings.term_ids
+    sim_indptr = np.zeros(len(TERMS) + 1, dtype=np.int64)
+    sim_indptr[term["butter"] + 1:] = 3
+    index = PantryIndex(
+        postings=postings,
+        sim_indptr=sim_indptr,
+        sim_dst=np.array([term["margarine"], term["oil"], term["lard"]], dtype=np.int64),
+        sim_score=np.array([0.8, 0.0, -0.2], dtype=np.float32),
+        recipe_ids=np.array([1, 2, 3], dtype=np.int64),
+        titles=np.array(["Cake", "Fried bread", "Syrup"]),
+        n_ingredients=np.array([5, 3, 1], dtype=np.int64),
+    )
+    monkeypatch.setattr(pantry_search, "load_pantry_index", lambda: index)
+    return index
+
+
+def test_each_item_counts_once_per_recipe_whatever_its_edge_scores(pantry_index):
+    results = search_by_pantry(["butter", "sugar"], min_edge_score=-1.0)["results"]
+    by_id = {r["recipe_id"]: r for r in results}
+
+    assert by_id[1]["matched_items"] == 2 and by_id[1]["score"] == pytest.approx(2.0)
+    assert by_id[2]["matched_items"] == 1 and by_id[2]["score"] == 0.0
+    assert by_id[3]["matched_items"] == 1
+
+
+def test_min_matched_is_not_met_by_substitutes_of_one_item(pantry_index):
+    results = search_by_pantry(["butter"], min_edge_score=-1.0, min_matched=2)["results"]
+    assert results == []
@@ -0,0 +1,96 @@
+import faiss
+import numpy as np
+import pytest
+
+from src.pipelines.build_recipe_index import build_recipe_index
+from src.utils.recipe_attributes import (
+    RecipeAttributes,
+    RecipeFilter,
+    TagRules,
+    bitmap_contains,
+    filtered_nprobe,
+    filtered_search_params,
+    ids_to_bitmap,
+)
+
+CONFIG = {
+    "groups": {"meat": ["chicken", "bacon"], "dairy": ["butter", "cheese"], "nuts": ["nuts", "peanut"]},
+    "exceptions": ["peanut butter"],
+    "diets": {"vegetarian": {"exclude": ["meat"]}, "dairy_free": {"exclude": ["dairy"]}},
+    "cuisines": {"italian": {"min_matches": 2, "any": ["basil", "parmesan", "pasta"]}},
+}
+
+
+@pytest.fixture
+def rules():
+    return TagRules.from_config(CONFIG)
+
+
+def test_groups_match_whole_words_and_skip_exceptions(rules):
+    assert rules.ingredient_groups("chicken broth") == {"meat"}
+    assert rules.ingredient_groups("Pine Nuts") == {"nuts"}
+    assert rules.ingredient_groups("peanut butter") == set()
+    assert rules.ingredient_groups("butternut squash") == set()
+
+
+def test_recipe_tags(rules):
+    assert rules.recipe_tags(["pasta", "basil", "peanut butter"]) == {"vegetarian", "dairy_free", "italian"}
+    assert rules.recipe_tags(["pasta", "bacon", "parmesan cheese"]) == {"italian"}
+    assert rules.recipe_tags(["basil", "basil"]) == {"vegetarian", "dairy_free"}
+
+
+def test_unknown_excluded_group_is_rejected():
+    with pytest.raises(ValueError):
+        TagRules.from_config({**CONFIG, "diets": {"vegan": {"exclude": ["eggs"]}}})
+
+
+def test_attribute_bitmaps_round_trip(rules, tmp_path):
+    attributes = RecipeAttributes.from_recipes(
+        [3, 10, 17], [["chicken", "pasta"], ["pasta", "basil"], ["cheese"]], rules
+    )
+    attributes.save(tmp_path)
+    loaded = RecipeAttributes.load(tmp_path)
+
+    vegetarian = loaded.tag_bitmap("vegetarian", 40)
+    assert bitmap_contains(vegetarian, np.array([3, 10, 17, 39])).tolist() == [False, True, True, False]
+    assert loaded.counts() == {"vegetarian": 2, "dairy_free": 2, "italian": 1}
+    with pytest.raises(ValueError):
+        loaded.tag_bitmap("vegan", 40)
+
+
+def test_recipe_filter_truthiness():
+    assert not RecipeFilter()
+    assert RecipeFilter(exclude_tags=("italian",)).tags == ("italian",)
+
+
+@pytest.mark.parametrize("quantization, nlist", [("float32", 0), ("int8", 0), ("float32", 8)])
+def test_filtered_search_returns_full_k_of_allowed_ids(quantization, nlist):
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((2000, 16)).astype(np.float32)
+    recipe_ids = np.arange(2000, dtype=np.int64) * 3 + 5   # sparse, non-positional ids
+    index = build_recipe_index(vectors, recipe_ids, quantization, nlist)
+
+    allowed_ids = recipe_ids[rng.random(2000) < 0.05]
+    n_ids = int(recipe_ids.max()) + 1
+    bitmap = ids_to_bitmap(allowed_ids, n_ids)
+    nprobe = filtered_nprobe(2, len(allowed_ids) / len(recipe_ids), nlist) if nlist else None
+
+    query = vectors[:4].copy()
+    faiss.normalize_L2(query)
+    _, labels = index.search(query, 20, params=filtered_search_params(bitmap, nprobe))
+
+    assert (labels >= 0).all()
+    assert set(labels.ravel()) <= set(allowed_ids.tolist())
+
+
+def test_filtered_search_reads_only_the_bitmap():
+    # Ids past the end of the bitmap are not selected, and nothing past its last byte is read
+    vectors = np.eye(40, 8, dtype=np.float32) + 0.01
+    index = faiss.IndexIDMap(faiss.IndexFlatIP(8))
+    index.add_with_ids(vectors, np.arange(40, dtype=np.int64))
+    buffer = np.full(8, 0xFF, dtype=np.uint8)
+    buffer[:2] = ids_to_bitmap([3], 16)
+    bitmap = buffer[:2]   # the bytes after it are set, as other memory could be
+
+    _, labels = index.search(vectors[:1], 10, params=filtered_search_params(bitmap))
+    assert labels[0][labels[0] >= 0].tolist() == [3]
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+from src.evaluation.synthetic_fixture import generate_recipes
+from src.pipelines.build_ingredient_postings import parse_ner
+from src.pipelines.build_recipe_clusters import build_recipe_clusters
+from src.services.sharded_search import merge_shard_candidates
+from src.utils.minhash import minhash_signatures
+from src.utils.recipe_scoring import collapse_duplicates
+
+
+def test_signature_agreement_estimates_jaccard():
+    a = [f"i:{n}" for n in range(60)]
+    b = [f"i:{n}" for n in range(20, 80)]   # Jaccard 40 / 80 = 0.5
+    signatures = minhash_signatures([a, b, []], num_perm=512)
+    assert abs((signatures[0] == signatures[1]).mean() - 0.5) < 0.06
+    assert (signatures[2] == np.iinfo(np.uint32).max).all()
+
+
+def test_near_duplicates_share_a_cluster():
+    originals = generate_recipes(500, np.random.default_rng(3))
+    copies = originals.iloc[:40].copy()
+    copies["recipe_id"] = copies["recipe_id"] + 10_000
+    # same dish from another source: "Recipe" suffix, different case, one ingredient dropped
+    copies["title"] = copies["title"].str.upper() + " Recipe"
+    copies["NER"] = copies["NER"].map(lambda ner: str(parse_ner(ner)[:-1]) if len(parse_ner(ner)) > 8 else ner)
+    clusters = build_recipe_clusters(pd.concat([originals, copies], ignore_index=True), threshold=0.7)
+
+    cluster_of = dict(zip(clusters["recipe_id"], clusters["cluster_id"], strict=True))
+    assert all(cluster_of[recipe_id + 10_000] == recipe_id for recipe_id in range(40))
+    # the distinct originals stay apart: every cluster has at most the original and its copy
+    assert clusters["cluster_size"].max() == 2
+    assert (clusters["cluster_size"] == 2).sum() == 80
+
+
+def test_collapse_keeps_best_of_each_cluster_across_shards():
+    def recipe(recipe_id, score, cluster_id):
+        return {"recipe_id": recipe_id, "title": f"R{recipe_id}", "NER": "['butter', 'sugar', 'flour']",
+                "semantic_score": score, "cluster_id": cluster_id}
+
+    shards = [
+        {"semantic": [[1, 0.9], [2, 0.5]], "lexical": [], "recipes": [recipe(1, 0.9, 1), recipe(2, 0.5, 2)]},
+        {"semantic": [[7, 0.95], [8, 0.8]], "lexical": [], "recipes": [recipe(7, 0.95, 1), recipe(8, 0.8, 8)]},
+    ]
+    query = ["butter", "sugar", "flour"]
+    merged = merge_shard_candidates(shards, query, top_n=5, raw_k=10)
+    assert [r["recipe_id"] for r in merged] == [7, 8, 2]
+
+    uncollapsed = merge_shard_candidates(shards, query, top_n=5, raw_k=10, collapse=False)
+    assert [r["recipe_id"] for r in uncollapsed] == [7, 1, 8, 2]
+
+    results = [{"recipe_id": 3, "combined_score": 0.2}, {"recipe_id": 4, "combined_score": 0.4}]
+    assert collapse_duplicates(results, {4: 3}) == [results[1]]
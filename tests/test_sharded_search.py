@@ -0,0 +1,131 @@
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import faiss
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.config.paths import DataPaths
+from src.evaluation.synthetic_fixture import INGREDIENTS, build_fixture, fixture_path, generate_recipes
+from src.pipelines.build_recipe_index import label_rows
+from src.pipelines.build_recipe_shards import MANIFEST_FILE, build_recipe_shards, shard_path
+from src.services.sharded_search import merge_shard_candidates
+from src.utils.recipe_scoring import score_recipe, top_results
+
+paths = DataPaths()
+
+QUERY = ["butter", "sugar", "flour", "egg"]
+
+
+def _recipes(n: int, rng: np.random.Generator) -> list[dict]:
+    recipes = []
+    for recipe_id in rng.permutation(n * 3)[:n]:
+        ner = list(rng.choice(INGREDIENTS[:12], size=int(rng.integers(2, 7)), replace=False))
+        recipes.append({"recipe_id": int(recipe_id), "title": f"Recipe {recipe_id}", "NER": repr(ner),
+                        "semantic_score": float(rng.uniform(-0.2, 1.0)), "overlap": len(set(ner) & set(QUERY))})
+    return recipes
+
+
+def _candidates(recipes: list[dict], raw_k: int, lexical_k: int, min_overlap: int) -> dict:
+    """What one index (a shard, or the whole corpus) returns for QUERY, in shard_candidates' format."""
+    semantic = sorted(recipes, key=lambda r: -r["semantic_score"])[:raw_k]
+    lexical = sorted((r for r in recipes if r["overlap"] >= min_overlap),
+                     key=lambda r: (-r["overlap"], r["recipe_id"]))[:lexical_k]
+    chosen = {r["recipe_id"]: r for r in semantic + lexical}
+    return {
+        "semantic": [[r["recipe_id"], r["semantic_score"]] for r in semantic],
+        "lexical": [[r["recipe_id"], r["overlap"]] for r in lexical],
+        "recipes": list(chosen.values()),
+    }
+
+
+def test_merged_shards_match_unsharded_index():
+    recipes = _recipes(600, np.random.default_rng(1))
+    raw_k, lexical_k, min_overlap = 20, 15, 2
+
+    unsharded = _candidates(recipes, raw_k, lexical_k, min_overlap)
+    expected = top_results([
+        scored for r in unsharded["recipes"]
+        if (scored := score_recipe(r["recipe_id"], r["title"], r["NER"], r["semantic_score"], QUERY, 0.6, min_overlap))
+    ], top_n=10)
+
+    by_id = sorted(recipes, key=lambda r: r["recipe_id"])
+    shards = [_candidates(list(part), raw_k, lexical_k, min_overlap) for part in np.array_split(by_id, 3)]
+    merged = merge_shard_candidates(shards, QUERY, top_n=10, rerank_weight=0.6,
+                                    raw_k=raw_k, min_overlap=min_overlap, lexical_k=lexical_k)
+
+    assert [(r["recipe_id"], r["combined_score"]) for r in merged] == \
+        [(r["recipe_id"], r["combined_score"]) for r in expected]
+
+
+@pytest.mark.parametrize("nlist", [0, 8])
+def test_shards_partition_recipe_id_ranges(tmp_path, nlist):
+    metadata = generate_recipes(300, np.random.default_rng(5))
+    embeddings = np.random.default_rng(5).standard_normal((300, 16)).astype(np.float32)
+    manifest = build_recipe_shards(metadata, embeddings, tmp_path, n_shards=3, nlist=nlist)
+
+    assert json.loads((tmp_path / MANIFEST_FILE).read_text()) == manifest
+    assert sum(s["recipes"] for s in manifest["shards"]) == 300
+    assert manifest["shards"][-1]["max_recipe_id"] is None
+
+    previous_max = -1
+    for shard in manifest["shards"]:
+        shard_dir = tmp_path / shard["path"]
+        part = pd.read_csv(shard_path(shard_dir, paths.recipe_metadata))
+        index = faiss.read_index(str(shard_path(shard_dir, paths.recipe_faiss_index)))
+        assert part["recipe_id"].min() > previous_max
+        assert index.ntotal == len(part) == shard["recipes"]
+        previous_max = part["recipe_id"].max()
+
+        # Labels are global recipe_ids; each must resolve to its row of this shard's metadata slice
+        queries = np.load(shard_path(shard_dir, paths.recipe_embeddings))
+        faiss.normalize_L2(queries)
+        _, labels = index.search(queries, 1, params=faiss.SearchParametersIVF(nprobe=nlist) if nlist else None)
+        rows = label_rows(index, labels[:, 0], pd.Index(part["recipe_id"]))
+        assert rows.tolist() == list(range(len(part)))
+
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# The coordinator must start without the recipe model, index or metadata
+LIFESPAN_SCRIPT = """
+import sys
+from fastapi.testclient import TestClient
+from src.api.app import app
+with TestClient(app):
+    pass
+assert "src.utils.recipesuggestionmodel" not in sys.modules, "the coordinator loaded the recipe model"
+"""
+
+POOL_SCRIPT = """
+import asyncio, sys
+from src.services.inference_pool import SUGGEST_RECIPES, inference_pool
+assert SUGGEST_RECIPES not in inference_pool.preload
+asyncio.run(inference_pool.start())
+assert "src.utils.recipesuggestionmodel" not in sys.modules, "the coordinator loaded the recipe model"
+"""
+
+
+@pytest.fixture(scope="module")
+def coordinator_env(tmp_path_factory, hashing_encoder):
+    """Environment of a coordinator API process: a data root without the recipe index or metadata."""
+    root = tmp_path_factory.mktemp("coordinator")
+    build_fixture(root, n_recipes=100, seed=3, encoder=hashing_encoder())
+    fixture_path(root, paths.recipe_metadata).unlink()
+    fixture_path(root, paths.recipe_faiss_index).unlink()
+    return {**os.environ, "PYTHONPATH": str(REPO_ROOT), "PLATE_PLANNER_DATA_ROOT": str(root), "RECIPE_SHARDS": "http://127.0.0.1:1",
+            "INFERENCE_WORKERS": "0"}
+
+
+def test_sharded_inference_pool_does_not_preload_the_recipe_model(coordinator_env):
+    subprocess.run([sys.executable, "-c", POOL_SCRIPT], env=coordinator_env, check=True)
+
+
+@pytest.mark.skipif(importlib.util.find_spec("en_core_web_sm") is None, reason="needs the spaCy model")
+def test_sharded_api_lifespan_does_not_load_the_recipe_model(coordinator_env):
+    subprocess.run([sys.executable, "-c", LIFESPAN_SCRIPT], env=coordinator_env, check=True)
@@ -0,0 +1,75 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.evaluation.fake_neo4j import FakeGraph, FakeNeo4jDriver
+from src.evaluation.synthetic_fixture import CONTEXTS, generate_recipes, generate_substitution_edges
+from src.services.substitution_graph import SubstitutionGraph
+from src.utils.substitution_queries import get_batch_subs, get_cooccurrence_subs, get_direct_subs, get_hybrid_subs
+
+
+@pytest.fixture(scope="module")
+def graphs():
+    """(Neo4j driver, snapshot of it): the in-memory fake by default, or a real
+    server when PARITY_NEO4J_URI is set (read only; exported with the pipeline)."""
+    uri = os.getenv("PARITY_NEO4J_URI")
+    if uri:
+        from src.pipelines.build_substitution_graph import export_substitution_graph
+        from src.services.neo4j_driver import create_driver
+
+        driver = create_driver(uri)
+        yield driver, export_substitution_graph(driver)
+        driver.close()
+        return
+
+    rng = np.random.default_rng(3)
+    fake = FakeGraph(generate_recipes(500, rng), generate_substitution_edges(rng))
+    substitutes = pd.DataFrame(
+        [(s, t, score, c) for s, edges in fake.substitutes.items() for t, score, c in edges],
+        columns=["source", "target", "score", "context"],
+    )
+    recipe_ingredients = pd.DataFrame(
+        [(rid, name) for rid, recipe in fake.recipes.items() for name in recipe["ingredients"]],
+        columns=["recipe_id", "ingredient"],
+    )
+    similar = pd.DataFrame(columns=["source", "target", "score"])
+    yield FakeNeo4jDriver(fake), SubstitutionGraph.from_frames(substitutes, similar, recipe_ingredients)
+
+
+def _items(snapshot: SubstitutionGraph) -> list[tuple[str, str | None]]:
+    names = snapshot.names[:: max(1, len(snapshot.names) // 60)] + ["not_an_ingredient"]
+    contexts = [None, "no_such_context"] + (snapshot.contexts[:5] if snapshot.contexts else CONTEXTS)
+    return [(name, context) for name in names for context in contexts]
+
+
+@pytest.mark.parametrize("top_k", [1, 5, 12])
+def test_snapshot_matches_neo4j_queries(graphs, top_k):
+    driver, snapshot = graphs
+    with driver.session() as session:
+        for name, context in _items(snapshot):
+            assert snapshot.get_direct_subs(name, context, top_k) == \
+                session.execute_read(get_direct_subs, name, context, top_k, False)
+            assert snapshot.get_cooccurrence_subs(name, top_k) == \
+                session.execute_read(get_cooccurrence_subs, name, top_k)
+            assert snapshot.get_hybrid_subs(name, context, top_k, 0.7) == \
+                session.execute_read(get_hybrid_subs, name, context, top_k, 0.7)
+
+
+@pytest.mark.parametrize("hybrid", [True, False])
+def test_snapshot_batch_matches_neo4j(graphs, hybrid):
+    driver, snapshot = graphs
+    items = _items(snapshot)[:100]
+    with driver.session() as session:
+        assert snapshot.get_batch_subs(items, 5, 0.9, hybrid) == \
+            session.execute_read(get_batch_subs, items, 5, 0.9, hybrid)
+
+
+def test_snapshot_round_trips_memory_mapped(graphs, tmp_path):
+    _, snapshot = graphs
+    snapshot.save(tmp_path)
+    loaded = SubstitutionGraph.load(tmp_path)
+    assert isinstance(loaded.sub_dst, np.memmap)
+    for name, context in _items(snapshot)[:50]:
+        assert loaded.get_hybrid_subs(name, context) == snapshot.get_hybrid_subs(name, context)
@@ -0,0 +1,104 @@
+import time
+
+import pytest
+from neo4j.exceptions import ServiceUnavailable
+from prometheus_client import REGISTRY
+
+from src.services import neo4j_driver, substitution_reads
+
+OPERATION = "test_substitution_reads"
+SNAPSHOT_ANSWER = [{"name": "margarine", "score": 0.9}]
+
+
+class FailingNeo4jDriver:
+    """Every read raises ServiceUnavailable, retried like neo4j's execute_read
+    until the session's max_transaction_retry_time (default 30 s) runs out."""
+
+    def __init__(self):
+        self.attempts = 0
+
+    def session(self, max_transaction_retry_time: float = 30.0, **config):
+        return FailingSession(self, max_transaction_retry_time)
+
+    def close(self) -> None:
+        pass
+
+
+class FailingSession:
+    def __init__(self, driver: FailingNeo4jDriver, retry_time: float):
+        self.driver = driver
+        self.retry_time = retry_time
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute_read(self, fn, *args, **kwargs):
+        start = time.monotonic()
+        while True:
+            self.driver.attempts += 1
+            if time.monotonic() - start >= self.retry_time:
+                raise ServiceUnavailable("connection refused")
+            time.sleep(0.01)
+
+
+def fallbacks() -> float:
+    return REGISTRY.get_sample_value("plate_planner_neo4j_fallbacks_total", {"operation": OPERATION}) or 0.0
+
+
+def read():
+    return substitution_reads.read_substitutes(OPERATION, lambda tx: None, lambda graph: SNAPSHOT_ANSWER)
+
+
+@pytest.fixture
+def fallback_mode(tmp_path, monkeypatch):
+    monkeypatch.setattr(substitution_reads, "SUBSTITUTION_READ_PATH", "fallback")
+    monkeypatch.setattr(substitution_reads, "SUBSTITUTION_GRAPH_DIR", tmp_path)
+    monkeypatch.setattr(substitution_reads, "load_substitution_graph", lambda: None)
+    monkeypatch.setattr(substitution_reads, "_neo4j_skipped_until", 0.0)
+    yield
+    neo4j_driver.close_driver()
+
+
+def test_failed_read_falls_back_at_once_and_opens_the_breaker(fallback_mode):
+    driver = FailingNeo4jDriver()
+    neo4j_driver.set_driver(driver)
+    before = fallbacks()
+
+    start = time.perf_counter()
+    assert read() == SNAPSHOT_ANSWER
+    assert time.perf_counter() - start < 0.5
+    assert driver.attempts == 1
+
+    # Within SUBSTITUTION_BREAKER_S the next reads do not touch Neo4j
+    for _ in range(3):
+        assert read() == SNAPSHOT_ANSWER
+    assert driver.attempts == 1
+    assert fallbacks() == before + 4
+
+
+def test_neo4j_is_tried_again_after_the_breaker(fallback_mode, monkeypatch):
+    monkeypatch.setattr(substitution_reads, "SUBSTITUTION_BREAKER_S", 0.0)
+    driver = FailingNeo4jDriver()
+    neo4j_driver.set_driver(driver)
+    read()
+    read()
+    assert driver.attempts == 2
+
+
+def test_unreachable_server_falls_back_at_once(fallback_mode):
+    # Nothing listens on port 1: the real driver raises ServiceUnavailable, retried for 30 s by default
+    neo4j_driver.set_driver(neo4j_driver.create_driver("bolt://127.0.0.1:1"))
+    start = time.perf_counter()
+    assert read() == SNAPSHOT_ANSWER
+    assert time.perf_counter() - start < 1.0
+
+
+def test_neo4j_mode_still_raises(fallback_mode, monkeypatch):
+    monkeypatch.setattr(substitution_reads, "SUBSTITUTION_READ_PATH", "neo4j")
+    monkeypatch.setattr(FailingNeo4jDriver, "session", lambda self, **config: FailingSession(self, 0.0))
+    neo4j_driver.set_driver(FailingNeo4jDriver())
+    with pytest.raises(ServiceUnavailable):
+        read()
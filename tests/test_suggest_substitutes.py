@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from gensim.models import KeyedVectors
+from sklearn.metrics.pairwise import cosine_similarity
+
+from src.evaluation import suggest_substitutes
+from src.evaluation.suggest_substitutes import build_vector, is_valid_ingredient, score_substitutes
+
+INGREDIENT_WORDS = [
+    "butter", "sugar", "flour", "vanilla", "margarine", "honey", "oil", "salt", "egg", "milk",
+    "cream", "yogurt", "lard", "ghee", "of", "x1", "syrup", "molasses",
+]
+ACTION_WORDS = ["mix", "bake", "whisk", "fold"]
+
+
+@pytest.fixture
+def vectors(monkeypatch):
+    rng = np.random.default_rng(7)
+    ingredients = KeyedVectors(16)
+    vecs = rng.standard_normal((len(INGREDIENT_WORDS), 16)).astype(np.float32)
+    # Exact ties: margarine == lard, honey == syrup == molasses
+    vecs[INGREDIENT_WORDS.index("lard")] = vecs[INGREDIENT_WORDS.index("margarine")]
+    for word in ("syrup", "molasses"):
+        vecs[INGREDIENT_WORDS.index(word)] = vecs[INGREDIENT_WORDS.index("honey")]
+    ingredients.add_vectors(INGREDIENT_WORDS, vecs)
+    actions = KeyedVectors(8)
+    actions.add_vectors(ACTION_WORDS, rng.standard_normal((len(ACTION_WORDS), 8)).astype(np.float32))
+
+    monkeypatch.setattr(suggest_substitutes, "load_vectors", lambda: (ingredients, actions))
+    suggest_substitutes._candidate_mask.cache_clear()
+    suggest_substitutes._squared_norms.cache_clear()
+    yield ingredients
+    suggest_substitutes._candidate_mask.cache_clear()
+    suggest_substitutes._squared_norms.cache_clear()
+
+
+def _loop_scores(original, ingredients, actions, topk):
+    """The scorer before vectorization: one build_vector + cosine per candidate."""
+    vocab = suggest_substitutes.load_vectors()[0]
+    original_vec = build_vector(ingredients, actions)
+    candidates = [w for w in vocab.index_to_key if w != original and is_valid_ingredient(w)]
+    scores = [
+        (c, cosine_similarity([original_vec], [build_vector(ingredients, actions, substitute=(original, c))])[0][0])
+        for c in candidates
+    ]
+    return sorted(scores, key=lambda x: x[1], reverse=True)[:topk]
+
+
+@pytest.mark.parametrize(("original", "ingredients", "actions"), [
+    ("butter", ["butter", "sugar", "flour", "vanilla"], ["mix", "bake"]),
+    ("butter", ["butter", "butter", "sugar"], []),
+    ("sugar", ["sugar", "saffron", "flour"], ["whisk", "unknown"]),
+    ("saffron", ["saffron", "flour", "egg"], ["fold"]),          # original not in the vocabulary
+    ("saffron", ["saffron"], ["mix"]),                           # no ingredient vector at all
+])
+@pytest.mark.parametrize("topk", [1, 3, 5, 50])
+def test_vectorized_scorer_matches_loop(vectors, original, ingredients, actions, topk):
+    expected = _loop_scores(original, ingredients, actions, topk)
+    actual = score_substitutes(original, ingredients, actions, topk)
+
+    assert [word for word, _ in actual] == [word for word, _ in expected]
+    assert [score for _, score in actual] == pytest.approx([score for _, score in expected], abs=1e-5)
+
+
+def test_unknown_original_returns_nothing(vectors):
+    assert score_substitutes("butter", ["sugar"], ["mix"]) == []